@@ -0,0 +1,263 @@
+"""
+Analytics Benchmark
+Measures latency and peak memory of the API endpoints, the delay predictor stages and the Jira fetch on synthetic datasets
+
+Usage (from backend/):
+    python benchmark.py --sizes 1000x10,100000x1000 --output results.json
+    python benchmark.py --sizes 1000x10,100000x1000 --baseline results.json
+
+Each size is ROWSxSPRINTS. With --baseline, stages that got slower (or
+use more memory) than the baseline by more than --tolerance are reported
+and the exit code is 1.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+# server.py reads these at import time; the benchmark never touches Mongo
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'benchmark')
+os.environ.pop('EMERGENT_LLM_KEY', None)
+
+import server
+from delay_predictor import DelayPredictor
+from jira_client import JiraAPIClient
+from jira_service import JiraService
+from sprint_aggregator import SprintAggregator, BACKLOG_SPRINT
+from synthetic_data import MockJiraServer, SyntheticJiraDataset
+from upload_ingestion import UploadIngestor
+from velocity_engine import VelocityEngine
+
+logger = logging.getLogger('benchmark')
+
+WORKSPACE = 'benchmark'
+
+# Stages whose time or memory is below these are too small to compare
+MIN_COMPARABLE_SECONDS = 0.002
+MIN_COMPARABLE_BYTES = 1024 * 1024
+
+ENDPOINTS = [
+    '/api/sprints',
+    '/api/dashboard',
+    '/api/team-performance',
+    '/api/recommendations',
+    '/api/velocity',
+    '/api/delay-predictions',
+    '/api/delay-predictions/{sprint}'
+]
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """
+    Peak traced memory of one call, then the latency of `repeat` more calls
+    (without tracing, which would slow them down)
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {
+        'median_seconds': statistics.median(timings),
+        'min_seconds': min(timings),
+        'peak_bytes': peak
+    }
+
+
+class Benchmark:
+    """Runs every stage on one synthetic dataset size"""
+    
+    def __init__(self, rows: int, sprints: int, repeat: int, seed: int = 0):
+        self.rows = rows
+        self.sprints = sprints
+        self.repeat = repeat
+        self.dataset = SyntheticJiraDataset(rows, sprints, seed=seed)
+        self.results: Dict[str, Dict[str, float]] = {}
+    
+    def run(self, excel: bool, jira_max_rows: int) -> Dict[str, Dict[str, float]]:
+        df = self.dataset.generate()
+        
+        if excel:
+            self._excel_parse(df)
+        self._predictor_stages(df)
+        self._endpoints(df)
+        if self.rows <= jira_max_rows:
+            self._jira_fetch(df)
+        return self.results
+    
+    def _stage(self, name: str, func: Callable[[], Any], repeat: Optional[int] = None):
+        self.results[name] = measure(func, self.repeat if repeat is None else repeat)
+        result = self.results[name]
+        logger.info(
+            f"{self.rows}x{self.sprints} {name}: {result['median_seconds'] * 1000:.1f} ms, "
+            f"peak {result['peak_bytes'] / 1e6:.1f} MB"
+        )
+    
+    def _excel_parse(self, df: pd.DataFrame):
+        buffer = io.BytesIO()
+        self.dataset.to_excel(buffer, df)
+        ingestor = UploadIngestor(max_bytes=len(buffer.getvalue()))
+        
+        def parse():
+            buffer.seek(0)
+            ingestor.parse(buffer, 'synthetic.xlsx', {'rows_parsed': 0})
+        self._stage('upload.excel_parse', parse, repeat=1)
+    
+    def _predictor_stages(self, df: pd.DataFrame):
+        predictor = DelayPredictor()
+        aggregator = SprintAggregator()
+        self._stage('dataset.install', lambda: server.datasets.install(WORKSPACE, df, 'upload', 'benchmark'))
+        compact = server.datasets.get(WORKSPACE).df
+        summary = aggregator.summarize_sprints(compact)
+        self._stage('aggregator.summarize_sprints', lambda: aggregator.summarize_sprints(compact))
+        self._stage('aggregator.summarize_assignees', lambda: aggregator.summarize_assignees(compact))
+        
+        velocity = VelocityEngine().compute(compact)
+        self._stage('velocity.compute', lambda: VelocityEngine().compute(compact))
+        
+        scored = summary[summary.index != BACKLOG_SPRINT]
+        now = pd.Timestamp.now(tz='UTC')
+        time_progress, days_remaining = predictor._batch_sprint_timing(scored, now)
+        self._stage('predictor.sprint_timing', lambda: predictor._batch_sprint_timing(scored, now))
+        self._stage('predictor.progress_risk', lambda: predictor._batch_progress_risk(
+            time_progress, scored['done_points'].to_numpy(dtype=float), scored['total_points'].to_numpy(dtype=float)
+        ))
+        self._stage('predictor.completion_risk', lambda: predictor._batch_completion_risk(
+            scored['done_issues'].to_numpy(), scored['todo_issues'].to_numpy(), scored['total_issues'].to_numpy()
+        ))
+        self._stage('predictor.blocker_risk', lambda: predictor._batch_blocker_risk(
+            scored['blocked_issues'].to_numpy(), scored['blocked_points'].to_numpy(dtype=float),
+            scored['total_issues'].to_numpy(), scored['total_points'].to_numpy(dtype=float)
+        ))
+        self._stage('predictor.analyze_all_sprints', lambda: predictor.analyze_all_sprints(compact, summary, velocity))
+        sprint = self._active_sprint()
+        self._stage('predictor.predict_delay', lambda: predictor.predict_delay(compact, sprint, velocity))
+    
+    def _endpoints(self, df: pd.DataFrame):
+        # No startup hooks: they would connect to Mongo
+        client = TestClient(server.app)
+        sprint = self._active_sprint()
+        for endpoint in ENDPOINTS:
+            path = endpoint.format(sprint=sprint)
+            
+            def call():
+                response = client.get(path, params={'workspace': WORKSPACE})
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+            self._stage(f"GET {endpoint}", call)
+    
+    def _jira_fetch(self, df: pd.DataFrame):
+        mock = MockJiraServer(self.dataset, df)
+        
+        for strategy in ('sprint', 'jql'):
+            async def fetch():
+                async with JiraAPIClient(
+                    'https://jira.example.com', 'benchmark@example.com', 'token',
+                    transport=mock.transport(), requests_per_second=1e6, max_concurrency=16
+                ) as client:
+                    await JiraService(client, fetch_strategy=strategy).fetch_all_data()
+            self._stage(f"jira.fetch_all_data[{strategy}]", lambda: asyncio.run(fetch()), repeat=1)
+    
+    def _active_sprint(self) -> str:
+        sprints = self.dataset.sprint_table()
+        return sprints.loc[sprints['state'] == 'active', 'name'].iloc[0]
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Stages slower or hungrier than the baseline by more than tolerance"""
+    regressions = []
+    for size, stages in results.items():
+        for stage, result in stages.items():
+            before = baseline.get(size, {}).get(stage)
+            if before is None:
+                continue
+            for metric, floor in (('median_seconds', MIN_COMPARABLE_SECONDS), ('peak_bytes', MIN_COMPARABLE_BYTES)):
+                if max(result[metric], before[metric]) < floor:
+                    continue
+                if result[metric] > before[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{size} {stage}: {metric} {before[metric]:.4g} -> {result[metric]:.4g} "
+                        f"(+{(result[metric] / before[metric] - 1) * 100 if before[metric] else float('inf'):.0f}%)"
+                    )
+    return regressions
+
+
+def print_table(results: Dict):
+    print(f"{'size':<16} {'stage':<44} {'median ms':>10} {'min ms':>10} {'peak MB':>9}")
+    for size, stages in results.items():
+        for stage, result in stages.items():
+            print(
+                f"{size:<16} {stage:<44} {result['median_seconds'] * 1000:>10.2f} "
+                f"{result['min_seconds'] * 1000:>10.2f} {result['peak_bytes'] / 1e6:>9.2f}"
+            )
+
+
+def parse_sizes(value: str) -> List[Tuple[int, int]]:
+    sizes = []
+    for size in value.split(','):
+        rows, _, sprints = size.lower().partition('x')
+        sizes.append((int(rows), int(sprints or max(10, int(rows) // 100))))
+    return sizes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=parse_sizes, default=parse_sizes('1000x10,10000x100,100000x1000'),
+                        help="comma-separated ROWSxSPRINTS (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed calls per stage")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--excel', action='store_true', help="also time parsing an Excel export (slow to write)")
+    parser.add_argument('--jira-max-rows', type=int, default=50000,
+                        help="time the Jira fetch against a mock Jira up to this many rows")
+    parser.add_argument('--output', help="write results as JSON")
+    parser.add_argument('--baseline', help="compare with the JSON results of an earlier run")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown before a regression")
+    args = parser.parse_args(argv)
+    
+    # Only the benchmark's progress, not the app's own logging
+    logging.getLogger().setLevel(logging.WARNING)
+    logger.setLevel(logging.INFO)
+    
+    results = {}
+    for rows, sprints in args.sizes:
+        size = f"{rows}x{sprints}"
+        results[size] = Benchmark(rows, sprints, args.repeat, args.seed).run(args.excel, args.jira_max_rows)
+    
+    print_table(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Response Compression
+ASGI middleware compressing responses with brotli or gzip, negotiated from Accept-Encoding
+"""
+
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # Only gzip is offered without brotli
+    brotli = None
+
+# Encodings in order of preference when the client accepts several equally
+SUPPORTED_ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# Responses that are never compressed
+UNCOMPRESSED_STATUS = (204, 304)
+
+
+class _Encoder:
+    """One response's compressor; flush() emits everything written so far"""
+    
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits 16 + MAX_WBITS writes the gzip container
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.process(data) + (self._compressor.finish() if final else self._compressor.flush())
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _vary_by_encoding(headers: MutableHeaders):
+    """Add Accept-Encoding to Vary unless it is already listed"""
+    listed = [value.strip().lower() for value in headers.get('vary', '').split(',')]
+    if 'accept-encoding' not in listed:
+        headers.add_vary_header('Accept-Encoding')
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies of at least minimum_size bytes with the best
+    encoding the client accepts (brotli when installed, else gzip). Streamed
+    responses (NDJSON) are compressed chunk by chunk and flushed after each,
+    so every batch still reaches the client as soon as it is produced.
+    Compressed responses get Vary: Accept-Encoding and a weak ETag, as
+    their bytes differ from the identity encoding's. The ETag is weakened
+    (and Accept-Encoding added to Vary) on every response to a client that
+    accepts compression, compressed or not, so a 304 carries the same ETag
+    and Vary as the 200 it stands for.
+    """
+    
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = self.negotiate(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message: Optional[dict] = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start_message, encoder, passthrough
+            if message['type'] == 'http.response.start':
+                start_message = {**message, 'headers': list(message.get('headers', []))}
+                headers = MutableHeaders(raw=start_message['headers'])
+                if 'etag' in headers:
+                    if not headers['etag'].startswith('W/'):
+                        headers['ETag'] = f"W/{headers['etag']}"
+                    _vary_by_encoding(headers)
+                passthrough = 'content-encoding' in headers or message['status'] in UNCOMPRESSED_STATUS
+                if passthrough:
+                    await send(start_message)
+                return
+            if message['type'] != 'http.response.body' or passthrough:
+                await send(message)
+                return
+            
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            if encoder is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+                
+                encoder = _Encoder(encoding, self.gzip_level, self.brotli_quality)
+                compressed = encoder.compress(body, final=not more_body)
+                headers = MutableHeaders(raw=start_message['headers'])
+                headers['Content-Encoding'] = encoding
+                _vary_by_encoding(headers)
+                if more_body:
+                    del headers['Content-Length']
+                else:
+                    headers['Content-Length'] = str(len(compressed))
+                await send(start_message)
+                await send({**message, 'body': compressed})
+                return
+            
+            await send({**message, 'body': encoder.compress(body, final=not more_body)})
+        
+        await self.app(scope, receive, send_compressed)
+    
+    @staticmethod
+    def negotiate(accept_encoding: str) -> Optional[str]:
+        """The preferred supported encoding the client accepts (q > 0), or None"""
+        weights: Dict[str, float] = {}
+        for part in accept_encoding.split(','):
+            name, _, params = part.strip().partition(';')
+            weight = 1.0
+            for param in params.split(';'):
+                key, _, value = param.strip().partition('=')
+                if key == 'q':
+                    try:
+                        weight = float(value)
+                    except ValueError:
+                        weight = 0.0
+            if name.strip():
+                weights[name.strip().lower()] = weight
+        
+        wildcard = weights.get('*', 0.0)
+        candidates = [
+            (weights.get(encoding, wildcard), -rank, encoding)
+            for rank, encoding in enumerate(SUPPORTED_ENCODINGS)
+        ]
+        weight, _, encoding = max(candidates)
+        return encoding if weight > 0 else None
@@ -0,0 +1,210 @@
+"""
+Compute Pool
+Runs blocking pandas work off the asyncio event loop with bounded concurrency and queueing metrics
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+POOL_KINDS = ('thread', 'process')
+
+# Shared frames kept on disk by the pool, and loaded frames kept by each worker
+SHARED_FRAME_LIMIT = 4
+
+
+class SharedFrame:
+    """A DataFrame written once for process workers, passed to them by path"""
+    
+    def __init__(self, path: str):
+        self.path = path
+
+
+# Frames this worker process has loaded, least recently used first
+_worker_frames: 'OrderedDict[str, pd.DataFrame]' = OrderedDict()
+
+
+def _load_shared(value: Any) -> Any:
+    if not isinstance(value, SharedFrame):
+        return value
+    df = _worker_frames.get(value.path)
+    if df is None:
+        df = pd.read_pickle(value.path)
+        _worker_frames[value.path] = df
+        while len(_worker_frames) > SHARED_FRAME_LIMIT:
+            _worker_frames.popitem(last=False)
+    _worker_frames.move_to_end(value.path)
+    return df
+
+
+def _call_with_shared(func: Callable, args: tuple, kwargs: dict) -> Any:
+    """Runs in a process worker: swap SharedFrames for their frames, then call func"""
+    args = [_load_shared(arg) for arg in args]
+    kwargs = {name: _load_shared(value) for name, value in kwargs.items()}
+    return func(*args, **kwargs)
+
+
+class ComputePool:
+    """
+    Executor for CPU-bound analytics so cheap endpoints keep responding
+    while predictions or rollups are being computed:
+    1. run() uses the configured executor: a thread pool, or a process pool
+       (spawned workers, so the function and its arguments must be
+       picklable and defined outside server.py)
+    2. run_in_thread() always uses a thread, for work that updates
+       in-process state (installing a dataset, upload progress)
+    3. share() turns a dataset's frame into an argument for run(): the
+       frame itself for threads; for processes a SharedFrame, pickled to
+       disk once per dataset version and cached by each worker on first
+       use, so requests don't pickle the whole frame every time
+    
+    At most max_concurrency jobs run at once across both; the rest wait in
+    FIFO order and are counted in stats().
+    """
+    
+    def __init__(self, kind: str = 'thread', max_workers: Optional[int] = None, max_concurrency: Optional[int] = None):
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Unknown compute pool kind '{kind}', expected one of {POOL_KINDS}")
+        
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or self.max_workers
+        
+        self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='compute')
+        self._executor: Executor = self._threads
+        self._shared_dir: Optional[Path] = None
+        self._shared: 'OrderedDict[str, asyncio.Future]' = OrderedDict()
+        if kind == 'process':
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            self._shared_dir = Path(tempfile.mkdtemp(prefix='compute-frames-'))
+        
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._queued = 0
+        self._running = 0
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'peak_queued': 0,
+            'wait_seconds_total': 0.0,
+            'wait_seconds_max': 0.0,
+            'run_seconds_total': 0.0
+        }
+    
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func in the configured executor"""
+        return await self._submit(self._executor, func, *args, **kwargs)
+    
+    async def run_in_thread(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func in a worker thread, whatever the configured kind"""
+        return await self._submit(self._threads, func, *args, **kwargs)
+    
+    async def share(self, key: str, df: pd.DataFrame) -> Any:
+        """df as an argument for run(); key (a dataset version) must change whenever df does"""
+        if self._shared_dir is None:
+            return df
+        
+        shared = self._shared.get(key)
+        if shared is None:
+            # Concurrent requests for the same version wait on one write
+            shared = asyncio.ensure_future(self.run_in_thread(self._write_shared, key, df))
+            self._shared[key] = shared
+            while len(self._shared) > SHARED_FRAME_LIMIT:
+                _, evicted = self._shared.popitem(last=False)
+                evicted.add_done_callback(self._remove_shared)
+        self._shared.move_to_end(key)
+        
+        try:
+            return await asyncio.shield(shared)
+        except Exception:
+            if self._shared.get(key) is shared:
+                del self._shared[key]
+            raise
+    
+    def stats(self) -> Dict:
+        finished = self._stats['completed'] + self._stats['failed']
+        average = lambda total: total / finished if finished else 0.0
+        return {
+            'kind': self.kind,
+            'max_workers': self.max_workers,
+            'max_concurrency': self.max_concurrency,
+            'queued': self._queued,
+            'running': self._running,
+            **self._stats,
+            'wait_seconds_avg': average(self._stats['wait_seconds_total']),
+            'run_seconds_avg': average(self._stats['run_seconds_total'])
+        }
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._executor is not self._threads:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._shared_dir is not None:
+            shutil.rmtree(self._shared_dir, ignore_errors=True)
+    
+    def _write_shared(self, key: str, df: pd.DataFrame) -> SharedFrame:
+        path = self._shared_dir / f'{key}.pkl'
+        tmp_path = path.with_suffix('.tmp')
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+        return SharedFrame(str(path))
+    
+    @staticmethod
+    def _remove_shared(shared: asyncio.Future):
+        # Workers that already loaded the frame keep it in their own cache
+        if not shared.cancelled() and shared.exception() is None:
+            try:
+                os.unlink(shared.result().path)
+            except OSError as e:
+                logger.error(f"Error removing shared frame {shared.result().path}: {str(e)}")
+    
+    async def _submit(self, executor: Executor, func: Callable, *args, **kwargs) -> Any:
+        self._stats['submitted'] += 1
+        self._queued += 1
+        self._stats['peak_queued'] = max(self._stats['peak_queued'], self._queued)
+        queued_at = time.perf_counter()
+        
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._queued -= 1
+        
+        started_at = time.perf_counter()
+        wait = started_at - queued_at
+        self._stats['wait_seconds_total'] += wait
+        self._stats['wait_seconds_max'] = max(self._stats['wait_seconds_max'], wait)
+        
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if executor is self._threads:
+                call = functools.partial(func, *args, **kwargs)
+            else:
+                call = functools.partial(_call_with_shared, func, args, kwargs)
+            result = await loop.run_in_executor(executor, call)
+        except BaseException:
+            self._stats['failed'] += 1
+            raise
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+            self._stats['run_seconds_total'] += time.perf_counter() - started_at
+        
+        self._stats['completed'] += 1
+        return result
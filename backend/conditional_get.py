@@ -0,0 +1,80 @@
+"""
+Conditional GET Support
+Derives ETags for analytics responses from the dataset version so unchanged payloads can be answered with 304
+"""
+
+import hashlib
+import time
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+class ETagPolicy:
+    """
+    ETags for analytics responses. A response only changes when:
+    1. A new dataset version is installed (every install gets a new version)
+    2. The request asks for something else (path or query string)
+    3. For outputs computed relative to the current time (days remaining,
+       sprint progress), the time_bucket_seconds window rolls over
+    
+    Matching requests are answered before any pandas work is done.
+    """
+    
+    def __init__(self, time_bucket_seconds: int = 300):
+        self.time_bucket_seconds = time_bucket_seconds
+    
+    def etag(
+        self,
+        dataset,
+        request: Request,
+        date_dependent: bool = False,
+        variant: str = '',
+        now: Optional[datetime] = None
+    ) -> str:
+        parts = [dataset.version, request.url.path, request.url.query, variant]
+        if date_dependent:
+            timestamp = now.timestamp() if now is not None else time.time()
+            parts.append(str(int(timestamp // self.time_bucket_seconds)))
+        digest = hashlib.sha1('|'.join(parts).encode()).hexdigest()
+        return f'"{digest}"'
+    
+    def matches(self, request: Request, etag: str) -> bool:
+        """Whether If-None-Match lists etag (weak comparison, as GET requires)"""
+        header = request.headers.get('if-none-match')
+        if not header:
+            return False
+        if header.strip() == '*':
+            return True
+        
+        candidates = [candidate.strip() for candidate in header.split(',')]
+        return any(candidate.removeprefix('W/') == etag for candidate in candidates)
+    
+    def check(
+        self,
+        request: Request,
+        response: Response,
+        dataset,
+        date_dependent: bool = False,
+        variant: str = '',
+        now: Optional[datetime] = None
+    ) -> Optional[Response]:
+        """
+        Tag the response with the dataset's ETag; returns a 304 response to
+        send instead when the client already has this version. variant
+        distinguishes payloads that change without a new dataset version;
+        now is the time date-dependent outputs are computed for (defaults
+        to the current time). A Vary header already set on response is
+        repeated on the 304.
+        """
+        etag = self.etag(dataset, request, date_dependent, variant, now)
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if self.matches(request, etag):
+            # The 304 stands for the response's variant, so it varies by the same headers
+            if 'vary' in response.headers:
+                headers['Vary'] = response.headers['vary']
+            return Response(status_code=304, headers=headers)
+        
+        response.headers.update(headers)
+        return None
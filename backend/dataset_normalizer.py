@@ -0,0 +1,222 @@
+"""
+Dataset Normalization Stage
+Shrinks an ingested issue dataset to the compact in-memory layout used by the analytics endpoints
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns read by any endpoint or by the delay predictor; everything else is dropped
+USED_COLUMNS = [
+    'Jira ID',
+    'Summary',
+    'Status',
+    'Story Points',
+    'Assigned Sprint',
+    'Assigned Sprint\nStart date',
+    'Assigned Sprint\nEnd date',
+    'Assignee',
+    'Priority',
+    'Issue Type',
+    'Created',
+    'Resolved',
+    'Board'
+]
+
+# Sprint dates, stored as UTC timestamps so no request has to parse them again
+SPRINT_DATE_COLUMNS = ['Assigned Sprint\nStart date', 'Assigned Sprint\nEnd date']
+
+# Low-cardinality string columns stored as categoricals
+CATEGORICAL_COLUMNS = ['Status', 'Assigned Sprint', 'Assignee', 'Priority', 'Issue Type', 'Board']
+
+# A column only becomes categorical if it has fewer distinct values than this share of rows
+MAX_CATEGORY_RATIO = 0.5
+
+# float32 represents every multiple of 0.5 exactly while sums stay below 2**23,
+# so story point totals are unchanged by the downcast
+FLOAT32_EXACT_LIMIT = 2 ** 23
+
+
+def to_utc_timestamps(values) -> pd.Series:
+    """
+    Dates (strings, datetimes or an already parsed column) as a UTC datetime
+    Series. Values without a timezone are taken as UTC; missing or
+    unparseable values become NaT.
+    """
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.DatetimeTZDtype) and str(values.dt.tz) == 'UTC':
+        return values
+    return pd.to_datetime(values, utc=True, errors='coerce', format='mixed')
+
+
+class DatasetNormalizer:
+    """
+    Normalizes raw datasets (Excel/CSV uploads and Jira fetches):
+    1. Prunes columns to the ones the app reads (adding any that are missing)
+    2. Parses sprint dates into UTC datetime columns
+    3. Stores board ids as strings, as Jira syncs do (spreadsheets read
+       them as numbers)
+    4. Converts repeated strings to categoricals
+    5. Downcasts numbers when it doesn't change any value or sum
+    
+    Files read in chunks are normalized a chunk at a time with
+    compact_chunk() and joined with concat_chunks(), so only compact
+    chunks are kept while the rest of the file is read.
+    """
+    
+    def normalize(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict]:
+        """Return the compact dataset and a report of the memory saved"""
+        memory_before = int(df.memory_usage(deep=True).sum())
+        columns_before = len(df.columns)
+        
+        compact = self.compact(self.board_ids(self.parse_dates(self.prune_columns(df))))
+        
+        memory_after = int(compact.memory_usage(deep=True).sum())
+        report = {
+            'rows': len(compact),
+            'columns_before': columns_before,
+            'columns_after': len(compact.columns),
+            'memory_before_bytes': memory_before,
+            'memory_after_bytes': memory_after,
+            'memory_saved_bytes': memory_before - memory_after
+        }
+        logger.info(
+            f"Normalized dataset: {len(compact)} rows, {columns_before} -> {len(compact.columns)} columns, "
+            f"{memory_before / 1e6:.1f} MB -> {memory_after / 1e6:.1f} MB"
+        )
+        return compact, report
+    
+    def prune_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Keep only USED_COLUMNS, in their original order. Used columns missing
+        from the export are added empty so every rollup can be built.
+        """
+        used = set(USED_COLUMNS)
+        pruned = df[[column for column in df.columns if column in used]]
+        
+        missing = [column for column in USED_COLUMNS if column not in pruned.columns]
+        if missing:
+            pruned = pruned.assign(**{column: np.nan for column in missing})
+        return pruned
+    
+    def parse_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Sprint date columns as UTC timestamps (naive values are taken as UTC)"""
+        return df.assign(**{
+            column: to_utc_timestamps(df[column]) for column in SPRINT_DATE_COLUMNS if column in df.columns
+        })
+    
+    def board_ids(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Numeric board ids as strings ('7', not 7 or 7.0), so filters match them like synced ones"""
+        if 'Board' not in df.columns:
+            return df
+        boards = df['Board']
+        if not pd.api.types.is_numeric_dtype(boards.dtype) or boards.isna().all():
+            return df
+        
+        valid = boards.notna()
+        ids = pd.Series(np.nan, index=df.index, dtype=object)
+        ids[valid] = boards[valid].astype('int64').astype(str)
+        return df.assign(Board=ids)
+    
+    def compact(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert repeated strings to categoricals and downcast numbers"""
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            if column in CATEGORICAL_COLUMNS:
+                series = self._to_category(series)
+            elif pd.api.types.is_float_dtype(series.dtype):
+                series = self._downcast_float(series)
+            elif pd.api.types.is_integer_dtype(series.dtype):
+                series = pd.to_numeric(series, downcast='integer')
+            columns[column] = series
+        
+        return pd.DataFrame(columns, index=df.index)
+    
+    def compact_chunk(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normalize one chunk of a file: dates parsed, board ids as strings,
+        strings of categorical columns as categoricals (whatever their
+        cardinality; concat_chunks applies MAX_CATEGORY_RATIO to the whole
+        file) and floats downcast
+        """
+        df = self.board_ids(self.parse_dates(df))
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            if column in CATEGORICAL_COLUMNS and self._is_text(series):
+                series = series.astype('category')
+            elif pd.api.types.is_float_dtype(series.dtype):
+                series = self._downcast_float(series)
+            columns[column] = series
+        return pd.DataFrame(columns, index=df.index)
+    
+    def concat_chunks(self, chunks: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Join chunks made by compact_chunk into the frame normalizing the
+        whole file would give: the chunks' categories are unified, and the
+        category ratio and float32 sum limit are checked over every row
+        """
+        columns = {}
+        for column in chunks[0].columns:
+            parts = [chunk[column] for chunk in chunks]
+            if any(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+                series = self._concat_categorical(parts)
+            else:
+                series = pd.concat(parts, ignore_index=True)
+                # float32 chunks are each exact; their total may not be
+                if series.dtype == np.float32 and np.nansum(np.abs(series.to_numpy(dtype=float))) >= FLOAT32_EXACT_LIMIT:
+                    series = series.astype(float)
+            columns[column] = series
+        return pd.DataFrame(columns)
+    
+    def _concat_categorical(self, parts: List[pd.Series]) -> pd.Series:
+        """Categorical chunks (and all-missing ones) joined under one set of categories"""
+        if any(not isinstance(part.dtype, pd.CategoricalDtype) and part.notna().any() for part in parts):
+            return self._to_category(pd.concat([part.astype(object) for part in parts], ignore_index=True))
+        
+        # Sorted, as astype('category') orders them
+        categories = pd.Categorical(list(dict.fromkeys(
+            category for part in parts if isinstance(part.dtype, pd.CategoricalDtype) for category in part.cat.categories
+        ))).categories
+        series = pd.concat([
+            part.cat.set_categories(categories) if isinstance(part.dtype, pd.CategoricalDtype)
+            else pd.Series(pd.Categorical(part, categories=categories), index=part.index)
+            for part in parts
+        ], ignore_index=True)
+        
+        if len(categories) >= max(len(series) * MAX_CATEGORY_RATIO, 1):
+            return series.astype(categories.dtype)
+        return series
+    
+    def _is_text(self, series: pd.Series) -> bool:
+        return pd.api.types.is_string_dtype(series.dtype) or series.dtype == object
+    
+    def _to_category(self, series: pd.Series) -> pd.Series:
+        """Categorical for string columns with few distinct values"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series
+        if not self._is_text(series):
+            return series
+        if series.nunique() >= max(len(series) * MAX_CATEGORY_RATIO, 1):
+            return series
+        return series.astype('category')
+    
+    def _downcast_float(self, series: pd.Series) -> pd.Series:
+        """float32 when every value and every partial sum stays exact"""
+        if series.dtype == np.float32:
+            return series
+        
+        values = series.to_numpy(dtype=float)
+        finite = values[np.isfinite(values)]
+        doubled = finite * 2
+        if not np.array_equal(doubled, np.round(doubled)):
+            return series
+        if np.abs(finite).sum() >= FLOAT32_EXACT_LIMIT:
+            return series
+        
+        return series.astype(np.float32)
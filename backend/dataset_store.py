@@ -0,0 +1,205 @@
+"""
+Versioned Dataset Store
+Holds the active dataset together with rollups that are built once when it is installed
+"""
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from dataset_normalizer import DatasetNormalizer
+from sprint_aggregator import SprintAggregator
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetVersion:
+    """
+    Immutable snapshot of an installed dataset and its precomputed rollups.
+    
+    Endpoints read the store's current version once and use it for the whole
+    request, so a concurrent upload or refresh never mixes two datasets.
+    """
+    
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        source: str,
+        key: Optional[str],
+        memory_report: dict,
+        sprint_summary: pd.DataFrame,
+        assignee_summary: pd.DataFrame,
+        overall: dict,
+        version: Optional[str] = None
+    ):
+        self.df = df
+        self.source = source
+        self.key = key
+        self.memory_report = memory_report
+        self.version = version or uuid.uuid4().hex
+        self.installed_at = datetime.now(timezone.utc)
+        self.sprint_summary = sprint_summary
+        self.assignee_summary = assignee_summary
+        self.overall = overall
+    
+    @property
+    def memory_bytes(self) -> int:
+        """Memory held by the dataset and its rollups"""
+        rollups = self.sprint_summary.memory_usage(deep=True).sum() + self.assignee_summary.memory_usage(deep=True).sum()
+        return int(self.memory_report['memory_after_bytes'] + rollups)
+
+
+class DatasetStore:
+    """Holds the current DatasetVersion and swaps it atomically on install"""
+    
+    def __init__(
+        self,
+        aggregator: Optional[SprintAggregator] = None,
+        normalizer: Optional[DatasetNormalizer] = None
+    ):
+        self.aggregator = aggregator or SprintAggregator()
+        self.normalizer = normalizer or DatasetNormalizer()
+        self._current: Optional[DatasetVersion] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def current(self) -> Optional[DatasetVersion]:
+        return self._current
+    
+    def install(self, df: pd.DataFrame, source: str, key: Optional[str] = None) -> DatasetVersion:
+        """
+        Normalize df to the compact layout, build every rollup for it and
+        make it the current dataset. key identifies where it came from
+        (upload ID or Jira connection ID).
+        
+        The previous version (and its rollups) stays visible until the new
+        one is fully built, then both are replaced in a single assignment.
+        """
+        with self._lock:
+            df, memory_report = self.normalizer.normalize(df)
+            sprint_summary = self.aggregator.summarize_sprints(df)
+            dataset = DatasetVersion(
+                df=df,
+                source=source,
+                key=key,
+                memory_report=memory_report,
+                sprint_summary=sprint_summary,
+                assignee_summary=self.aggregator.summarize_assignees(df),
+                overall=self.aggregator.summarize_overall(df, sprint_summary)
+            )
+            self._current = dataset
+            return dataset
+
+
+class DatasetRegistry:
+    """
+    DatasetStores keyed by workspace, so every team keeps its own dataset
+    and rollups in one process.
+    
+    The combined memory of all installed datasets is kept under
+    memory_budget_bytes by evicting the least recently used workspaces.
+    The workspace being installed is never evicted, even if it alone
+    exceeds the budget. on_evict is called with each evicted workspace.
+    """
+    
+    def __init__(
+        self,
+        memory_budget_bytes: int,
+        aggregator: Optional[SprintAggregator] = None,
+        normalizer: Optional[DatasetNormalizer] = None,
+        on_evict: Optional[Callable[[str], None]] = None
+    ):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.aggregator = aggregator or SprintAggregator()
+        self.normalizer = normalizer or DatasetNormalizer()
+        self.on_evict = on_evict
+        self._stores: "OrderedDict[str, DatasetStore]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, workspace: str) -> Optional[DatasetVersion]:
+        """Current dataset of a workspace (marking it recently used), or None"""
+        with self._lock:
+            store = self._stores.get(workspace)
+            if store is None:
+                return None
+            self._stores.move_to_end(workspace)
+            return store.current
+    
+    def install(self, workspace: str, df: pd.DataFrame, source: str, key: Optional[str] = None) -> DatasetVersion:
+        """Install df as the workspace's dataset, then evict others until within budget"""
+        with self._lock:
+            store = self._stores.get(workspace)
+            if store is None:
+                store = DatasetStore(self.aggregator, self.normalizer)
+                self._stores[workspace] = store
+        
+        # Building rollups is the slow part; other workspaces stay readable meanwhile
+        dataset = store.install(df, source=source, key=key)
+        
+        with self._lock:
+            # The workspace may have been evicted while it was being built
+            self._stores[workspace] = store
+            self._stores.move_to_end(workspace)
+            evicted = self._evict_over_budget(keep=workspace)
+        
+        for name in evicted:
+            logger.info(f"Evicted dataset for workspace {name} (memory budget {self.memory_budget_bytes / 1e6:.0f} MB)")
+            if self.on_evict:
+                self.on_evict(name)
+        return dataset
+    
+    def remove(self, workspace: str) -> bool:
+        with self._lock:
+            return self._stores.pop(workspace, None) is not None
+    
+    def workspaces(self) -> List[str]:
+        """Workspaces with an installed dataset, least recently used first"""
+        with self._lock:
+            return list(self._stores)
+    
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return self._total_memory()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'memory_budget_bytes': self.memory_budget_bytes,
+                'memory_bytes': self._total_memory(),
+                'workspaces': {
+                    name: {
+                        'version': store.current.version,
+                        'source': store.current.source,
+                        'rows': store.current.memory_report['rows'],
+                        'memory_bytes': store.current.memory_bytes
+                    }
+                    for name, store in self._stores.items()
+                    if store.current is not None
+                }
+            }
+    
+    def _total_memory(self) -> int:
+        return sum(
+            store.current.memory_bytes
+            for store in self._stores.values()
+            if store.current is not None
+        )
+    
+    def _evict_over_budget(self, keep: str) -> List[str]:
+        evicted = []
+        total = self._total_memory()
+        for name in list(self._stores):
+            if total <= self.memory_budget_bytes:
+                break
+            if name == keep:
+                continue
+            store = self._stores.pop(name)
+            if store.current is not None:
+                total -= store.current.memory_bytes
+            evicted.append(name)
+        return evicted
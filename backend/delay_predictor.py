@@ -3,9 +3,49 @@ Enhanced Sprint Delay Prediction Module
 Implements comprehensive delay prediction with task completion rates and blocker trends
 """
 
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from dataset_normalizer import to_utc_timestamps
+from metrics import stage_timer
+from sprint_aggregator import SprintAggregator, BACKLOG_SPRINT
+from sprint_query import SprintPage, SprintQuery
+from velocity_engine import Velocity
+
+# Fields delay predictions can be sorted by
+PREDICTION_SORT_FIELDS = ['sprint_name', 'risk_level', 'delay_probability', 'days_remaining', 'start_date', 'end_date']
+
+class SprintScores:
+    """
+    Risk factors of the scored sprints (arrays aligned with summary rows)
+    and the positions of the sprints to predict, in listing order
+    """
+    
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        summary: pd.DataFrame,
+        order: List[int],
+        page: Optional[SprintPage] = None,
+        progress_risk: Optional[np.ndarray] = None,
+        completion_risk: Optional[np.ndarray] = None,
+        blocker_risk: Optional[np.ndarray] = None,
+        delay_probability: Optional[np.ndarray] = None,
+        risk_levels: Optional[List[str]] = None,
+        days_remaining: Optional[list] = None
+    ):
+        self.df = df
+        self.summary = summary
+        self.order = order
+        self.page = page
+        self.progress_risk = progress_risk
+        self.completion_risk = completion_risk
+        self.blocker_risk = blocker_risk
+        self.delay_probability = delay_probability
+        self.risk_levels = risk_levels
+        self.days_remaining = days_remaining
 
 class DelayPredictor:
     """
@@ -13,6 +53,11 @@ class DelayPredictor:
     1. Sprint progress vs time elapsed
     2. Task completion rates (velocity trends)
     3. Blocker trends and impact
+    
+    Pass a Velocity (VelocityEngine) to project completion of started
+    sprints with the recent throughput of their assignees (or, without
+    assignee history, of their team), shared across each one's open
+    sprints; without one only the current status counts.
     """
     
     def __init__(self):
@@ -23,10 +68,19 @@ class DelayPredictor:
             'low': 0.0         # <25% chance
         }
     
-    def predict_delay(self, sprint_data: pd.DataFrame, sprint_name: str) -> Dict:
+    def predict_delay(
+        self,
+        sprint_data: pd.DataFrame,
+        sprint_name: str,
+        velocity: Optional[Velocity] = None,
+        now: Optional[pd.Timestamp] = None
+    ) -> Dict:
         """
         Main delay prediction function
         
+        Sprint dates are compared with now (UTC, defaults to the current
+        time); days are counted in UTC.
+        
         Returns:
         {
             'will_delay': bool,
@@ -46,14 +100,24 @@ class DelayPredictor:
         if len(sprint_df) == 0:
             return None
         
+        # Story points may be stored as float32; score in float64 like the batch path
+        sprint_df = sprint_df.astype({'Story Points': float})
+        now = now or pd.Timestamp.now(tz='UTC')
+        
+        days_remaining = self._get_days_remaining(sprint_df, now)
+        
         # Factor 1: Progress vs Time Analysis
-        progress_risk = self._analyze_progress_vs_time(sprint_df)
+        with stage_timer('predict_delay.progress'):
+            progress_risk = self._analyze_progress_vs_time(sprint_df, now)
         
-        # Factor 2: Task Completion Rate
-        completion_risk = self._analyze_completion_rate(sprint_df)
+        # Factor 2: Task Completion Rate, projected with the assignees' (or team's) throughput
+        with stage_timer('predict_delay.completion_rate'):
+            issue_rate = velocity.sprint_issue_rates([sprint_name], now)[0] if velocity is not None else 0.0
+            completion_risk = self._analyze_completion_rate(sprint_df, issue_rate, days_remaining)
         
         # Factor 3: Blocker Trend Analysis
-        blocker_risk = self._analyze_blocker_trends(sprint_df)
+        with stage_timer('predict_delay.blockers'):
+            blocker_risk = self._analyze_blocker_trends(sprint_df)
         
         # Combined delay probability (weighted average)
         delay_probability = (
@@ -66,12 +130,14 @@ class DelayPredictor:
         risk_level = self._get_risk_level(delay_probability)
         
         # Generate recommendations
-        recommendations = self._generate_recommendations(
-            progress_risk, completion_risk, blocker_risk, sprint_df
-        )
+        with stage_timer('predict_delay.recommendations'):
+            metrics = self._get_detailed_metrics(sprint_df)
+            recommendations = self._generate_recommendations(
+                progress_risk, completion_risk, blocker_risk, metrics,
+                sprint_df[sprint_df['Status'] == 'Blocked']
+            )
         
         # Early warning (predict delay 3+ days before sprint end)
-        days_remaining = self._get_days_remaining(sprint_df)
         early_warning = days_remaining >= 3 and delay_probability > 0.5
         
         return {
@@ -87,67 +153,66 @@ class DelayPredictor:
             },
             'recommendations': recommendations,
             'early_warning': early_warning,
-            'metrics': self._get_detailed_metrics(sprint_df)
+            'metrics': metrics
         }
     
-    def _analyze_progress_vs_time(self, sprint_df: pd.DataFrame) -> float:
+    def _analyze_progress_vs_time(self, sprint_df: pd.DataFrame, now: pd.Timestamp) -> float:
         """
         Analyze if progress is on track with time elapsed
         
         Logic: If 50% of time has passed, we should have 50% completion
         Returns risk score 0-1
         """
-        try:
-            start_date = pd.to_datetime(sprint_df['Assigned Sprint\nStart date'].iloc[0])
-            end_date = pd.to_datetime(sprint_df['Assigned Sprint\nEnd date'].iloc[0])
-            now = pd.Timestamp.now()
-            
-            total_duration = (end_date - start_date).days
-            time_elapsed = (now - start_date).days
-            
-            if total_duration <= 0:
-                return 0.5
-            
-            time_progress = min(time_elapsed / total_duration, 1.0)
-            
-            # Calculate work progress
-            total_points = sprint_df['Story Points'].sum()
-            completed_points = sprint_df[sprint_df['Status'] == 'Done']['Story Points'].sum()
-            work_progress = completed_points / total_points if total_points > 0 else 0
-            
-            # Calculate gap
-            progress_gap = time_progress - work_progress
-            
-            # Convert gap to risk score
-            if progress_gap <= 0:
-                return 0.0  # Ahead of schedule
-            elif progress_gap < 0.2:
-                return 0.2  # Slightly behind
-            elif progress_gap < 0.4:
-                return 0.5  # Moderately behind
-            elif progress_gap < 0.6:
-                return 0.75  # Significantly behind
-            else:
-                return 1.0  # Critically behind
-                
-        except:
-            return 0.5  # Default medium risk if dates unavailable
+        start_date, end_date = self._sprint_dates(sprint_df)
+        
+        total_duration = (end_date - start_date).days
+        time_elapsed = (now - start_date).days
+        
+        if total_duration <= 0:
+            return 0.5
+        
+        time_progress = min(time_elapsed / total_duration, 1.0)
+        
+        # Calculate work progress
+        total_points = sprint_df['Story Points'].sum()
+        completed_points = sprint_df[sprint_df['Status'] == 'Done']['Story Points'].sum()
+        work_progress = completed_points / total_points if total_points > 0 else 0
+        
+        # Calculate gap (NaN without sprint dates, which scores as critically behind, like the batch path)
+        progress_gap = time_progress - work_progress
+        
+        # Convert gap to risk score
+        if progress_gap <= 0:
+            return 0.0  # Ahead of schedule
+        elif progress_gap < 0.2:
+            return 0.2  # Slightly behind
+        elif progress_gap < 0.4:
+            return 0.5  # Moderately behind
+        elif progress_gap < 0.6:
+            return 0.75  # Significantly behind
+        else:
+            return 1.0  # Critically behind
     
-    def _analyze_completion_rate(self, sprint_df: pd.DataFrame) -> float:
+    def _analyze_completion_rate(self, sprint_df: pd.DataFrame, issue_rate: float = 0.0, days_remaining=0) -> float:
         """
         Analyze task completion rate trends
         
         Looks at:
         - How many issues completed vs total
         - Distribution of work across sprint
-        - Velocity compared to historical
+        - Velocity compared to historical: issues the sprint's assignees
+          (or team) are expected to resolve by the sprint end at their
+          recent rate (issue_rate, issues per day) count as completed,
+          in-progress work first
         """
         total_issues = len(sprint_df)
         completed_issues = len(sprint_df[sprint_df['Status'] == 'Done'])
         in_progress = len(sprint_df[sprint_df['Status'] == 'In Progress'])
         todo = len(sprint_df[sprint_df['Status'] == 'To Do'])
         
-        completion_rate = completed_issues / total_issues if total_issues > 0 else 0
+        expected = self._expected_completions(issue_rate, days_remaining, total_issues - completed_issues)
+        todo = max(todo - max(expected - in_progress, 0), 0)
+        completion_rate = (completed_issues + expected) / total_issues if total_issues > 0 else 0
         
         # Calculate risk based on completion rate
         if completion_rate >= 0.8:
@@ -169,6 +234,15 @@ class DelayPredictor:
         
         return min(base_risk, 1.0)
     
+    def _expected_completions(self, issue_rate, days_remaining, open_issues):
+        """
+        Issues expected to be resolved before the sprint ends (scalars or
+        arrays), at most the open ones; unknown days remaining count as none
+        """
+        days = np.nan_to_num(np.asarray(days_remaining, dtype=float), nan=0.0)
+        expected = np.minimum(np.asarray(issue_rate, dtype=float) * np.maximum(days, 0), open_issues)
+        return expected if expected.ndim else float(expected)
+    
     def _analyze_blocker_trends(self, sprint_df: pd.DataFrame) -> float:
         """
         Analyze impact of blockers on sprint
@@ -202,15 +276,23 @@ class DelayPredictor:
         else:
             return 1.0  # Critical blocker situation
     
-    def _get_days_remaining(self, sprint_df: pd.DataFrame) -> int:
+    def _get_days_remaining(self, sprint_df: pd.DataFrame, now: pd.Timestamp) -> int:
         """Get days remaining in sprint"""
-        try:
-            end_date = pd.to_datetime(sprint_df['Assigned Sprint\nEnd date'].iloc[0])
-            now = pd.Timestamp.now()
-            days = (end_date - now).days
-            return max(days, 0)
-        except:
-            return 0
+        _, end_date = self._sprint_dates(sprint_df)
+        days = (end_date - now).days
+        return max(days, 0)
+    
+    def _sprint_dates(self, sprint_df: pd.DataFrame) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """
+        Start and end of a sprint (UTC, NaT if missing) from its first row.
+        Frames installed through DatasetNormalizer are already parsed; raw
+        frames (e.g. straight from read_excel) are parsed here.
+        """
+        first = sprint_df.iloc[:1]
+        return (
+            to_utc_timestamps(first['Assigned Sprint\nStart date']).iloc[0],
+            to_utc_timestamps(first['Assigned Sprint\nEnd date']).iloc[0]
+        )
     
     def _get_risk_level(self, probability: float) -> str:
         """Convert probability to risk level"""
@@ -228,16 +310,21 @@ class DelayPredictor:
         progress_risk: float, 
         completion_risk: float, 
         blocker_risk: float,
-        sprint_df: pd.DataFrame
+        metrics: Dict,
+        blocked_issues: Optional[pd.DataFrame]
     ) -> List[str]:
-        """Generate actionable recommendations based on risk factors"""
+        """
+        Generate actionable recommendations based on risk factors
+        
+        metrics is the sprint's _get_detailed_metrics() dict; blocked_issues
+        holds the sprint's blocked rows and is only read when the blocked
+        items get listed individually (blocker risk > 0.5, at most 5 issues)
+        """
         recommendations = []
         
         # Progress-based recommendations
         if progress_risk > 0.7:
-            total_points = sprint_df['Story Points'].sum()
-            completed = sprint_df[sprint_df['Status'] == 'Done']['Story Points'].sum()
-            remaining = total_points - completed
+            remaining = metrics['total_story_points'] - metrics['completed_points']
             recommendations.append(
                 f"⚠️ URGENT: {remaining:.0f} story points remaining. "
                 f"Consider moving low-priority items to next sprint."
@@ -250,7 +337,7 @@ class DelayPredictor:
         
         # Completion rate recommendations
         if completion_risk > 0.7:
-            in_progress = len(sprint_df[sprint_df['Status'] == 'In Progress'])
+            in_progress = metrics['in_progress_issues']
             recommendations.append(
                 f"📊 Low completion rate detected. {in_progress} items in progress. "
                 f"Reduce WIP (Work In Progress) to improve flow."
@@ -258,9 +345,8 @@ class DelayPredictor:
         
         # Blocker recommendations
         if blocker_risk > 0.5:
-            blocked_issues = sprint_df[sprint_df['Status'] == 'Blocked']
-            blocked_count = len(blocked_issues)
-            blocked_points = blocked_issues['Story Points'].sum()
+            blocked_count = metrics['blocked_issues']
+            blocked_points = metrics['blocked_points']
             recommendations.append(
                 f"🚧 {blocked_count} issues blocked ({blocked_points:.0f} pts). "
                 f"Priority: Unblock these immediately to maintain velocity."
@@ -304,24 +390,297 @@ class DelayPredictor:
             ) if total_points > 0 else 0
         }
     
-    def analyze_all_sprints(self, df: pd.DataFrame) -> List[Dict]:
-        """Analyze all sprints and return predictions"""
-        sprints = df['Assigned Sprint'].dropna().unique()
-        predictions = []
-        
-        for sprint in sprints:
-            if sprint == 'None( Backlog)':
-                continue
+    def analyze_all_sprints(
+        self,
+        df: pd.DataFrame,
+        sprint_summary: Optional[pd.DataFrame] = None,
+        velocity: Optional[Velocity] = None,
+        query: Optional[SprintQuery] = None,
+        now: Optional[pd.Timestamp] = None
+    ) -> List[Dict]:
+        """
+        Analyze all sprints and return predictions
+        
+        Batch scoring mode: the three risk factors, delay probability and
+        detailed metrics are computed for every sprint at once from the
+        per-sprint summary table (SprintAggregator.summarize_sprints), and
+        give the same results as calling predict_delay for each sprint.
+        Pass sprint_summary when it has already been computed for df.
+        
+        With a query, board/state/date filters are applied to the summary
+        before scoring, and recommendations are only generated for the
+        requested page, returned as a SprintPage. Every sprint is scored
+        against the same now (defaults to the current time).
+        """
+        scores = self.score_sprints(df, sprint_summary, velocity, query, now)
+        with stage_timer('analyze_all_sprints.predictions'):
+            predictions = list(self.iter_predictions(scores))
+        
+        if scores.page is not None:
+            return SprintPage(predictions, total=scores.page.total, next_cursor=scores.page.next_cursor)
+        return predictions
+    
+    def score_sprints(
+        self,
+        df: pd.DataFrame,
+        sprint_summary: Optional[pd.DataFrame] = None,
+        velocity: Optional[Velocity] = None,
+        query: Optional[SprintQuery] = None,
+        now: Optional[pd.Timestamp] = None
+    ) -> SprintScores:
+        """
+        Vectorized first half of analyze_all_sprints: the risk factors of
+        every sprint and the order (and page) predictions are listed in
+        """
+        if sprint_summary is None:
+            sprint_summary = SprintAggregator().summarize_sprints(df)
+        now = now or pd.Timestamp.now(tz='UTC')
+        
+        summary = sprint_summary[sprint_summary.index != BACKLOG_SPRINT]
+        if query is not None:
+            summary = query.select(summary, now)
+        if summary.empty:
+            return SprintScores(df, summary, order=[], page=SprintPage() if query is not None else None)
+        
+        total_issues = summary['total_issues'].to_numpy()
+        total_points = summary['total_points'].to_numpy(dtype=float)
+        done_points = summary['done_points'].to_numpy(dtype=float)
+        blocked_issues = summary['blocked_issues'].to_numpy()
+        
+        with stage_timer('analyze_all_sprints.factors'):
+            time_progress, days_remaining = self._batch_sprint_timing(summary, now)
+            
+            # Factor 1-3 for every sprint
+            progress_risk = self._batch_progress_risk(time_progress, done_points, total_points)
+            issue_rates = velocity.sprint_issue_rates(summary.index, now) if velocity is not None else np.zeros(len(summary))
+            completion_risk = self._batch_completion_risk(
+                summary['done_issues'].to_numpy(), summary['todo_issues'].to_numpy(), total_issues,
+                summary['in_progress_issues'].to_numpy(),
+                self._expected_completions(issue_rates, days_remaining, total_issues - summary['done_issues'].to_numpy())
+            )
+            blocker_risk = self._batch_blocker_risk(
+                blocked_issues, summary['blocked_points'].to_numpy(dtype=float), total_issues, total_points
+            )
             
-            prediction = self.predict_delay(df, sprint)
-            if prediction:
-                predictions.append(prediction)
+            # Combined delay probability (same weights as predict_delay)
+            delay_probability = (
+                progress_risk * 0.4 +
+                completion_risk * 0.35 +
+                blocker_risk * 0.25
+            )
         
-        # Sort by risk level (critical first)
+        # Sort by risk level (critical first), then by delay probability
+        risk_levels = [self._get_risk_level(float(probability)) for probability in delay_probability]
         risk_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
-        predictions.sort(key=lambda x: (risk_order.get(x['risk_level'], 4), -x['delay_probability']))
+        order = sorted(
+            range(len(summary)),
+            key=lambda i: (risk_order.get(risk_levels[i], 4), -round(float(delay_probability[i]), 2))
+        )
         
-        return predictions
+        page = None
+        if query is not None:
+            page = query.paginate(
+                self._query_items(summary, order, risk_levels, delay_probability, days_remaining),
+                PREDICTION_SORT_FIELDS
+            )
+            order = [item['position'] for item in page]
+        
+        return SprintScores(
+            df, summary, order, page,
+            progress_risk=progress_risk,
+            completion_risk=completion_risk,
+            blocker_risk=blocker_risk,
+            delay_probability=delay_probability,
+            risk_levels=risk_levels,
+            days_remaining=days_remaining
+        )
+    
+    def iter_predictions(self, scores: SprintScores) -> Iterator[Dict]:
+        """
+        Second half of analyze_all_sprints: each sprint's prediction, built
+        one at a time in listing order so it can be streamed
+        """
+        if not scores.order:
+            return
+        
+        # Blocked rows are only listed for sprints with few, high-risk blockers
+        listed = (scores.blocker_risk > 0.5) & (scores.summary['blocked_issues'].to_numpy() <= 5)
+        blocked_rows = {}
+        if listed[scores.order].any():
+            blocked_df = scores.df[scores.df['Status'] == 'Blocked']
+            blocked_rows = blocked_df.groupby('Assigned Sprint', sort=False).indices
+        
+        days_remaining = scores.days_remaining
+        for i, sprint in zip(scores.order, scores.summary.iloc[scores.order].itertuples()):
+            metrics = self._summary_metrics(sprint)
+            probability = float(scores.delay_probability[i])
+            progress_risk = float(scores.progress_risk[i])
+            completion_risk = float(scores.completion_risk[i])
+            blocker_risk = float(scores.blocker_risk[i])
+            
+            blocked = None
+            if listed[i]:
+                blocked = blocked_df.iloc[blocked_rows.get(sprint.Index, [])]
+            
+            recommendations = self._generate_recommendations(
+                progress_risk, completion_risk, blocker_risk, metrics, blocked
+            )
+            
+            yield {
+                'sprint_name': sprint.Index,
+                'will_delay': probability > 0.5,
+                'delay_probability': round(probability, 2),
+                'risk_level': scores.risk_levels[i],
+                'days_remaining': days_remaining[i],
+                'factors': {
+                    'progress_risk': round(progress_risk, 2),
+                    'completion_rate_risk': round(completion_risk, 2),
+                    'blocker_risk': round(blocker_risk, 2)
+                },
+                'recommendations': recommendations,
+                'early_warning': days_remaining[i] >= 3 and probability > 0.5,
+                'metrics': metrics
+            }
+    
+    def _query_items(
+        self,
+        summary: pd.DataFrame,
+        order: List[int],
+        risk_levels: List[str],
+        delay_probability: np.ndarray,
+        days_remaining: list
+    ) -> List[Dict]:
+        """Name, position and sort fields of every scored sprint, for SprintQuery.paginate"""
+        start, end = SprintQuery.sprint_dates(summary)
+        return [
+            {
+                'position': i,
+                'sprint_name': summary.index[i],
+                'risk_level': risk_levels[i],
+                'delay_probability': round(float(delay_probability[i]), 2),
+                'days_remaining': days_remaining[i],
+                'start_date': start.iloc[i],
+                'end_date': end.iloc[i]
+            }
+            for i in order
+        ]
+    
+    def _batch_sprint_timing(self, summary: pd.DataFrame, now: pd.Timestamp) -> Tuple[np.ndarray, list]:
+        """
+        Time progress (elapsed / duration, capped at 1) and days remaining
+        for every sprint, matching _analyze_progress_vs_time and
+        _get_days_remaining.
+        
+        Time progress is NaN where the sprint dates are missing and None
+        where the sprint has no duration (default risk).
+        """
+        start = summary['start_date']
+        end = summary['end_date']
+        total_duration = (end - start).dt.days.to_numpy(dtype=float)
+        time_elapsed = (now - start).dt.days.to_numpy(dtype=float)
+        remaining = (end - now).dt.days.to_numpy(dtype=float)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            time_progress = np.minimum(time_elapsed / total_duration, 1.0)
+        time_progress = time_progress.astype(object)
+        time_progress[total_duration <= 0] = None
+        
+        days_remaining = [
+            max(int(days), 0) if not np.isnan(days) else np.nan
+            for days in remaining
+        ]
+        return time_progress, days_remaining
+    
+    def _batch_progress_risk(
+        self,
+        time_progress: np.ndarray,
+        done_points: np.ndarray,
+        total_points: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized _analyze_progress_vs_time"""
+        unknown = np.array([value is None for value in time_progress], dtype=bool)
+        progress = np.where(unknown, np.nan, time_progress).astype(float)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            work_progress = np.where(total_points > 0, done_points / total_points, 0)
+        progress_gap = progress - work_progress
+        
+        # NaN gaps (missing dates) fall through every threshold, as in the scalar path
+        risk = np.select(
+            [progress_gap <= 0, progress_gap < 0.2, progress_gap < 0.4, progress_gap < 0.6],
+            [0.0, 0.2, 0.5, 0.75],
+            default=1.0
+        )
+        return np.where(unknown, 0.5, risk)
+    
+    def _batch_completion_risk(
+        self,
+        done_issues: np.ndarray,
+        todo_issues: np.ndarray,
+        total_issues: np.ndarray,
+        in_progress_issues: Optional[np.ndarray] = None,
+        expected: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Vectorized _analyze_completion_rate (expected: _expected_completions)"""
+        if expected is not None:
+            todo_issues = np.maximum(todo_issues - np.maximum(expected - in_progress_issues, 0), 0)
+            done_issues = done_issues + expected
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            completion_rate = np.where(total_issues > 0, done_issues / total_issues, 0)
+            todo_ratio = np.where(total_issues > 0, todo_issues / total_issues, 0)
+        
+        base_risk = np.select(
+            [completion_rate >= 0.8, completion_rate >= 0.6, completion_rate >= 0.4, completion_rate >= 0.2],
+            [0.0, 0.2, 0.5, 0.75],
+            default=1.0
+        )
+        base_risk = np.where(todo_ratio > 0.5, base_risk + 0.2, base_risk)
+        
+        return np.minimum(base_risk, 1.0)
+    
+    def _batch_blocker_risk(
+        self,
+        blocked_issues: np.ndarray,
+        blocked_points: np.ndarray,
+        total_issues: np.ndarray,
+        total_points: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized _analyze_blocker_trends"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            blocker_ratio = blocked_issues / total_issues
+            blocked_points_ratio = np.where(total_points > 0, blocked_points / total_points, 0)
+        
+        risk = np.select(
+            [
+                (blocker_ratio < 0.1) & (blocked_points_ratio < 0.1),
+                (blocker_ratio < 0.2) & (blocked_points_ratio < 0.2),
+                (blocker_ratio < 0.3) & (blocked_points_ratio < 0.3)
+            ],
+            [0.2, 0.5, 0.75],
+            default=1.0
+        )
+        return np.where(blocked_issues == 0, 0.0, risk)
+    
+    def _summary_metrics(self, sprint) -> Dict:
+        """_get_detailed_metrics built from a sprint summary row"""
+        total_points = sprint.total_points
+        
+        return {
+            'total_issues': int(sprint.total_issues),
+            'total_story_points': float(total_points),
+            'completed_issues': int(sprint.done_issues),
+            'completed_points': float(sprint.done_points),
+            'in_progress_issues': int(sprint.in_progress_issues),
+            'in_progress_points': float(sprint.in_progress_points),
+            'blocked_issues': int(sprint.blocked_issues),
+            'blocked_points': float(sprint.blocked_points),
+            'todo_issues': int(sprint.todo_issues),
+            'todo_points': float(sprint.todo_points),
+            'completion_percentage': float(
+                sprint.done_points / total_points * 100
+            ) if total_points > 0 else 0
+        }
 
 
 # Example usage
@@ -0,0 +1,74 @@
+"""
+Fast JSON Encoding
+Serializes analytics responses with orjson when it is installed, falling back to the standard library encoder
+"""
+
+import json
+import math
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # The standard library encoder is used without orjson
+    orjson = None
+
+# numpy scalars and arrays are written natively instead of failing
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+
+# Values FastAPI's encoder doesn't handle like the rest of the payload: missing
+# timestamps become null (as NaN does), numpy scalars and arrays their Python
+# values, as orjson writes them
+CUSTOM_ENCODERS = {
+    type(pd.NaT): lambda value: None,
+    np.generic: lambda value: value.item(),
+    np.ndarray: lambda value: value.tolist()
+}
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Compact UTF-8 JSON of content (dicts, lists, numpy scalars, Pydantic
+    models...). NaN and infinite floats, such as the days remaining of a
+    sprint without dates, and NaT are written as null by both encoders.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+    
+    encoded = jsonable_encoder(content, custom_encoder=CUSTOM_ENCODERS)
+    try:
+        text = json.dumps(encoded, ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+    except ValueError:
+        # Rare: only payloads with NaN pay for the extra pass
+        text = json.dumps(_finite(encoded), ensure_ascii=False, allow_nan=False, separators=(',', ':'))
+    return text.encode('utf-8')
+
+
+def _default(value: Any) -> Any:
+    """Types orjson doesn't know (Pydantic models, pandas timestamps...), via FastAPI's encoder"""
+    return jsonable_encoder(value, custom_encoder=CUSTOM_ENCODERS)
+
+
+def _finite(value: Any) -> Any:
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_finite(item) for item in value]
+    return value
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with dumps(). Endpoints returning it directly
+    skip FastAPI's response_model validation and jsonable_encoder pass, so
+    their content must already be plain data (dicts, lists, scalars).
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,120 @@
+"""
+AI Insight Generator
+Generates the LLM sprint insight in the background and caches it by the metrics it was generated from
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from sprint_aggregator import BACKLOG_SPRINT
+
+logger = logging.getLogger(__name__)
+
+# Number of sprints (from the top of the summary) described to the LLM
+INSIGHT_SPRINTS = 3
+
+
+class InsightGenerator:
+    """
+    Keeps LLM latency off the request path:
+    1. Whenever a dataset is installed, schedule() starts generating its
+       insight in a background task
+    2. Insights are cached under a hash of the sprint metrics sent to the
+       LLM, for ttl_seconds, so unchanged metrics never trigger a new call
+    3. Requests only read the cache through get()
+    
+    `complete` takes the prompt and returns the insight text; tests can pass
+    a local fake instead of a real LLM client.
+    """
+    
+    def __init__(
+        self,
+        complete: Callable[[str], Awaitable[Optional[str]]],
+        ttl_seconds: float = 3600,
+        retry_seconds: float = 60,
+        max_entries: int = 256
+    ):
+        self.complete = complete
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._failed: Dict[str, float] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+    
+    def metrics_lines(self, sprint_summary: pd.DataFrame) -> List[str]:
+        """One line of metrics per sprint at the top of the summary (skipping the backlog)"""
+        lines = []
+        for sprint in sprint_summary.head(INSIGHT_SPRINTS).itertuples():
+            if sprint.Index == BACKLOG_SPRINT:
+                continue
+            total_points = sprint.total_points
+            completed_points = sprint.done_points
+            completion_pct = (completed_points / total_points * 100) if total_points > 0 else 0
+            lines.append(f"{sprint.Index}: {completion_pct:.0f}% complete, {total_points:.0f} total points, {completed_points:.0f} completed")
+        return lines
+    
+    def cache_key(self, sprint_summary: pd.DataFrame) -> str:
+        return hashlib.sha256('\n'.join(self.metrics_lines(sprint_summary)).encode()).hexdigest()
+    
+    def get(self, sprint_summary: pd.DataFrame) -> Optional[str]:
+        """Cached insight for these metrics, or None if it isn't ready (or has expired)"""
+        key = self.cache_key(sprint_summary)
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        
+        insight, created = cached
+        if time.monotonic() - created > self.ttl_seconds:
+            del self._cache[key]
+            return None
+        return insight
+    
+    def schedule(self, sprint_summary: pd.DataFrame) -> Optional[asyncio.Task]:
+        """
+        Start generating the insight for these metrics unless it is cached,
+        already being generated, or recently failed. Must be called from the
+        event loop.
+        """
+        lines = self.metrics_lines(sprint_summary)
+        if not lines:
+            return None
+        
+        key = hashlib.sha256('\n'.join(lines).encode()).hexdigest()
+        if key in self._pending or self.get(sprint_summary) is not None:
+            return None
+        failed_at = self._failed.get(key)
+        if failed_at is not None and time.monotonic() - failed_at < self.retry_seconds:
+            return None
+        
+        task = asyncio.ensure_future(self._generate(key, lines))
+        self._pending[key] = task
+        task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return task
+    
+    async def _generate(self, key: str, lines: List[str]):
+        prompt = (
+            f"Analyze these sprint metrics and provide ONE concise recommendation for the team:\n\n"
+            f"{chr(10).join(lines)}\n\nProvide a single actionable insight in 1 sentence."
+        )
+        try:
+            insight = await self.complete(prompt)
+        except Exception as e:
+            logger.error(f"Error generating AI insight: {str(e)}")
+            self._failed[key] = time.monotonic()
+            return
+        
+        if not insight:
+            self._failed[key] = time.monotonic()
+            return
+        self._failed.pop(key, None)
+        self._cache[key] = (insight, time.monotonic())
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
@@ -0,0 +1,316 @@
+"""
+MongoDB Issue Store
+Persists installed datasets as issue documents and builds the sprint, team and dashboard rollups with aggregation pipelines
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pymongo import ASCENDING, UpdateOne
+
+from dataset_normalizer import USED_COLUMNS, to_utc_timestamps
+from dataset_store import DatasetVersion
+from sprint_aggregator import SprintAggregator, TRACKED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Dataset column -> issue document field
+FIELD_NAMES = {
+    'Jira ID': 'jira_id',
+    'Summary': 'summary',
+    'Status': 'status',
+    'Story Points': 'story_points',
+    'Assigned Sprint': 'sprint',
+    'Assigned Sprint\nStart date': 'sprint_start',
+    'Assigned Sprint\nEnd date': 'sprint_end',
+    'Assignee': 'assignee',
+    'Priority': 'priority',
+    'Issue Type': 'issue_type',
+    'Created': 'created',
+    'Resolved': 'resolved',
+    'Board': 'board'
+}
+
+# An issue has one row per sprint it was in; `dup` numbers exact repeats
+# of the same issue and sprint (e.g. a sprint shared by two boards)
+ISSUE_KEY = ['workspace', 'jira_id', 'sprint', 'dup']
+
+
+class MongoIssueStore:
+    """
+    Stores every workspace's issues in one Mongo collection so rollups can
+    be computed by the database instead of from a DataFrame in memory, and
+    shared by every API worker:
+    1. replace_dataset() bulk-upserts the rows keyed by workspace, Jira ID
+       and sprint, removes rows that are gone, then records the dataset
+       version in a metadata collection
+    2. load_rollups() runs the aggregation pipelines and returns a
+       DatasetVersion without a DataFrame, with the same summary tables
+       SprintAggregator builds; results are cached per dataset version,
+       and the stored version itself is re-read at most every
+       metadata_ttl_seconds, so conditional GETs don't wait on Mongo
+    3. load_frame() reads a workspace's rows back as a DataFrame, for the
+       endpoints that need individual issues
+    
+    Each document keeps its row position in the dataset so pipelines can
+    reproduce the DataFrame's first-appearance ordering. Converting between
+    rows and documents runs in run_in_thread (the compute pool), off the
+    event loop.
+    """
+    
+    def __init__(
+        self,
+        db,
+        collection: str = 'issues',
+        metadata_collection: str = 'issue_datasets',
+        aggregator: Optional[SprintAggregator] = None,
+        batch_size: int = 1000,
+        run_in_thread: Optional[Callable[..., Awaitable[Any]]] = None,
+        metadata_ttl_seconds: float = 5.0
+    ):
+        self.issues = db[collection]
+        self.datasets = db[metadata_collection]
+        self.aggregator = aggregator or SprintAggregator()
+        self.batch_size = batch_size
+        self.run_in_thread = run_in_thread or asyncio.to_thread
+        self.metadata_ttl_seconds = metadata_ttl_seconds
+        self._rollups: Dict[str, DatasetVersion] = {}
+        self._metadata: Dict[str, Tuple[Optional[Dict[str, Any]], float]] = {}
+    
+    async def ensure_indexes(self):
+        await self.issues.create_index([(field, ASCENDING) for field in ISSUE_KEY], unique=True)
+        await self.issues.create_index([('workspace', ASCENDING), ('sprint', ASCENDING), ('row', ASCENDING)])
+        await self.issues.create_index([('workspace', ASCENDING), ('status', ASCENDING)])
+        await self.issues.create_index([('workspace', ASCENDING), ('assignee', ASCENDING)])
+        await self.issues.create_index([('workspace', ASCENDING), ('sync_version', ASCENDING)])
+        await self.datasets.create_index('workspace', unique=True)
+    
+    async def replace_dataset(self, workspace: str, dataset: DatasetVersion):
+        """Make the stored issues of a workspace match an installed dataset"""
+        documents = await self.run_in_thread(self._to_documents, workspace, dataset)
+        for start in range(0, len(documents), self.batch_size):
+            batch = documents[start:start + self.batch_size]
+            await self.issues.bulk_write([
+                UpdateOne({field: document[field] for field in ISSUE_KEY}, {'$set': document}, upsert=True)
+                for document in batch
+            ], ordered=False)
+        
+        deleted = await self.issues.delete_many({'workspace': workspace, 'sync_version': {'$ne': dataset.version}})
+        metadata = {
+            'workspace': workspace,
+            'version': dataset.version,
+            'source': dataset.source,
+            'key': dataset.key,
+            'rows': len(documents),
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }
+        await self.datasets.update_one({'workspace': workspace}, {'$set': metadata}, upsert=True)
+        self._metadata[workspace] = (metadata, time.monotonic())
+        logger.info(
+            f"Stored {len(documents)} issues for workspace {workspace} "
+            f"({deleted.deleted_count} stale rows removed)"
+        )
+    
+    async def load_rollups(self, workspace: str, current: Optional[DatasetVersion] = None) -> Optional[DatasetVersion]:
+        """
+        Rollups of a workspace's stored dataset (no DataFrame), or None if it
+        has none. current (the dataset this process has in memory) is
+        returned as is when it is the stored version.
+        """
+        metadata = await self.metadata(workspace)
+        if metadata is None:
+            return None
+        if current is not None and current.version == metadata['version']:
+            return current
+        
+        cached = self._rollups.get(workspace)
+        if cached is not None and cached.version == metadata['version']:
+            return cached
+        
+        sprint_summary = await self.summarize_sprints(workspace)
+        totals = await self._totals(workspace)
+        rollups = DatasetVersion(
+            df=None,
+            source=metadata.get('source'),
+            key=metadata.get('key'),
+            memory_report={'rows': totals['issues'], 'memory_after_bytes': 0},
+            sprint_summary=sprint_summary,
+            assignee_summary=await self.summarize_assignees(workspace),
+            overall=self.aggregator.overall_from_totals(
+                sprint_summary, totals['issues'], totals['points'], totals['completed']
+            ),
+            version=metadata['version']
+        )
+        self._rollups[workspace] = rollups
+        return rollups
+    
+    async def metadata(self, workspace: str) -> Optional[Dict[str, Any]]:
+        """
+        Version, source and key of a workspace's stored dataset (None if it
+        has none); read from Mongo at most once per metadata_ttl_seconds,
+        so a version stored by another worker shows up within that time
+        """
+        cached = self._metadata.get(workspace)
+        if cached is not None and time.monotonic() - cached[1] < self.metadata_ttl_seconds:
+            return cached[0]
+        
+        metadata = await self.datasets.find_one({'workspace': workspace}, {'_id': 0})
+        self._metadata[workspace] = (metadata, time.monotonic())
+        return metadata
+    
+    async def load_frame(self, workspace: str) -> Optional[pd.DataFrame]:
+        """A workspace's stored rows as a dataset DataFrame, in their original order"""
+        projection = {'_id': 0, **{field: 1 for field in FIELD_NAMES.values()}}
+        cursor = self.issues.find({'workspace': workspace}, projection).sort('row', ASCENDING)
+        documents = await cursor.to_list(length=None)
+        if not documents:
+            return None
+        
+        return await self.run_in_thread(self._to_frame, documents)
+    
+    async def summarize_sprints(self, workspace: str) -> pd.DataFrame:
+        """Per-sprint summary table, identical to SprintAggregator.summarize_sprints"""
+        groups = await self._aggregate([
+            {'$match': {'workspace': workspace, 'sprint': {'$ne': None}}},
+            {'$sort': {'row': 1}},
+            {'$group': {
+                '_id': {'sprint': '$sprint', 'status': '$status'},
+                'count': {'$sum': 1},
+                'points': {'$sum': '$story_points'},
+                'first_row': {'$first': '$row'},
+                'start_date': {'$first': '$sprint_start'},
+                'end_date': {'$first': '$sprint_end'},
+                'board': {'$first': '$board'}
+            }}
+        ])
+        
+        sprints: Dict[Any, Dict[str, Any]] = {}
+        for group in sorted(groups, key=lambda group: group['first_row']):
+            name = group['_id']['sprint']
+            status = group['_id'].get('status')
+            sprint = sprints.get(name)
+            if sprint is None:
+                # Dates come from the sprint's first row, which is in its earliest group
+                sprint = sprints[name] = {
+                    'total_issues': 0,
+                    'total_points': 0.0,
+                    'start_date': self._missing_to_nan(group.get('start_date')),
+                    'end_date': self._missing_to_nan(group.get('end_date')),
+                    'board': self._missing_to_nan(group.get('board')),
+                    **{f'{prefix}_issues': 0 for prefix in TRACKED_STATUSES.values()},
+                    **{f'{prefix}_points': 0.0 for prefix in TRACKED_STATUSES.values()},
+                    'status_distribution': []
+                }
+            sprint['total_issues'] += group['count']
+            sprint['total_points'] += group['points']
+            if status in TRACKED_STATUSES:
+                prefix = TRACKED_STATUSES[status]
+                sprint[f'{prefix}_issues'] += group['count']
+                sprint[f'{prefix}_points'] += group['points']
+            if status is not None:
+                sprint['status_distribution'].append((status, group['count']))
+        
+        for sprint in sprints.values():
+            # value_counts order: counts descending, ties in order of first appearance
+            sprint['status_distribution'] = dict(sorted(sprint['status_distribution'], key=lambda item: -item[1]))
+        
+        columns = (
+            ['total_issues', 'total_points', 'start_date', 'end_date', 'board']
+            + [f'{prefix}_{kind}' for prefix in TRACKED_STATUSES.values() for kind in ('issues', 'points')]
+            + ['status_distribution']
+        )
+        summary = pd.DataFrame.from_dict(sprints, orient='index', columns=columns)
+        summary.index.name = 'sprint_name'
+        summary['total_points'] = summary['total_points'].astype(float)
+        # Mongo returns naive UTC datetimes (or the strings of rows stored before dates were parsed)
+        for column in ('start_date', 'end_date'):
+            summary[column] = to_utc_timestamps(summary[column])
+        for prefix in TRACKED_STATUSES.values():
+            summary[f'{prefix}_issues'] = summary[f'{prefix}_issues'].astype(int)
+            summary[f'{prefix}_points'] = summary[f'{prefix}_points'].astype(float)
+        return summary
+    
+    async def summarize_assignees(self, workspace: str) -> pd.DataFrame:
+        """Per-assignee points, identical to SprintAggregator.summarize_assignees"""
+        groups = await self._aggregate([
+            {'$match': {'workspace': workspace, 'assignee': {'$ne': None}}},
+            {'$sort': {'row': 1}},
+            {'$group': {
+                '_id': '$assignee',
+                'assigned_points': {'$sum': '$story_points'},
+                'completed_points': {'$sum': {'$cond': [{'$eq': ['$status', 'Done']}, '$story_points', 0]}},
+                'first_row': {'$first': '$row'}
+            }},
+            {'$sort': {'assigned_points': -1, 'first_row': 1}}
+        ])
+        
+        summary = pd.DataFrame(
+            {
+                'assigned_points': [float(group['assigned_points']) for group in groups],
+                'completed_points': [float(group['completed_points']) for group in groups]
+            },
+            index=pd.Index([group['_id'] for group in groups], name='name')
+        )
+        assigned = summary['assigned_points']
+        summary['completion_rate'] = (
+            summary['completed_points'] / assigned.where(assigned > 0) * 100
+        ).fillna(0.0)
+        return summary
+    
+    async def _totals(self, workspace: str) -> Dict[str, Any]:
+        totals = await self._aggregate([
+            {'$match': {'workspace': workspace}},
+            {'$group': {
+                '_id': None,
+                'issues': {'$sum': 1},
+                'points': {'$sum': '$story_points'},
+                'completed': {'$sum': {'$cond': [{'$eq': ['$status', 'Done']}, '$story_points', 0]}}
+            }}
+        ])
+        if not totals:
+            return {'issues': 0, 'points': 0.0, 'completed': 0.0}
+        return {key: totals[0][key] for key in ('issues', 'points', 'completed')}
+    
+    async def _aggregate(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self.issues.aggregate(pipeline, allowDiskUse=True).to_list(length=None)
+    
+    def _to_documents(self, workspace: str, dataset: DatasetVersion) -> List[Dict[str, Any]]:
+        df = dataset.df
+        columns = {
+            FIELD_NAMES[column]: [self._to_bson(value) for value in df[column].tolist()]
+            for column in USED_COLUMNS
+            if column in df.columns
+        }
+        dup = df.groupby(['Jira ID', 'Assigned Sprint'], sort=False, observed=True, dropna=False).cumcount().tolist()
+        
+        documents = []
+        for row in range(len(df)):
+            document = {field: values[row] for field, values in columns.items()}
+            document.update(workspace=workspace, row=row, dup=dup[row], sync_version=dataset.version)
+            documents.append(document)
+        return documents
+    
+    @staticmethod
+    def _to_frame(documents: List[Dict[str, Any]]) -> pd.DataFrame:
+        df = pd.DataFrame(documents, columns=list(FIELD_NAMES.values()))
+        return df.rename(columns={field: column for column, field in FIELD_NAMES.items()})
+    
+    @staticmethod
+    def _to_bson(value: Any) -> Any:
+        """Plain Python value for a DataFrame cell (missing values become None)"""
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return None
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, pd.Timestamp):
+            return value.to_pydatetime()
+        return value
+    
+    @staticmethod
+    def _missing_to_nan(value: Any) -> Any:
+        return np.nan if value is None else value
@@ -1,32 +1,135 @@
+import asyncio
 import base64
+import importlib.util
 import logging
-from typing import Any, Dict, Optional, List
+import re
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, List
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
+from prometheus_client import Counter, Histogram
+from jira_rate_limiter import RateLimiter, DEFAULT_REQUESTS_PER_SECOND, RETRYABLE_STATUS_CODES
+from metrics import DEFAULT_BUCKETS, REGISTRY
 
 logger = logging.getLogger(__name__)
 
+# Jira Cloud custom field holding an issue's sprints
+SPRINT_FIELD = "customfield_10020"
+
+# Custom fields that may hold story points, in order of preference
+STORY_POINT_FIELDS = ["customfield_10016", "customfield_10106", "customfield_10002", "customfield_10004"]
+
+# Fields requested for every issue, whichever endpoint it comes from
+ISSUE_FIELDS = ",".join(
+    ["key", "summary", "status", "issuetype", "assignee", "priority", "created", "resolutiondate"]
+    + STORY_POINT_FIELDS
+    + [SPRINT_FIELD]
+)
+
+JIRA_REQUESTS = Counter(
+    'sprint_analytics_jira_requests',
+    'Jira API calls by endpoint template and status (error for network failures)',
+    ['method', 'endpoint', 'status'],
+    registry=REGISTRY
+)
+JIRA_REQUEST_SECONDS = Histogram(
+    'sprint_analytics_jira_request_seconds',
+    'Jira API call latency by endpoint template, excluding rate-limit waits',
+    ['method', 'endpoint'],
+    buckets=DEFAULT_BUCKETS,
+    registry=REGISTRY
+)
+JIRA_RETRIES = Counter(
+    'sprint_analytics_jira_retries',
+    'Jira API calls retried, by endpoint template',
+    ['method', 'endpoint'],
+    registry=REGISTRY
+)
+
+def endpoint_template(endpoint: str) -> str:
+    """Endpoint with ids replaced, so every board or sprint shares one series"""
+    return re.sub(r'/(board|sprint|issue)/[^/]+', r'/\1/{id}', endpoint)
+
 class JiraAPIClient:
-    """Async HTTP client for Jira Cloud REST API."""
+    """
+    Async HTTP client for Jira Cloud REST API.
+    
+    At most max_concurrency requests are in flight at once, so callers can
+    fan out freely with asyncio.gather. transport is passed through to
+    httpx (e.g. httpx.MockTransport to run against a local mock server).
+    
+    The client can be used as an async context manager for a single sync,
+    or opened once and kept (see JiraClientPool) so its keep-alive
+    connections are reused across syncs. max_connections and
+    max_keepalive_connections default to max_concurrency; HTTP/2 is only
+    used when requested and the h2 package is installed.
     
-    def __init__(self, instance_url: str, email: str, api_token: str):
+    Requests are paced by a RateLimiter that starts at requests_per_second
+    and adapts to Jira's throttling.
+    """
+    
+    def __init__(
+        self,
+        instance_url: str,
+        email: str,
+        api_token: str,
+        max_concurrency: int = 8,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: float = 60.0,
+        http2: bool = False,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        max_retries: int = 4
+    ):
         self.instance_url = instance_url.rstrip('/')
         self.email = email
         self.api_token = api_token
+        self.max_concurrency = max_concurrency
+        self.transport = transport
+        self.limits = httpx.Limits(
+            max_connections=max_connections or max_concurrency,
+            max_keepalive_connections=max_keepalive_connections or max_concurrency,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and self._http2_available()
+        self.rate_limiter = RateLimiter(max_rate=requests_per_second, burst=max(requests_per_second, max_concurrency))
+        self.max_retries = max_retries
         self.client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Activity, so JiraClientPool never closes a client in the middle of a sync
+        self.in_flight = 0
+        self.last_used = time.monotonic()
     
     async def __aenter__(self):
-        self.client = httpx.AsyncClient(
-            timeout=30.0,
-            headers=self._get_headers(),
-            base_url=self.instance_url
-        )
+        await self.open()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def open(self):
+        """Create the underlying connection pool (no-op if already open)."""
+        if self.client is None or self.client.is_closed:
+            self.client = httpx.AsyncClient(
+                timeout=30.0,
+                headers=self._get_headers(),
+                base_url=self.instance_url,
+                transport=self.transport,
+                limits=self.limits,
+                http2=self.http2
+            )
+    
+    async def close(self):
         if self.client:
             await self.client.aclose()
     
+    @staticmethod
+    def _http2_available() -> bool:
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested for Jira but the h2 package is not installed; using HTTP/1.1")
+            return False
+        return True
+    
     def _get_headers(self) -> Dict[str, str]:
         """Generate authentication headers."""
         credentials = f"{self.email}:{self.api_token}"
@@ -37,27 +140,69 @@ class JiraAPIClient:
             "Accept": "application/json"
         }
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
     async def _make_request(
         self,
         method: str,
         endpoint: str,
         **kwargs
     ) -> Dict[str, Any]:
-        """Make HTTP request with automatic retry."""
+        """
+        Make HTTP request, paced by the rate limiter.
+        
+        429s, 5xx responses and network errors are retried up to max_retries
+        times (429s after the Retry-After pause, the rest with jittered
+        backoff); any other error fails immediately.
+        """
         if not self.client:
             raise RuntimeError("Client not initialized")
         
+        self.in_flight += 1
         try:
-            response = await self.client.request(method, endpoint, **kwargs)
-            response.raise_for_status()
-            return response.json() if response.content else {}
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
-            raise
+            return await self._request_with_retries(method, endpoint, **kwargs)
+        finally:
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+    
+    async def _request_with_retries(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        template = endpoint_template(endpoint)
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                async with self._semaphore:
+                    started = time.perf_counter()
+                    try:
+                        response = await self.client.request(method, endpoint, **kwargs)
+                    finally:
+                        JIRA_REQUEST_SECONDS.labels(method=method, endpoint=template).observe(time.perf_counter() - started)
+            except httpx.TransportError as e:
+                JIRA_REQUESTS.labels(method=method, endpoint=template, status='error').inc()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.rate_limiter.backoff(attempt)
+                logger.warning(f"Jira request {method} {endpoint} failed ({str(e)}), retrying in {delay:.1f}s")
+            else:
+                self.rate_limiter.observe(response.status_code, response.headers)
+                JIRA_REQUESTS.labels(method=method, endpoint=template, status=str(response.status_code)).inc()
+                retryable = response.status_code in RETRYABLE_STATUS_CODES
+                
+                if not retryable or attempt >= self.max_retries:
+                    try:
+                        response.raise_for_status()
+                    except httpx.HTTPStatusError as e:
+                        logger.error(f"HTTP error {e.response.status_code}: {e.response.text}")
+                        raise
+                    return response.json() if response.content else {}
+                
+                # A 429 already paused the shared rate limiter until Retry-After
+                delay = 0.0 if response.status_code == 429 else self.rate_limiter.backoff(attempt)
+                logger.warning(f"Jira request {method} {endpoint} returned {response.status_code}, retrying")
+            
+            attempt += 1
+            self.rate_limiter.record_retry(delay)
+            JIRA_RETRIES.labels(method=method, endpoint=template).inc()
+            if delay:
+                await asyncio.sleep(delay)
     
     async def test_connection(self) -> bool:
         """Test if connection credentials are valid."""
@@ -72,9 +217,9 @@ class JiraAPIClient:
         params = {"startAt": start_at, "maxResults": min(max_results, 50)}
         return await self._make_request("GET", "/rest/agile/1.0/board", params=params)
     
-    async def get_sprints(self, board_id: int, start_at: int = 0) -> Dict[str, Any]:
+    async def get_sprints(self, board_id: int, start_at: int = 0, max_results: int = 50) -> Dict[str, Any]:
         """Fetch sprints for a board."""
-        params = {"startAt": start_at, "maxResults": 50}
+        params = {"startAt": start_at, "maxResults": min(max_results, 50)}
         return await self._make_request(
             "GET",
             f"/rest/agile/1.0/board/{board_id}/sprint",
@@ -86,7 +231,7 @@ class JiraAPIClient:
         params = {
             "startAt": start_at,
             "maxResults": 100,
-            "fields": "key,summary,status,issuetype,assignee,priority,created,resolutiondate"
+            "fields": ISSUE_FIELDS
         }
         return await self._make_request(
             "GET",
@@ -100,6 +245,67 @@ class JiraAPIClient:
             "jql": jql,
             "startAt": start_at,
             "maxResults": max_results,
-            "fields": "key,summary,status,issuetype,assignee,priority,created,resolutiondate,customfield_10016,customfield_10106"
+            "fields": ISSUE_FIELDS
         }
-        return await self._make_request("GET", "/rest/api/3/search", params=params)
\ No newline at end of file
+        return await self._make_request("GET", "/rest/api/3/search", params=params)
+    
+    async def iter_boards(self) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every board, page by page."""
+        async for board in self._iter_pages(self.get_boards, "values"):
+            yield board
+    
+    async def iter_sprints(self, board_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every sprint of a board, page by page."""
+        async for sprint in self._iter_pages(
+            lambda start_at: self.get_sprints(board_id, start_at), "values"
+        ):
+            yield sprint
+    
+    async def iter_sprint_issues(self, sprint_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every issue of a sprint, page by page."""
+        async for issue in self._iter_pages(
+            lambda start_at: self.get_sprint_issues(sprint_id, start_at), "issues"
+        ):
+            yield issue
+    
+    async def _iter_pages(
+        self,
+        fetch_page: Callable[[int], Awaitable[Dict[str, Any]]],
+        items_key: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the items of every page of a paginated endpoint.
+        
+        The request for the next page is started before the current page's
+        items are handed to the caller, so fetching overlaps processing.
+        """
+        start_at = 0
+        next_page: Optional[asyncio.Future] = asyncio.ensure_future(fetch_page(start_at))
+        
+        try:
+            while next_page is not None:
+                response = await next_page
+                next_page = None
+                
+                items = response.get(items_key, [])
+                start_at += len(items)
+                if items and not self._is_last_page(response, start_at, len(items)):
+                    next_page = asyncio.ensure_future(fetch_page(start_at))
+                
+                for item in items:
+                    yield item
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+    
+    @staticmethod
+    def _is_last_page(response: Dict[str, Any], fetched: int, page_length: int) -> bool:
+        """
+        Board and sprint pages carry isLast; issue pages only carry total,
+        so fall back to it (or to a short page) when isLast is absent.
+        """
+        if "isLast" in response:
+            return bool(response["isLast"])
+        if response.get("total") is not None:
+            return fetched >= response["total"]
+        return page_length < response.get("maxResults", page_length + 1)
@@ -0,0 +1,125 @@
+"""
+Jira Client Pool
+Keeps one long-lived, connection-pooled JiraAPIClient per set of Jira credentials
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from jira_client import JiraAPIClient
+
+logger = logging.getLogger(__name__)
+
+
+class JiraClientPool:
+    """
+    Shares JiraAPIClients across requests so syncs reuse warm keep-alive
+    connections instead of paying a new TLS handshake each time:
+    1. get() returns the open client for a Jira URL and credentials,
+       creating it on first use; clients with no request in flight and
+       none sent or handed out for idle_timeout_seconds are closed
+    2. Successful credential checks are remembered for
+       validation_ttl_seconds, so connecting right after a test (or
+       reconnecting) doesn't authenticate again
+    
+    client_options are passed to every JiraAPIClient (concurrency,
+    connection limits, keep-alive, HTTP/2).
+    """
+    
+    def __init__(
+        self,
+        idle_timeout_seconds: float = 3600,
+        validation_ttl_seconds: float = 300,
+        **client_options
+    ):
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.validation_ttl_seconds = validation_ttl_seconds
+        self.client_options = client_options
+        self._clients: Dict[str, Tuple[JiraAPIClient, float]] = {}
+        self._validated: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+    
+    async def get(self, jira_url: str, email: str, api_token: str) -> JiraAPIClient:
+        """Open client for these credentials"""
+        key = self._key(jira_url, email, api_token)
+        async with self._lock:
+            await self._close_idle(keep=key)
+            
+            entry = self._clients.get(key)
+            client = entry[0] if entry else JiraAPIClient(
+                instance_url=jira_url,
+                email=email,
+                api_token=api_token,
+                **self.client_options
+            )
+            await client.open()
+            self._clients[key] = (client, time.monotonic())
+            return client
+    
+    async def validate(self, jira_url: str, email: str, api_token: str) -> bool:
+        """
+        Whether the credentials are valid, reusing a recent successful check.
+        The client is dropped when they are not.
+        """
+        key = self._key(jira_url, email, api_token)
+        validated_at = self._validated.get(key)
+        if validated_at is not None and time.monotonic() - validated_at < self.validation_ttl_seconds:
+            return True
+        
+        client = await self.get(jira_url, email, api_token)
+        if await client.test_connection():
+            self._validated[key] = time.monotonic()
+            return True
+        
+        await self.discard(jira_url, email, api_token)
+        return False
+    
+    async def discard(self, jira_url: str, email: str, api_token: str):
+        """Close and forget the client for these credentials"""
+        key = self._key(jira_url, email, api_token)
+        self._validated.pop(key, None)
+        async with self._lock:
+            entry = self._clients.pop(key, None)
+        if entry:
+            await entry[0].close()
+    
+    async def close_all(self):
+        async with self._lock:
+            clients = [client for client, _ in self._clients.values()]
+            self._clients.clear()
+            self._validated.clear()
+        for client in clients:
+            await client.close()
+    
+    def peek(self, jira_url: str, email: str, api_token: str) -> Optional[JiraAPIClient]:
+        """Open client for these credentials, without creating one"""
+        entry = self._clients.get(self._key(jira_url, email, api_token))
+        return entry[0] if entry else None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'open_clients': len(self._clients),
+            'validated_credentials': len(self._validated)
+        }
+    
+    async def _close_idle(self, keep: Optional[str] = None):
+        now = time.monotonic()
+        idle = [
+            key for key, (client, handed_out) in self._clients.items()
+            if key != keep
+            and client.in_flight == 0
+            and now - max(handed_out, client.last_used) > self.idle_timeout_seconds
+        ]
+        for key in idle:
+            client, _ = self._clients.pop(key)
+            self._validated.pop(key, None)
+            await client.close()
+            logger.info(f"Closed idle Jira client for {client.instance_url}")
+    
+    @staticmethod
+    def _key(jira_url: str, email: str, api_token: str) -> str:
+        credentials = f"{jira_url.rstrip('/')}|{email}|{api_token}"
+        return hashlib.sha256(credentials.encode()).hexdigest()
@@ -0,0 +1,191 @@
+"""
+Jira Rate Limiter
+Client-side token bucket that adapts its rate to Jira Cloud's 429 responses and rate limit headers
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying; any other 4xx will fail the same way again
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Starting (and maximum) requests per second, for the limiter and every Jira client
+DEFAULT_REQUESTS_PER_SECOND = 50.0
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every request of a Jira client:
+    1. Requests take a token; tokens refill at `rate` per second up to `burst`
+    2. A 429 (or an X-RateLimit-NearLimit warning) halves the rate, at most
+       once per cooldown so a burst of throttled in-flight requests doesn't
+       collapse it; a Retry-After (or an exhausted X-RateLimit-Remaining)
+       pauses all requests until Jira accepts them again
+    3. Each successful response raises the rate additively back towards
+       max_rate, which is also capped by Jira's advertised fill rate
+    
+    This keeps throughput near the allowed rate without every request
+    backing off (and retrying) on its own.
+    """
+    
+    def __init__(
+        self,
+        max_rate: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: Optional[float] = None,
+        min_rate: float = 0.5,
+        decrease_factor: float = 0.5,
+        increase_step: Optional[float] = None,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0
+    ):
+        self.configured_rate = max_rate
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.burst = burst or max(1.0, max_rate)
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.increase_step = increase_step or max_rate / 20
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._last_decrease = 0.0
+        self._lock = asyncio.Lock()
+        self._stats = {
+            'requests': 0,
+            'throttled_responses': 0,
+            'retries': 0,
+            'throttled_seconds': 0.0,
+            'backoff_seconds': 0.0
+        }
+    
+    async def acquire(self):
+        """Wait for a token (and for any Retry-After pause to end)"""
+        waited = 0.0
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    delay = (1 - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+        
+        self._stats['requests'] += 1
+        self._stats['throttled_seconds'] += waited
+    
+    def observe(self, status_code: int, headers: Mapping[str, str]):
+        """Adapt the rate to a response's status and rate limit headers"""
+        now = time.monotonic()
+        self._apply_fill_rate(headers)
+        
+        if status_code == 429:
+            self._stats['throttled_responses'] += 1
+            pause = self.retry_after(headers)
+            if pause is None:
+                pause = self.backoff(0)
+            self._decrease(now, cooldown=pause)
+            self._block(now + pause)
+            return
+        
+        remaining = self._number(headers.get('x-ratelimit-remaining'))
+        if remaining is not None and remaining <= 0:
+            reset_at = self._reset_time(headers.get('x-ratelimit-reset'), now)
+            if reset_at is not None:
+                self._block(reset_at)
+        if headers.get('x-ratelimit-nearlimit', '').lower() == 'true':
+            self._decrease(now, cooldown=1 / self.rate)
+        elif status_code < 400:
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+    
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, so retries don't arrive in lockstep"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    def record_retry(self, delay: float):
+        self._stats['retries'] += 1
+        self._stats['backoff_seconds'] += delay
+    
+    def retry_after(self, headers: Mapping[str, str]) -> Optional[float]:
+        """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+        value = headers.get('retry-after')
+        if not value:
+            return None
+        
+        seconds = self._number(value)
+        if seconds is None:
+            try:
+                retry_at = parsedate_to_datetime(value)
+                seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return max(0.0, seconds)
+    
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            'rate': self.rate,
+            'max_rate': self.max_rate,
+            'paused_seconds_remaining': max(0.0, self._blocked_until - time.monotonic())
+        }
+    
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + max(0.0, now - self._updated) * self.rate)
+        self._updated = max(self._updated, now)
+    
+    def _decrease(self, now: float, cooldown: float):
+        if now - self._last_decrease < cooldown:
+            return
+        self._last_decrease = now
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        logger.info(f"Jira rate limit reached; slowing down to {self.rate:.2f} requests/s")
+    
+    def _block(self, until: float):
+        # Tokens only start refilling once the pause is over
+        if until > self._blocked_until:
+            self._blocked_until = until
+            self._tokens = 0
+            self._updated = until
+    
+    def _apply_fill_rate(self, headers: Mapping[str, str]):
+        """Cap max_rate at the fill rate Jira advertises for its own bucket"""
+        fill_rate = self._number(headers.get('x-ratelimit-fillrate'))
+        interval = self._number(headers.get('x-ratelimit-interval-seconds'))
+        if fill_rate and interval:
+            self.max_rate = max(self.min_rate, min(self.configured_rate, fill_rate / interval))
+            self.rate = min(self.rate, self.max_rate)
+    
+    @staticmethod
+    def _reset_time(value: Optional[str], now: float) -> Optional[float]:
+        """Monotonic time of an X-RateLimit-Reset timestamp (ISO 8601)"""
+        if not value:
+            return None
+        try:
+            reset_at = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if reset_at.tzinfo is None:
+            reset_at = reset_at.replace(tzinfo=timezone.utc)
+        return now + max(0.0, (reset_at - datetime.now(timezone.utc)).total_seconds())
+    
+    @staticmethod
+    def _number(value: Optional[str]) -> Optional[float]:
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
@@ -1,19 +1,51 @@
+import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+import math
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any, Tuple
 import pandas as pd
-from jira_client import JiraAPIClient
+from jira_client import JiraAPIClient, SPRINT_FIELD, STORY_POINT_FIELDS
+from compute_pool import ComputePool
+from metrics import stage_timer
 
 logger = logging.getLogger(__name__)
 
+# How sprint issues are fetched: one paged request stream per sprint, bulk
+# JQL searches over chunks of sprints, or chosen by sprint count
+FETCH_STRATEGIES = ("sprint", "jql", "auto")
+
 class JiraService:
-    """Service layer for Jira data fetching and transformation."""
+    """
+    Service layer for Jira data fetching and transformation.
+    
+    With the "jql" fetch strategy, issues are searched in bulk with
+    `sprint in (...)` over jql_sprint_chunk sprints at a time instead of
+    being paged sprint by sprint, and joined to the sprint metadata listed
+    from the boards locally. "auto" uses JQL once an instance has at least
+    jql_sprint_threshold sprints, where per-sprint paging means thousands of
+    small round trips.
+    """
     
-    def __init__(self, client: JiraAPIClient):
+    def __init__(
+        self,
+        client: JiraAPIClient,
+        compute_pool: Optional[ComputePool] = None,
+        fetch_strategy: str = "sprint",
+        jql_sprint_threshold: int = 200,
+        jql_sprint_chunk: int = 50
+    ):
+        if fetch_strategy not in FETCH_STRATEGIES:
+            raise ValueError(f"Unknown fetch strategy '{fetch_strategy}', expected one of {FETCH_STRATEGIES}")
+        
         self.client = client
+        self.compute_pool = compute_pool
+        self.fetch_strategy = fetch_strategy
+        self.jql_sprint_threshold = jql_sprint_threshold
+        self.jql_sprint_chunk = jql_sprint_chunk
     
     def _extract_story_points(self, fields: dict) -> Optional[float]:
         """Extract story points from issue fields (handles different custom field IDs)."""
-        for field_id in ["customfield_10016", "customfield_10106", "customfield_10002", "customfield_10004"]:
+        for field_id in STORY_POINT_FIELDS:
             if field_id in fields and fields[field_id] is not None:
                 try:
                     return float(fields[field_id])
@@ -22,77 +54,272 @@ class JiraService:
         return None
     
     async def fetch_all_data(self) -> pd.DataFrame:
-        """Fetch all sprint data and convert to DataFrame matching CSV format."""
-        all_data = []
+        """
+        Fetch all sprint data and convert to DataFrame matching CSV format.
+        
+        With the "sprint" strategy every page of boards, sprints and sprint
+        issues is streamed from the client's iterators; each board and sprint
+        is processed as soon as it arrives, concurrently (bounded by the
+        client's max_concurrency). The other strategies list every sprint
+        first, then fetch issues per sprint or through JQL depending on the
+        sprint count. Rows keep board, sprint and rank order either way, so
+        the DataFrame is deterministic and the same for every strategy.
+        """
+        with stage_timer(f"jira.fetch[{self.fetch_strategy}]"):
+            if self.fetch_strategy == "sprint":
+                all_data = await self._fetch_streaming()
+            else:
+                all_data = await self._fetch_listed()
+        
+        if not all_data:
+            return pd.DataFrame()
+        
+        with stage_timer("jira.build_frame"):
+            df = await self._to_frame(all_data)
+        logger.info(f"Fetched {len(df)} issues from Jira")
+        return df
+    
+    async def _fetch_streaming(self) -> List[Dict[str, Any]]:
+        """Rows of every board, fetching each sprint's issues as soon as it is listed."""
+        board_tasks = []
+        try:
+            async for board in self.client.iter_boards():
+                board_tasks.append(asyncio.ensure_future(self._fetch_board(board)))
+        except BaseException:
+            await self._cancel(board_tasks)
+            raise
         
-        # Get all boards
-        boards_response = await self.client.get_boards()
-        boards = boards_response.get("values", [])
+        logger.info(f"Found {len(board_tasks)} boards")
         
+        board_rows = await asyncio.gather(*board_tasks)
+        return [row for rows in board_rows for row in rows]
+    
+    async def _fetch_listed(self) -> List[Dict[str, Any]]:
+        """Rows of every board, listing all sprints before fetching any issues."""
+        boards = [board async for board in self.client.iter_boards()]
         logger.info(f"Found {len(boards)} boards")
         
-        for board in boards:
-            board_id = board["id"]
-            board_name = board["name"]
-            
-            try:
-                # Get sprints for this board
-                sprints_response = await self.client.get_sprints(board_id)
-                sprints = sprints_response.get("values", [])
-                
-                for sprint in sprints:
-                    sprint_id = sprint["id"]
-                    sprint_name = sprint["name"]
-                    sprint_state = sprint.get("state", "unknown")
-                    sprint_start = sprint.get("startDate")
-                    sprint_end = sprint.get("endDate")
-                    
-                    # Get issues for this sprint
-                    start_at = 0
-                    while True:
-                        issues_response = await self.client.get_sprint_issues(sprint_id, start_at)
-                        issues = issues_response.get("issues", [])
-                        
-                        if not issues:
-                            break
-                        
-                        for issue in issues:
-                            fields = issue.get("fields", {})
-                            status_obj = fields.get("status", {})
-                            assignee_obj = fields.get("assignee", {})
-                            issuetype_obj = fields.get("issuetype", {})
-                            
-                            story_points = self._extract_story_points(fields)
-                            
-                            # Build row matching CSV format
-                            row = {
-                                "Jira ID": issue["key"],
-                                "Summary": fields.get("summary", ""),
-                                "Status": status_obj.get("name", "Unknown"),
-                                "Story Points": story_points if story_points else 0,
-                                "Assigned Sprint": sprint_name,
-                                "Assigned Sprint\nStart date": sprint_start,
-                                "Assigned Sprint\nEnd date": sprint_end,
-                                "Assignee": assignee_obj.get("displayName") if assignee_obj else None,
-                                "Priority": fields.get("priority", {}).get("name", "Medium"),
-                                "Issue Type": issuetype_obj.get("name", "Task"),
-                                "Created": fields.get("created"),
-                                "Resolved": fields.get("resolutiondate")
-                            }
-                            all_data.append(row)
-                        
-                        # Check pagination
-                        if issues_response.get("isLast", True):
-                            break
-                        start_at += len(issues)
+        board_sprints = await asyncio.gather(*(self._list_sprints(board) for board in boards))
+        sprint_count = sum(len(sprints) for sprints in board_sprints)
+        
+        if self.fetch_strategy == "jql" or sprint_count >= self.jql_sprint_threshold:
+            logger.info(f"Fetching issues of {sprint_count} sprints through JQL")
+            return await self._fetch_by_jql(boards, board_sprints)
+        
+        board_rows = await asyncio.gather(*(
+            self._fetch_sprints(board, sprints)
+            for board, sprints in zip(boards, board_sprints)
+        ))
+        return [row for rows in board_rows for row in rows]
+    
+    async def _list_sprints(self, board: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Every sprint of a board; a failing board lists none."""
+        try:
+            return [sprint async for sprint in self.client.iter_sprints(board["id"])]
+        except Exception as e:
+            logger.error(f"Error fetching data for board {board['name']}: {str(e)}")
+            return []
+    
+    async def _fetch_sprints(self, board: Dict[str, Any], sprints: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Rows of already listed sprints, one paged request stream per sprint."""
+        sprint_rows = await asyncio.gather(
+            *(self._fetch_sprint(sprint) for sprint in sprints),
+            return_exceptions=True
+        )
+        return self._collect_rows(board, sprints, sprint_rows)
+    
+    async def _fetch_by_jql(
+        self,
+        boards: List[Dict[str, Any]],
+        board_sprints: List[List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Rows of every listed sprint from bulk `sprint in (...)` searches.
+        
+        Each issue comes back once per chunk with all of its sprints, and
+        gets a row for every sprint of the chunk it belongs to, in rank
+        order, just like the per-sprint issue endpoint.
+        """
+        sprint_ids = list(dict.fromkeys(sprint["id"] for sprints in board_sprints for sprint in sprints))
+        chunks = [
+            sprint_ids[i:i + self.jql_sprint_chunk]
+            for i in range(0, len(sprint_ids), self.jql_sprint_chunk)
+        ]
+        
+        chunk_issues = await asyncio.gather(*(
+            self._search_all(f"sprint in ({', '.join(str(sprint_id) for sprint_id in chunk)}) ORDER BY Rank ASC")
+            for chunk in chunks
+        ), return_exceptions=True)
+        
+        issues_by_sprint: Dict[Any, List[Dict[str, Any]]] = {}
+        for chunk, issues in zip(chunks, chunk_issues):
+            if isinstance(issues, Exception):
+                logger.error(f"Error searching issues of sprints {chunk[0]}..{chunk[-1]}: {str(issues)}")
+                continue
             
-            except Exception as e:
-                logger.error(f"Error fetching data for board {board_name}: {str(e)}")
+            chunk_ids = set(chunk)
+            for sprint_id in chunk:
+                issues_by_sprint[sprint_id] = []
+            for issue in issues:
+                for sprint in self._extract_sprints(issue.get("fields", {})):
+                    if sprint.get("id") in chunk_ids:
+                        issues_by_sprint[sprint["id"]].append(issue)
+        
+        rows = []
+        for board, sprints in zip(boards, board_sprints):
+            for sprint in sprints:
+                if sprint["id"] not in issues_by_sprint:
+                    continue
+                rows.extend(self._issue_to_row(issue, sprint) for issue in issues_by_sprint[sprint["id"]])
+        return rows
+    
+    async def fetch_updated_since(self, since: datetime) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Fetch issues updated since `since` through JQL search.
+        
+        Returns the rows for those issues (one per sprint the issue is in,
+        matching fetch_all_data) and the keys of every updated issue, so
+        issues that left all sprints can be dropped by merge_updates.
+        The window is a relative JQL duration, which Jira evaluates
+        independently of the user's profile time zone.
+        
+        Like fetch_all_data, only the boards the connection can list are
+        synced: the search is limited to their projects, and rows are only
+        kept for sprints of those boards.
+        """
+        boards = [board async for board in self.client.iter_boards()]
+        if not boards:
+            return pd.DataFrame(), []
+        board_ids = {str(board["id"]) for board in boards}
+        
+        elapsed = (datetime.now(timezone.utc) - since).total_seconds()
+        minutes = max(1, math.ceil(elapsed / 60))
+        jql = f"updated >= -{minutes}m ORDER BY key"
+        project_keys = [(board.get("location") or {}).get("projectKey") for board in boards]
+        # Boards built on a cross-project filter have no project; leave the
+        # search unrestricted then and rely on the board check below
+        if all(project_keys):
+            projects = ", ".join(f'"{key}"' for key in dict.fromkeys(project_keys))
+            jql = f"project in ({projects}) AND {jql}"
+        issues = await self._search_all(jql)
+        
+        rows = [
+            self._issue_to_row(issue, sprint)
+            for issue in issues
+            for sprint in self._extract_sprints(issue.get("fields", {}))
+            if self._sprint_board(sprint) in board_ids
+        ]
+        updated_keys = [issue["key"] for issue in issues]
+        
+        logger.info(f"Fetched {len(updated_keys)} updated issues from Jira")
+        return await self._to_frame(rows), updated_keys
+    
+    def merge_updates(self, df: pd.DataFrame, updates: pd.DataFrame, updated_keys: List[str]) -> pd.DataFrame:
+        """Replace every row of the updated issues in df with their fresh rows."""
+        kept = df[~df["Jira ID"].isin(updated_keys)]
+        if updates.empty:
+            return kept.reset_index(drop=True)
+        return pd.concat([kept, updates], ignore_index=True)
+    
+    async def _to_frame(self, rows: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build a DataFrame from rows, in the compute pool when one is set."""
+        if self.compute_pool is None:
+            return pd.DataFrame(rows)
+        return await self.compute_pool.run_in_thread(pd.DataFrame, rows)
+    
+    async def _search_all(self, jql: str) -> List[Dict[str, Any]]:
+        """Run a JQL search and collect every result page (pages after the first concurrently)."""
+        first_page = await self.client.search_issues(jql)
+        issues = list(first_page.get("issues", []))
+        total = first_page.get("total", len(issues))
+        
+        if issues and total > len(issues):
+            page_size = first_page.get("maxResults") or len(issues)
+            responses = await asyncio.gather(*(
+                self.client.search_issues(jql, start_at)
+                for start_at in range(len(issues), total, page_size)
+            ))
+            for response in responses:
+                issues.extend(response.get("issues", []))
+        
+        return issues
+    
+    def _sprint_board(self, sprint: Dict[str, Any]) -> Optional[str]:
+        """Board id of a sprint (from the Agile API or the sprint custom field)."""
+        board_id = sprint.get("originBoardId", sprint.get("boardId"))
+        return str(board_id) if board_id is not None else None
+    
+    def _extract_sprints(self, fields: dict) -> List[Dict[str, Any]]:
+        """Extract sprint objects from the sprint custom field (ignores legacy string values)."""
+        sprints = fields.get(SPRINT_FIELD) or []
+        return [sprint for sprint in sprints if isinstance(sprint, dict) and sprint.get("name")]
+    
+    async def _fetch_board(self, board: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch rows for every sprint of a board; a failing board yields no rows."""
+        board_id = board["id"]
+        board_name = board["name"]
+        
+        sprints = []
+        sprint_tasks = []
+        try:
+            # Start fetching each sprint's issues as soon as the sprint is listed
+            async for sprint in self.client.iter_sprints(board_id):
+                sprints.append(sprint)
+                sprint_tasks.append(asyncio.ensure_future(self._fetch_sprint(sprint)))
+        except Exception as e:
+            logger.error(f"Error fetching data for board {board_name}: {str(e)}")
+            await self._cancel(sprint_tasks)
+            return []
+        
+        sprint_rows = await asyncio.gather(*sprint_tasks, return_exceptions=True)
+        return self._collect_rows(board, sprints, sprint_rows)
+    
+    def _collect_rows(self, board: Dict[str, Any], sprints: List[Dict[str, Any]], sprint_rows: List[Any]) -> List[Dict[str, Any]]:
+        """Concatenate per-sprint rows in sprint order, logging sprints that failed."""
+        rows = []
+        for sprint, result in zip(sprints, sprint_rows):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching sprint {sprint.get('name')} on board {board['name']}: {str(result)}")
                 continue
+            rows.extend(result)
+        return rows
+    
+    async def _fetch_sprint(self, sprint: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fetch every issue page of a sprint as rows."""
+        return [
+            self._issue_to_row(issue, sprint)
+            async for issue in self.client.iter_sprint_issues(sprint["id"])
+        ]
+    
+    @staticmethod
+    async def _cancel(tasks: List[asyncio.Future]):
+        """Cancel pending fetch tasks and wait for them to finish."""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _issue_to_row(self, issue: Dict[str, Any], sprint: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a row matching the CSV format."""
+        fields = issue.get("fields", {})
+        status_obj = fields.get("status", {})
+        assignee_obj = fields.get("assignee", {})
+        issuetype_obj = fields.get("issuetype", {})
         
-        if not all_data:
-            return pd.DataFrame()
+        story_points = self._extract_story_points(fields)
         
-        df = pd.DataFrame(all_data)
-        logger.info(f"Fetched {len(df)} issues from Jira")
-        return df
\ No newline at end of file
+        return {
+            "Jira ID": issue["key"],
+            "Summary": fields.get("summary", ""),
+            "Status": status_obj.get("name", "Unknown"),
+            "Story Points": story_points if story_points else 0,
+            "Assigned Sprint": sprint["name"],
+            "Assigned Sprint\nStart date": sprint.get("startDate"),
+            "Assigned Sprint\nEnd date": sprint.get("endDate"),
+            "Assignee": assignee_obj.get("displayName") if assignee_obj else None,
+            "Priority": fields.get("priority", {}).get("name", "Medium"),
+            "Issue Type": issuetype_obj.get("name", "Task"),
+            "Created": fields.get("created"),
+            "Resolved": fields.get("resolutiondate"),
+            # Board the sprint belongs to (the team, for velocity)
+            "Board": self._sprint_board(sprint)
+        }
@@ -0,0 +1,182 @@
+"""
+Metrics
+Prometheus metrics (via prometheus_client) with stage timers and request profiling
+"""
+
+import cProfile
+import io
+import logging
+import pstats
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets (seconds) from sub-millisecond stages to slow Jira syncs
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Shared by every module, like the app's other process-wide state; a registry
+# of its own keeps prometheus_client's process and GC collectors out of /metrics
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+# Run before each render, to refresh gauges that are cheaper to read on demand
+# (dataset sizes, pool queues) than to keep up to date
+_collectors: List[Callable[[], None]] = []
+
+
+def on_collect(collector: Callable[[], None]):
+    _collectors.append(collector)
+
+
+def render_metrics() -> bytes:
+    """Every metric in the Prometheus text exposition format"""
+    for collector in _collectors:
+        try:
+            collector()
+        except Exception as e:
+            logger.error(f"Error collecting metrics: {str(e)}")
+    return generate_latest(REGISTRY)
+
+
+STAGE_SECONDS = Histogram(
+    'sprint_analytics_stage_seconds',
+    'Duration of instrumented stages (upload, Jira fetch, delay prediction)',
+    ['stage'],
+    buckets=DEFAULT_BUCKETS,
+    registry=REGISTRY
+)
+
+
+def stage_timer(stage: str):
+    """
+    Time a block as one stage of a larger operation. Stages that run in
+    process-pool workers are recorded in the worker and not exported.
+    """
+    return STAGE_SECONDS.labels(stage=stage).time()
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'sprint_analytics_http_request_seconds',
+    'HTTP request latency by method, route template and status',
+    ['method', 'route', 'status'],
+    buckets=DEFAULT_BUCKETS,
+    registry=REGISTRY
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every request under its route template, so
+    /api/delay-predictions/{sprint_name} is one series whatever the sprint.
+    With a profiler, requests sent with ?profile=1 or an X-Profile: 1
+    header are profiled and the stats file is named in X-Profile-File.
+    """
+    
+    def __init__(self, app, profiler: Optional['RequestProfiler'] = None):
+        self.app = app
+        self.profiler = profiler
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        
+        profiler = self.profiler.start() if self.profiler and self._wants_profile(scope) else None
+        profile_path = self.profiler.output_path(scope['path']) if profiler is not None else None
+        status = 500
+        
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if profile_path:
+                    # Headers leave before the body, so name the file up front
+                    message = {
+                        **message,
+                        'headers': [*message.get('headers', []), (b'x-profile-file', profile_path.encode())]
+                    }
+            await send(message)
+        
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(
+                method=scope['method'],
+                route=getattr(scope.get('route'), 'path', 'unmatched'),
+                status=str(status)
+            ).observe(time.perf_counter() - started)
+            if profiler is not None:
+                self.profiler.finish(profiler, f"{scope['method']} {scope['path']}", profile_path)
+    
+    @staticmethod
+    def _wants_profile(scope) -> bool:
+        query = scope.get('query_string', b'').decode('latin-1')
+        if re.search(r'(^|&)profile=(1|true)(&|$)', query):
+            return True
+        return any(name == b'x-profile' and value in (b'1', b'true') for name, value in scope.get('headers', []))
+
+
+class RequestProfiler:
+    """
+    Opt-in cProfile of single requests: start() and finish() bracket a
+    request when enabled, log the top functions and write the stats to
+    output_dir (for pstats or snakeviz).
+    Only one request is profiled at a time (others run unprofiled), and
+    work offloaded to the compute pool's threads isn't captured.
+    
+    cProfile follows the event-loop thread rather than the request, so
+    the stats also include whatever other requests ran on the loop while
+    the profiled one was in flight. Profile on an otherwise idle server
+    when that matters.
+    """
+    
+    def __init__(self, enabled: bool = False, output_dir: Optional[Path] = None, top: int = 25):
+        self.enabled = enabled
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.top = top
+        self._active = threading.Lock()
+    
+    def start(self) -> Optional[cProfile.Profile]:
+        """A running profiler, or None when profiling is off or busy"""
+        if not self.enabled or not self._active.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) is already active
+            self._active.release()
+            return None
+        return profiler
+    
+    def output_path(self, request_path: str) -> Optional[str]:
+        """File a request's stats will be written to (None without output_dir)"""
+        if self.output_dir is None:
+            return None
+        name = re.sub(r'[^A-Za-z0-9_-]+', '_', request_path).strip('_') or 'root'
+        return str(self.output_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10 ** 6:06d}-{name}.prof")
+    
+    def finish(self, profiler: cProfile.Profile, label: str, output_path: Optional[str] = None):
+        """Stop profiling, log the top functions and write the stats to output_path"""
+        try:
+            profiler.disable()
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream).sort_stats('cumulative')
+            stats.print_stats(self.top)
+            logger.info(f"Profile of {label}:\n{stream.getvalue()}")
+            
+            if output_path:
+                Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                stats.dump_stats(output_path)
+        except Exception as e:
+            logger.error(f"Error writing request profile: {str(e)}")
+        finally:
+            self._active.release()
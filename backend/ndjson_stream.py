@@ -0,0 +1,70 @@
+"""
+NDJSON Streaming
+Streams analytics listings as newline-delimited JSON, encoding items in batches off the event loop as they are computed
+"""
+
+import logging
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from fast_json import dumps
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Whether a request opted into streaming (?stream=ndjson or Accept: application/x-ndjson)"""
+    if request.query_params.get('stream') == 'ndjson':
+        return True
+    accept = request.headers.get('accept', '')
+    return any(part.split(';')[0].strip() == NDJSON_MEDIA_TYPE for part in accept.split(','))
+
+
+class NDJSONStreamer:
+    """
+    Turns a lazy iterator of listing items into a streaming NDJSON response.
+    
+    Items are pulled and encoded batch_size at a time in a worker thread
+    (run_in_thread), so the generator's per-item work never blocks the
+    event loop, and only one encoded batch is held in memory at once: the
+    first sprints reach the client while later ones are still computed.
+    Lines are encoded like the JSON responses (fast_json.dumps).
+    If an item fails, an {"error": ...} line ends the stream, since the
+    200 status has already been sent.
+    """
+    
+    def __init__(self, run_in_thread: Callable[..., Awaitable[Any]], batch_size: int = 100):
+        self.run_in_thread = run_in_thread
+        self.batch_size = batch_size
+    
+    def response(self, items: Iterator, headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+        return StreamingResponse(self._stream(items), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+    
+    async def _stream(self, items: Iterator):
+        while True:
+            chunk, failed = await self.run_in_thread(self._encode_batch, items)
+            if chunk:
+                yield chunk
+            if failed or not chunk:
+                return
+    
+    def _encode_batch(self, items: Iterator) -> Tuple[bytes, bool]:
+        """The next batch_size lines, and whether the stream ended with an error line"""
+        lines = []
+        try:
+            for item in islice(items, self.batch_size):
+                lines.append(self._encode(item))
+        except Exception as e:
+            logger.error(f"Error streaming NDJSON response: {str(e)}")
+            lines.append(self._encode({'error': str(e)}))
+            return b''.join(lines), True
+        return b''.join(lines), False
+    
+    @staticmethod
+    def _encode(item: Any) -> bytes:
+        return dumps(item) + b'\n'
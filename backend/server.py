@@ -1,5 +1,6 @@
-from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -7,15 +8,33 @@ import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple, Union
+import asyncio
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone, timedelta
+import numpy as np
 import pandas as pd
-import io
 from emergentintegrations.llm.chat import LlmChat, UserMessage
-from jira_client import JiraAPIClient
+from jira_client_pool import JiraClientPool
+from jira_rate_limiter import DEFAULT_REQUESTS_PER_SECOND
 from jira_service import JiraService
 from delay_predictor import DelayPredictor
+from velocity_engine import VelocityEngine
+from sprint_aggregator import SprintAggregator, BACKLOG_SPRINT
+from insight_generator import InsightGenerator
+from conditional_get import ETagPolicy
+from dataset_store import DatasetRegistry
+from issue_store import MongoIssueStore
+from compute_pool import ComputePool
+from upload_ingestion import UploadIngestor, UploadLimitMiddleware, UploadTooLargeError
+from snapshot_store import SnapshotStore
+from sprint_history import SprintHistoryStore
+from fast_json import FastJSONResponse
+from compression import CompressionMiddleware
+from ndjson_stream import NDJSONStreamer, NDJSON_MEDIA_TYPE, wants_ndjson
+from sprint_query import SprintPage, SprintQuery, InvalidSprintQueryError, MAX_LIMIT
+from prometheus_client import Gauge
+from metrics import REGISTRY, CONTENT_TYPE, MetricsMiddleware, RequestProfiler, on_collect, render_metrics, stage_timer
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -25,8 +44,85 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
+# Upper bound on concurrent Jira API requests during a sync
+JIRA_MAX_CONCURRENCY = int(os.environ.get('JIRA_MAX_CONCURRENCY', '8'))
+
+# Long-lived Jira HTTP clients: connection pool size, keep-alive and HTTP/2
+JIRA_MAX_CONNECTIONS = int(os.environ.get('JIRA_MAX_CONNECTIONS', str(JIRA_MAX_CONCURRENCY)))
+JIRA_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get('JIRA_KEEPALIVE_EXPIRY_SECONDS', '60'))
+JIRA_HTTP2 = os.environ.get('JIRA_HTTP2', 'false').lower() == 'true'
+JIRA_CLIENT_IDLE_MINUTES = float(os.environ.get('JIRA_CLIENT_IDLE_MINUTES', '60'))
+
+# Starting (and maximum) request rate per Jira client, adapted down on throttling,
+# and how often throttled/failed requests are retried
+JIRA_REQUESTS_PER_SECOND = float(os.environ.get('JIRA_REQUESTS_PER_SECOND', DEFAULT_REQUESTS_PER_SECOND))
+JIRA_MAX_RETRIES = int(os.environ.get('JIRA_MAX_RETRIES', '4'))
+
+# How sprint issues are fetched: "sprint" (paged per sprint), "jql" (bulk
+# searches over chunks of sprints) or "auto" (JQL from this many sprints up)
+JIRA_FETCH_STRATEGY = os.environ.get('JIRA_FETCH_STRATEGY', 'auto')
+JIRA_JQL_SPRINT_THRESHOLD = int(os.environ.get('JIRA_JQL_SPRINT_THRESHOLD', '200'))
+JIRA_JQL_SPRINT_CHUNK = int(os.environ.get('JIRA_JQL_SPRINT_CHUNK', '50'))
+
+# Incremental Jira sync: re-read this much before the last high-water mark,
+# and force a full refetch (to catch deletions) once the last one is this old
+JIRA_SYNC_OVERLAP_MINUTES = int(os.environ.get('JIRA_SYNC_OVERLAP_MINUTES', '5'))
+JIRA_FULL_RECONCILE_HOURS = float(os.environ.get('JIRA_FULL_RECONCILE_HOURS', '24'))
+
+# Upload ingestion limits
+UPLOAD_MAX_MB = int(os.environ.get('UPLOAD_MAX_MB', '500'))
+UPLOAD_CSV_CHUNK_ROWS = int(os.environ.get('UPLOAD_CSV_CHUNK_ROWS', '50000'))
+
+# On-disk snapshots of installed datasets, reloaded on startup
+SNAPSHOT_DIR = Path(os.environ.get('SNAPSHOT_DIR', ROOT_DIR / 'snapshots'))
+SNAPSHOT_RETENTION = int(os.environ.get('SNAPSHOT_RETENTION', '5'))
+
+# "mongo" also persists every installed dataset's issues to Mongo and serves
+# the sprint, team and dashboard rollups from aggregation pipelines
+ISSUE_STORE = os.environ.get('ISSUE_STORE', 'memory')
+# How long a worker trusts the stored dataset version before asking Mongo again
+ISSUE_STORE_METADATA_TTL_SECONDS = float(os.environ.get('ISSUE_STORE_METADATA_TTL_SECONDS', '5'))
+
+# Daily per-sprint metrics are recorded on every install and, for loaded
+# workspaces, on this schedule (0 disables the scheduled job)
+SPRINT_HISTORY_INTERVAL_HOURS = float(os.environ.get('SPRINT_HISTORY_INTERVAL_HOURS', '24'))
+SPRINT_HISTORY_DEFAULT_DAYS = int(os.environ.get('SPRINT_HISTORY_DEFAULT_DAYS', '90'))
+
+# Datasets are kept per workspace; the least recently used ones are evicted
+# from memory (and reloaded from their snapshot on demand) above this budget
+DATASET_MEMORY_BUDGET_MB = int(os.environ.get('DATASET_MEMORY_BUDGET_MB', '2048'))
+DEFAULT_WORKSPACE = "default"
+WORKSPACE_PATTERN = r'^[A-Za-z0-9_-]{1,64}$'
+
+# Team and assignee throughput is averaged over this many recent weeks
+VELOCITY_WINDOW_WEEKS = int(os.environ.get('VELOCITY_WINDOW_WEEKS', '6'))
+
+# How long a generated AI insight is reused for unchanged sprint metrics
+AI_INSIGHT_TTL_MINUTES = float(os.environ.get('AI_INSIGHT_TTL_MINUTES', '60'))
+
+# Items encoded per batch when streaming a listing as NDJSON
+NDJSON_BATCH_SIZE = int(os.environ.get('NDJSON_BATCH_SIZE', '100'))
+
+# ETags of outputs that depend on the current date change at most this often
+ETAG_TIME_BUCKET_SECONDS = int(os.environ.get('ETAG_TIME_BUCKET_SECONDS', '300'))
+
+# Executor for blocking pandas work: 'thread' or 'process' workers, and how
+# many jobs may run at once (the rest queue)
+COMPUTE_POOL_KIND = os.environ.get('COMPUTE_POOL_KIND', 'thread')
+COMPUTE_POOL_WORKERS = int(os.environ.get('COMPUTE_POOL_WORKERS', str(os.cpu_count() or 4)))
+COMPUTE_MAX_CONCURRENCY = int(os.environ.get('COMPUTE_MAX_CONCURRENCY', str(COMPUTE_POOL_WORKERS)))
+
+# Opt-in cProfile of requests sent with ?profile=1 (or X-Profile: 1); stats files go to PROFILE_DIR
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+PROFILE_DIR = Path(os.environ.get('PROFILE_DIR', ROOT_DIR / 'profiles'))
+
+# Responses of at least this size are compressed (brotli if installed, else gzip)
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', '4'))
+
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -80,6 +176,9 @@ class JiraConnection(BaseModel):
     api_token: str
     is_active: bool = True
     created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    workspace: str = DEFAULT_WORKSPACE
+    last_synced_at: Optional[str] = None
+    last_full_sync_at: Optional[str] = None
 
 class JiraConnectionRequest(BaseModel):
     jira_url: str
@@ -90,230 +189,417 @@ class JiraConnectionTest(BaseModel):
     success: bool
     message: str
 
-# Global storage for current dataset
-current_dataset = None
-current_jira_connection = None
+# Jira connection of each workspace
+jira_connections: Dict[str, Dict[str, Any]] = {}
 
-# Initialize delay predictor
+# One pooled Jira client per set of credentials, shared by every sync
+jira_clients = JiraClientPool(
+    idle_timeout_seconds=JIRA_CLIENT_IDLE_MINUTES * 60,
+    max_concurrency=JIRA_MAX_CONCURRENCY,
+    max_connections=JIRA_MAX_CONNECTIONS,
+    max_keepalive_connections=JIRA_MAX_CONNECTIONS,
+    keepalive_expiry=JIRA_KEEPALIVE_EXPIRY_SECONDS,
+    http2=JIRA_HTTP2,
+    requests_per_second=JIRA_REQUESTS_PER_SECOND,
+    max_retries=JIRA_MAX_RETRIES
+)
+
+# Initialize delay predictor and sprint aggregation engine
 delay_predictor = DelayPredictor()
+sprint_aggregator = SprintAggregator()
 
-@api_router.get("/")
-async def root():
-    return {"message": "Jira Analytics API"}
+# Rolling throughput per team and assignee, cached per dataset version
+velocity_engine = VelocityEngine(VELOCITY_WINDOW_WEEKS)
 
-@api_router.post("/jira/test-connection", response_model=JiraConnectionTest)
-async def test_jira_connection(connection: JiraConnectionRequest):
-    """Test Jira connection credentials."""
-    try:
-        async with JiraAPIClient(
-            instance_url=connection.jira_url,
-            email=connection.email,
-            api_token=connection.api_token
-        ) as client:
-            is_valid = await client.test_connection()
-            
-            if is_valid:
-                return JiraConnectionTest(
-                    success=True,
-                    message="Connection successful! Credentials are valid."
-                )
-            else:
-                return JiraConnectionTest(
-                    success=False,
-                    message="Connection failed. Please check your credentials."
-                )
-    except Exception as e:
-        logging.error(f"Connection test error: {str(e)}")
-        return JiraConnectionTest(
-            success=False,
-            message=f"Connection error: {str(e)}"
-        )
+# Blocking pandas work runs here instead of on the event loop
+compute_pool = ComputePool(COMPUTE_POOL_KIND, COMPUTE_POOL_WORKERS, COMPUTE_MAX_CONCURRENCY)
 
-@api_router.post("/jira/connect")
-async def connect_jira(connection: JiraConnectionRequest):
-    """Save Jira connection and fetch data."""
-    global current_dataset, current_jira_connection
-    
-    try:
-        # Test connection first
-        async with JiraAPIClient(
-            instance_url=connection.jira_url,
-            email=connection.email,
-            api_token=connection.api_token
-        ) as client:
-            is_valid = await client.test_connection()
-            
-            if not is_valid:
-                raise HTTPException(status_code=401, detail="Invalid Jira credentials")
-            
-            # Save connection
-            current_jira_connection = {
-                "jira_url": connection.jira_url,
-                "email": connection.email,
-                "api_token": connection.api_token
-            }
-            
-            # Store in database
-            conn_doc = JiraConnection(**current_jira_connection).model_dump()
-            await db.jira_connections.insert_one(conn_doc)
-            
-            # Fetch data from Jira
-            jira_service = JiraService(client)
-            df = await jira_service.fetch_all_data()
-            
-            if df.empty:
-                raise HTTPException(status_code=404, detail="No data found in Jira instance")
-            
-            current_dataset = df
-            
-            return {
-                "success": True,
-                "message": "Connected to Jira successfully",
-                "total_issues": len(df),
-                "total_sprints": df['Assigned Sprint'].nunique() if 'Assigned Sprint' in df.columns else 0
-            }
-    
-    except HTTPException:
-        raise
-    except Exception as e:
-        logging.error(f"Error connecting to Jira: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error connecting to Jira: {str(e)}")
+# Each workspace's dataset and its precomputed rollups
+datasets = DatasetRegistry(DATASET_MEMORY_BUDGET_MB * 1024 * 1024, sprint_aggregator)
 
-@api_router.post("/jira/refresh")
-async def refresh_jira_data():
-    """Refresh data from connected Jira instance."""
-    global current_dataset, current_jira_connection
+# Streaming ingestion for uploaded exports
+upload_ingestor = UploadIngestor(
+    max_bytes=UPLOAD_MAX_MB * 1024 * 1024,
+    csv_chunk_rows=UPLOAD_CSV_CHUNK_ROWS
+)
+
+# Columnar snapshots of installed datasets
+snapshot_store = SnapshotStore(SNAPSHOT_DIR, SNAPSHOT_RETENTION)
+
+# Issues shared by every API worker through Mongo (optional)
+issue_store = (
+    MongoIssueStore(
+        db, aggregator=sprint_aggregator, run_in_thread=compute_pool.run_in_thread,
+        metadata_ttl_seconds=ISSUE_STORE_METADATA_TTL_SECONDS
+    )
+    if ISSUE_STORE == "mongo" else None
+)
+
+# Dataset and compute pool gauges, refreshed on every /metrics scrape
+DATASET_ROWS = Gauge('sprint_analytics_dataset_rows', 'Rows of each installed dataset', ['workspace'], registry=REGISTRY)
+DATASET_MEMORY = Gauge('sprint_analytics_dataset_memory_bytes', 'Memory of each installed dataset', ['workspace'], registry=REGISTRY)
+DATASETS_MEMORY_TOTAL = Gauge('sprint_analytics_datasets_memory_bytes', 'Memory of all installed datasets', registry=REGISTRY)
+DATASETS_MEMORY_BUDGET = Gauge('sprint_analytics_datasets_memory_budget_bytes', 'Dataset memory budget', registry=REGISTRY)
+COMPUTE_POOL_TASKS = Gauge('sprint_analytics_compute_pool_tasks', 'Compute pool tasks by state', ['state'], registry=REGISTRY)
+
+def collect_metrics():
+    stats = datasets.stats()
+    # Evicted workspaces disappear rather than keep their last value
+    DATASET_ROWS.clear()
+    DATASET_MEMORY.clear()
+    for name, workspace_stats in stats['workspaces'].items():
+        DATASET_ROWS.labels(workspace=name).set(workspace_stats['rows'])
+        DATASET_MEMORY.labels(workspace=name).set(workspace_stats['memory_bytes'])
+    DATASETS_MEMORY_TOTAL.set(stats['memory_bytes'])
+    DATASETS_MEMORY_BUDGET.set(stats['memory_budget_bytes'])
     
-    if not current_jira_connection:
-        raise HTTPException(status_code=404, detail="No Jira connection found. Please connect first.")
+    pool_stats = compute_pool.stats()
+    for state in ('queued', 'running'):
+        COMPUTE_POOL_TASKS.labels(state=state).set(pool_stats[state])
+
+on_collect(collect_metrics)
+
+# Burndown/burnup history of every sprint
+sprint_history = SprintHistoryStore(db)
+sprint_history_task: Optional[asyncio.Task] = None
+
+async def ask_insight_llm(prompt: str) -> Optional[str]:
+    """Ask the LLM for a sprint insight."""
+    chat = LlmChat(
+        api_key=os.environ.get('EMERGENT_LLM_KEY'),
+        session_id=str(uuid.uuid4()),
+        system_message="You are a Jira sprint analytics expert. Provide brief, actionable recommendations in 1-2 sentences."
+    ).with_model("gemini", "gemini-3-flash-preview")
     
+    return await chat.send_message(UserMessage(text=prompt))
+
+# AI insights, generated in the background and cached by sprint metrics
+insight_generator = InsightGenerator(ask_insight_llm, ttl_seconds=AI_INSIGHT_TTL_MINUTES * 60)
+
+def schedule_insight(dataset):
+    """Start generating the AI insight for a newly installed dataset."""
+    if os.environ.get('EMERGENT_LLM_KEY'):
+        insight_generator.schedule(dataset.sprint_summary)
+
+# ETags for conditional GETs on the analytics endpoints
+etag_policy = ETagPolicy(ETAG_TIME_BUCKET_SECONDS)
+
+# NDJSON streaming of the sprint listings, encoded in the compute pool's threads
+ndjson_streamer = NDJSONStreamer(compute_pool.run_in_thread, NDJSON_BATCH_SIZE)
+
+def create_jira_service(client) -> JiraService:
+    """JiraService for a pooled client, using the configured fetch strategy."""
+    return JiraService(
+        client,
+        compute_pool,
+        fetch_strategy=JIRA_FETCH_STRATEGY,
+        jql_sprint_threshold=JIRA_JQL_SPRINT_THRESHOLD,
+        jql_sprint_chunk=JIRA_JQL_SPRINT_CHUNK
+    )
+
+# Serializes snapshot reloads so concurrent requests don't load the same workspace twice
+restore_lock = asyncio.Lock()
+
+def get_workspace(workspace: str = Query(DEFAULT_WORKSPACE, pattern=WORKSPACE_PATTERN)) -> str:
+    """Workspace a request addresses (query parameter, defaults to the shared workspace)."""
+    return workspace
+
+def get_request_time() -> pd.Timestamp:
+    """
+    The request's clock (UTC). Every date-relative figure of a request
+    (days remaining, sprint state, velocity window, ETag time bucket) is
+    computed from this one instant; override the dependency to pin it.
+    """
+    return pd.Timestamp.now(tz='UTC')
+
+def get_sprint_query(
+    risk_level: Optional[List[str]] = Query(None, description="Risk levels to keep (repeat or comma-separate)"),
+    board: Optional[List[str]] = Query(None, description="Board IDs to keep (repeat or comma-separate)"),
+    state: Optional[List[str]] = Query(None, description="active, future and/or closed, from the sprint dates"),
+    from_date: Optional[date] = Query(None, description="Keep sprints ending on or after this day"),
+    to_date: Optional[date] = Query(None, description="Keep sprints starting on or before this day"),
+    sort: Optional[str] = Query(None, description="Field to sort by, '-' prefixed for descending"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page")
+) -> Optional[SprintQuery]:
+    """Filters, sort and page of a sprint listing; None when the request asks for none of them."""
+    if not any([risk_level, board, state, from_date, to_date, sort, limit, cursor]):
+        return None
     try:
-        async with JiraAPIClient(
-            instance_url=current_jira_connection["jira_url"],
-            email=current_jira_connection["email"],
-            api_token=current_jira_connection["api_token"]
-        ) as client:
-            jira_service = JiraService(client)
-            df = await jira_service.fetch_all_data()
-            
-            if df.empty:
-                raise HTTPException(status_code=404, detail="No data found in Jira")
-            
-            current_dataset = df
-            
-            return {
-                "success": True,
-                "message": "Data refreshed successfully",
-                "total_issues": len(df),
-                "total_sprints": df['Assigned Sprint'].nunique()
-            }
-    
-    except Exception as e:
-        logging.error(f"Error refreshing Jira data: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error refreshing data: {str(e)}")
+        return SprintQuery(risk_level, board, state, from_date, to_date, sort, limit, cursor)
+    except InvalidSprintQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@api_router.get("/jira/status")
-async def get_jira_connection_status():
-    """Get current Jira connection status."""
-    global current_jira_connection
+def set_page_headers(response: Response, page):
+    """Expose a SprintPage's match count and next cursor as response headers."""
+    if isinstance(page, SprintPage):
+        response.headers['X-Total-Count'] = str(page.total)
+        if page.next_cursor:
+            response.headers['X-Next-Cursor'] = page.next_cursor
+
+def negotiate_stream(request: Request, response: Response) -> bool:
+    """Whether to stream a listing as NDJSON; either way the response varies by Accept."""
+    response.headers['Vary'] = 'Accept'
+    return wants_ndjson(request)
+
+def response_headers(response: Response) -> Dict[str, str]:
+    """Headers (ETag, paging) set on an endpoint's Response parameter, for a response it returns itself."""
+    return {name: value for name, value in response.headers.items() if name != 'content-length'}
+
+def stream_ndjson(response: Response, items) -> StreamingResponse:
+    """NDJSON response of items, keeping the headers already set on response."""
+    return ndjson_streamer.response(items, response_headers(response))
+
+async def load_dataset(workspace: str):
+    """
+    Current dataset of a workspace. A workspace evicted from memory (or not
+    yet loaded since startup) is reinstalled from its latest snapshot.
+    """
+    dataset = datasets.get(workspace)
+    if dataset is not None:
+        return dataset
     
-    if current_jira_connection:
-        return {
-            "connected": True,
-            "jira_url": current_jira_connection["jira_url"],
-            "email": current_jira_connection["email"]
-        }
-    else:
-        return {"connected": False}
+    async with restore_lock:
+        dataset = datasets.get(workspace)
+        if dataset is None:
+            dataset = await restore_snapshot(workspace)
+    return dataset
 
-@api_router.post("/upload-csv")
-async def upload_csv(file: UploadFile = File(...)):
-    global current_dataset
+async def load_rollups(workspace: str):
+    """
+    Dataset of a workspace for endpoints that only read its rollups. With the
+    Mongo issue store, rollups of a newer version stored by another worker
+    (or of a dataset not in memory) come from aggregation pipelines.
+    """
+    dataset = datasets.get(workspace)
+    if issue_store is not None:
+        try:
+            rollups = await issue_store.load_rollups(workspace, current=dataset)
+            if rollups is not None:
+                return rollups
+        except Exception as e:
+            logging.error(f"Error loading rollups from Mongo: {str(e)}")
     
+    if dataset is not None:
+        return dataset
+    return await load_dataset(workspace)
+
+async def restore_snapshot(workspace: Optional[str] = None):
+    """Install the latest snapshot of a workspace (of any workspace when None)."""
     try:
-        contents = await file.read()
-        
-        # Read Excel file
-        if file.filename.endswith('.xlsx') or file.filename.endswith('.xls'):
-            df = pd.read_excel(io.BytesIO(contents))
-        elif file.filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(contents))
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Please upload CSV or Excel file.")
-        
-        current_dataset = df
+        snapshot = await run_in_threadpool(snapshot_store.load_latest, workspace)
+        if snapshot is None and issue_store is not None and workspace is not None:
+            snapshot = await restore_from_issue_store(workspace)
+        if snapshot is None:
+            return None
         
-        # Store upload info in database
-        upload_doc = {
-            "filename": file.filename,
-            "upload_time": datetime.now(timezone.utc).isoformat(),
-            "total_rows": len(df),
-            "columns": list(df.columns)
-        }
-        await db.uploads.insert_one(upload_doc)
+        df, metadata = snapshot
+        workspace = metadata.get("workspace", workspace or DEFAULT_WORKSPACE)
+        source = metadata.get("source", "upload")
+        dataset = await compute_pool.run_in_thread(datasets.install, workspace, df, source, metadata.get("key"))
+        logger.info(f"Restored {source} dataset snapshot {metadata.get('key')} for workspace {workspace} ({len(df)} issues)")
+        schedule_insight(dataset)
         
-        return {
-            "success": True,
-            "filename": file.filename,
-            "total_issues": len(df),
-            "total_sprints": df['Assigned Sprint'].nunique() if 'Assigned Sprint' in df.columns else 0
+        if source == "jira":
+            await attach_jira_connection(workspace, metadata)
+        return dataset
+    except Exception as e:
+        logging.error(f"Error restoring dataset snapshot: {str(e)}")
+        return None
+
+async def restore_from_issue_store(workspace: str):
+    """Rows and metadata of a workspace's dataset in the issue store, shaped like a snapshot."""
+    metadata = await issue_store.metadata(workspace)
+    if metadata is None:
+        return None
+    df = await issue_store.load_frame(workspace)
+    if df is None:
+        return None
+    return df, {**metadata, "created_at": metadata.get("updated_at", "")}
+
+async def attach_jira_connection(workspace: str, metadata: Dict[str, Any]):
+    """Reattach the Jira connection a restored snapshot came from so refresh keeps working."""
+    connection = jira_connections.get(workspace)
+    if connection is None or connection["id"] != metadata.get("key"):
+        conn_doc = await db.jira_connections.find_one({"id": metadata.get("key")}, {"_id": 0})
+        if not conn_doc:
+            return
+        connection = {
+            key: conn_doc.get(key)
+            for key in ("id", "jira_url", "email", "api_token", "last_synced_at", "last_full_sync_at")
         }
+        jira_connections[workspace] = connection
+    
+    # The snapshot predates the last recorded sync: force a full refetch
+    if (connection["last_synced_at"] or "") > metadata.get("created_at", ""):
+        connection["last_full_sync_at"] = None
+
+async def record_jira_sync(connection: Dict[str, Any], started_at: datetime, full: bool):
+    """Advance a connection's sync high-water marks after a successful sync."""
+    sync_marks = {"last_synced_at": started_at.isoformat()}
+    if full:
+        sync_marks["last_full_sync_at"] = started_at.isoformat()
+    
+    connection.update(sync_marks)
+    await db.jira_connections.update_one({"id": connection["id"]}, {"$set": sync_marks})
+
+async def save_snapshot(workspace: str, dataset):
+    """Persist an installed dataset; a failed snapshot never fails the request."""
+    try:
+        await run_in_threadpool(snapshot_store.save, workspace, dataset.key, dataset.df, dataset.source)
     except Exception as e:
-        logging.error(f"Error uploading file: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+        logging.error(f"Error saving dataset snapshot: {str(e)}")
 
-@api_router.get("/sprints", response_model=List[SprintData])
-async def get_sprints():
-    global current_dataset
+async def store_issues(workspace: str, dataset):
+    """Write an installed dataset to the issue store, if enabled; failures never fail the request."""
+    if issue_store is None:
+        return
+    try:
+        await issue_store.replace_dataset(workspace, dataset)
+    except Exception as e:
+        logging.error(f"Error storing issues in Mongo: {str(e)}")
+
+async def record_sprint_history(workspace: str, dataset):
+    """Record today's metrics of every sprint; failures never fail the request."""
+    try:
+        await sprint_history.record(workspace, dataset.sprint_summary)
+    except Exception as e:
+        logging.error(f"Error recording sprint history: {str(e)}")
+
+async def record_sprint_history_periodically():
+    """
+    Record the loaded workspaces' sprint metrics once per interval, so
+    history keeps a point per day even when nothing is refreshed.
+    """
+    while True:
+        await asyncio.sleep(SPRINT_HISTORY_INTERVAL_HOURS * 3600)
+        for workspace in datasets.workspaces():
+            dataset = datasets.get(workspace)
+            if dataset is not None:
+                await record_sprint_history(workspace, dataset)
+
+async def publish_dataset(workspace: str, dataset):
+    """Everything that follows a new install: snapshot, issue store, sprint history and AI insight."""
+    await save_snapshot(workspace, dataset)
+    await store_issues(workspace, dataset)
+    await record_sprint_history(workspace, dataset)
+    schedule_insight(dataset)
+
+def can_sync_incrementally(dataset, connection: Dict[str, Any], now: datetime) -> bool:
+    """Whether a workspace's Jira dataset can be updated in place instead of refetched."""
+    if dataset is None or dataset.source != "jira" or dataset.key != connection["id"]:
+        return False
     
-    if current_dataset is None:
-        raise HTTPException(status_code=404, detail="No data uploaded. Please upload a Jira CSV file first.")
+    last_synced = connection.get("last_synced_at")
+    last_full_sync = connection.get("last_full_sync_at")
+    if not last_synced or not last_full_sync:
+        return False
     
-    df = current_dataset
-    sprints_data = []
+    return now - datetime.fromisoformat(last_full_sync) < timedelta(hours=JIRA_FULL_RECONCILE_HOURS)
+
+# Fields the sprint listing can be sorted by
+SPRINT_SORT_FIELDS = [
+    'sprint_name', 'risk_level', 'completion_percentage', 'total_story_points', 'days_remaining', 'start_date', 'end_date'
+]
+
+# Sprint dates as sent to clients: UTC wall-clock time without an offset, which
+# the frontend renders as the same calendar day in every timezone
+SPRINT_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def build_sprint_data(
+    summary: pd.DataFrame,
+    query: Optional[SprintQuery] = None,
+    now: Optional[pd.Timestamp] = None
+) -> Union[List[Dict[str, Any]], SprintPage]:
+    """
+    Per-sprint progress and risk for the sprint rollup (runs in the compute pool),
+    as SprintData fields: a plain list of every sprint, or with a query a
+    SprintPage holding only the sprints of the requested page.
+    """
+    now = now or pd.Timestamp.now(tz='UTC')
+    if query is None:
+        return list(iter_sprint_data(summary, now))
+    
+    page_summary, page = select_sprint_page(summary, query, now)
+    return SprintPage(iter_sprint_data(page_summary, now), total=page.total, next_cursor=page.next_cursor)
+
+def select_sprint_page(
+    summary: pd.DataFrame,
+    query: SprintQuery,
+    now: Optional[pd.Timestamp] = None
+) -> Tuple[pd.DataFrame, SprintPage]:
+    """
+    Rows of the sprint rollup on a query's page, in listing order, and the
+    page's total and next cursor. The fields sprints are filtered and sorted
+    by are computed for all sprints at once, so SprintData is only built
+    for the page.
+    """
+    now = now or pd.Timestamp.now(tz='UTC')
+    summary = query.select(summary[summary.index != BACKLOG_SPRINT], now)
     
-    # Get unique sprints
-    sprints = df['Assigned Sprint'].dropna().unique()
+    total_points = summary['total_points'].to_numpy(dtype=float)
+    done_points = summary['done_points'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        completion_pct = np.where(total_points > 0, done_points / total_points * 100, 0.0)
     
-    for sprint in sprints:
-        if sprint == 'None( Backlog)':
+    # Days remaining as iter_sprint_data counts them: None unless both dates are known
+    dated = (summary['start_date'].notna() & summary['end_date'].notna()).to_numpy()
+    remaining = (summary['end_date'] - now).dt.days.to_numpy(dtype=float)
+    days_remaining = [int(days) if known else None for days, known in zip(remaining, dated)]
+    
+    risk_levels = np.select(
+        [completion_pct < 30, completion_pct < 50, completion_pct < 70], ['critical', 'high', 'medium'], 'low'
+    ).astype(object)
+    # Near the end and not complete
+    near_end = dated & (np.nan_to_num(remaining, nan=np.inf) < 3) & (completion_pct < 80)
+    risk_levels[near_end] = 'critical'
+    
+    start, end = SprintQuery.sprint_dates(summary)
+    page = query.paginate(
+        [
+            {
+                'position': i,
+                'sprint_name': summary.index[i],
+                'risk_level': risk_levels[i],
+                'completion_percentage': float(completion_pct[i]),
+                'total_story_points': float(total_points[i]),
+                'days_remaining': days_remaining[i],
+                'start_date': start.iloc[i],
+                'end_date': end.iloc[i]
+            }
+            for i in range(len(summary))
+        ],
+        SPRINT_SORT_FIELDS
+    )
+    return summary.iloc[[item['position'] for item in page]], page
+
+def iter_sprint_data(summary: pd.DataFrame, now: Optional[pd.Timestamp] = None) -> Iterator[Dict[str, Any]]:
+    """
+    SprintData fields of each sprint in the rollup, one sprint at a time. The
+    fields are built with SprintData's types and order, so they serialize as
+    the model would without validating every sprint again. Days remaining
+    and elapsed are counted from now.
+    """
+    now = now or pd.Timestamp.now(tz='UTC')
+    for sprint in summary.itertuples():
+        if sprint.Index == BACKLOG_SPRINT:
             continue
-            
-        sprint_df = df[df['Assigned Sprint'] == sprint]
-        
-        # Calculate metrics
-        total_issues = len(sprint_df)
-        total_story_points = sprint_df['Story Points'].sum()
         
-        # Status-based calculations
-        done_df = sprint_df[sprint_df['Status'] == 'Done']
-        in_progress_df = sprint_df[sprint_df['Status'] == 'In Progress']
-        todo_df = sprint_df[sprint_df['Status'] == 'To Do']
-        blocked_df = sprint_df[sprint_df['Status'] == 'Blocked']
-        
-        completed_points = done_df['Story Points'].sum()
-        in_progress_points = in_progress_df['Story Points'].sum()
-        todo_points = todo_df['Story Points'].sum()
-        blocked_points = blocked_df['Story Points'].sum()
+        total_story_points = sprint.total_points
+        completed_points = sprint.done_points
         
         completion_pct = (completed_points / total_story_points * 100) if total_story_points > 0 else 0
         
         # Get sprint dates
-        start_date = sprint_df['Assigned Sprint\nStart date'].iloc[0] if len(sprint_df) > 0 else None
-        end_date = sprint_df['Assigned Sprint\nEnd date'].iloc[0] if len(sprint_df) > 0 else None
+        start_date = sprint.start_date
+        end_date = sprint.end_date
         
         # Calculate days remaining
         days_remaining = None
         days_elapsed = None
         if pd.notna(end_date) and pd.notna(start_date):
-            try:
-                end_dt = pd.to_datetime(end_date)
-                start_dt = pd.to_datetime(start_date)
-                now = pd.Timestamp.now()
-                days_remaining = (end_dt - now).days
-                days_elapsed = (now - start_dt).days
-            except:
-                pass
+            days_remaining = (end_date - now).days
+            days_elapsed = (now - start_date).days
         
         # Risk assessment
         risk_level = "low"
@@ -328,219 +614,500 @@ async def get_sprints():
         if days_remaining is not None and days_remaining < 3 and completion_pct < 80:
             risk_level = "critical"
         
-        # Status distribution
-        status_dist = sprint_df['Status'].value_counts().to_dict()
-        
-        sprints_data.append(SprintData(
-            sprint_name=sprint,
-            start_date=str(start_date) if pd.notna(start_date) else None,
-            end_date=str(end_date) if pd.notna(end_date) else None,
-            total_issues=int(total_issues),
+        yield dict(
+            sprint_name=sprint.Index,
+            start_date=start_date.strftime(SPRINT_DATE_FORMAT) if pd.notna(start_date) else None,
+            end_date=end_date.strftime(SPRINT_DATE_FORMAT) if pd.notna(end_date) else None,
+            total_issues=int(sprint.total_issues),
             total_story_points=float(total_story_points),
             completed_story_points=float(completed_points),
-            in_progress_story_points=float(in_progress_points),
-            todo_story_points=float(todo_points),
-            blocked_story_points=float(blocked_points),
+            in_progress_story_points=float(sprint.in_progress_points),
+            todo_story_points=float(sprint.todo_points),
+            blocked_story_points=float(sprint.blocked_points),
             completion_percentage=float(completion_pct),
             days_remaining=days_remaining,
             days_elapsed=days_elapsed,
             risk_level=risk_level,
             velocity=float(completed_points),
-            status_distribution=status_dist
-        ))
-    
-    return sprints_data
-
-@api_router.get("/dashboard")
-async def get_dashboard():
-    global current_dataset
-    
-    if current_dataset is None:
-        raise HTTPException(status_code=404, detail="No data uploaded")
-    
-    df = current_dataset
-    
-    # Overall stats
-    total_sprints = df['Assigned Sprint'].nunique()
-    total_issues = len(df)
-    
-    # Calculate average velocity
-    sprints = df['Assigned Sprint'].dropna().unique()
-    velocities = []
-    at_risk_count = 0
-    
-    for sprint in sprints:
-        if sprint == 'None( Backlog)':
-            continue
-        sprint_df = df[df['Assigned Sprint'] == sprint]
-        done_df = sprint_df[sprint_df['Status'] == 'Done']
-        velocity = done_df['Story Points'].sum()
-        velocities.append(velocity)
-        
-        # Check risk
-        total_points = sprint_df['Story Points'].sum()
-        completion_pct = (velocity / total_points * 100) if total_points > 0 else 0
-        if completion_pct < 50:
-            at_risk_count += 1
-    
-    avg_velocity = sum(velocities) / len(velocities) if velocities else 0
-    
-    # Overall completion rate
-    total_points = df['Story Points'].sum()
-    completed_points = df[df['Status'] == 'Done']['Story Points'].sum()
-    completion_rate = (completed_points / total_points * 100) if total_points > 0 else 0
-    
-    return DashboardStats(
-        total_sprints=int(total_sprints),
-        total_issues=int(total_issues),
-        average_velocity=float(avg_velocity),
-        at_risk_sprints=int(at_risk_count),
-        completion_rate=float(completion_rate)
-    )
+            status_distribution=sprint.status_distribution
+        )
 
-@api_router.get("/recommendations", response_model=List[JiraPrompt])
-async def get_recommendations():
-    global current_dataset
-    
-    if current_dataset is None:
-        raise HTTPException(status_code=404, detail="No data uploaded")
-    
-    df = current_dataset
+def build_recommendations(summary: pd.DataFrame, now: Optional[pd.Timestamp] = None) -> List[JiraPrompt]:
+    """Rule-based prompts for each sprint in the rollup (runs in the compute pool)."""
+    now = now or pd.Timestamp.now(tz='UTC')
     prompts = []
     
     # Analyze sprints and generate prompts
-    sprints = df['Assigned Sprint'].dropna().unique()
-    
-    for sprint in sprints:
-        if sprint == 'None( Backlog)':
+    for sprint in summary.itertuples():
+        if sprint.Index == BACKLOG_SPRINT:
             continue
-            
-        sprint_df = df[df['Assigned Sprint'] == sprint]
-        total_points = sprint_df['Story Points'].sum()
-        completed_points = sprint_df[sprint_df['Status'] == 'Done']['Story Points'].sum()
-        blocked_points = sprint_df[sprint_df['Status'] == 'Blocked']['Story Points'].sum()
+        
+        sprint_name = sprint.Index
+        total_points = sprint.total_points
+        completed_points = sprint.done_points
+        blocked_points = sprint.blocked_points
         completion_pct = (completed_points / total_points * 100) if total_points > 0 else 0
         
         # Get sprint dates
-        end_date = sprint_df['Assigned Sprint\nEnd date'].iloc[0] if len(sprint_df) > 0 else None
+        end_date = sprint.end_date
         days_remaining = None
         
         if pd.notna(end_date):
-            try:
-                end_dt = pd.to_datetime(end_date)
-                now = pd.Timestamp.now()
-                days_remaining = (end_dt - now).days
-            except:
-                pass
+            days_remaining = (end_date - now).days
         
         # Critical: Sprint at risk
         if completion_pct < 50 and days_remaining is not None and days_remaining < 5:
             prompts.append(JiraPrompt(
-                sprint_name=sprint,
+                sprint_name=sprint_name,
                 prompt_type="critical",
-                title=f"⚠️ {sprint} - Critical Risk",
+                title=f"⚠️ {sprint_name} - Critical Risk",
                 message=f"Sprint is {completion_pct:.0f}% complete with only {days_remaining} days remaining. {total_points - completed_points:.0f} story points at risk. Immediate action required."
             ))
         
         # Warning: Low completion
         elif completion_pct < 60:
             prompts.append(JiraPrompt(
-                sprint_name=sprint,
+                sprint_name=sprint_name,
                 prompt_type="warning",
-                title=f"⚡ {sprint} - Attention Needed",
+                title=f"⚡ {sprint_name} - Attention Needed",
                 message=f"Sprint completion is at {completion_pct:.0f}%. Consider reprioritizing or descoping to meet sprint goals."
             ))
         
         # Blocked issues
         if blocked_points > 0:
-            blocked_count = len(sprint_df[sprint_df['Status'] == 'Blocked'])
+            blocked_count = sprint.blocked_issues
             prompts.append(JiraPrompt(
-                sprint_name=sprint,
+                sprint_name=sprint_name,
                 prompt_type="warning",
-                title=f"🚧 {sprint} - Blocked Issues",
+                title=f"🚧 {sprint_name} - Blocked Issues",
                 message=f"{blocked_count} issues ({blocked_points:.0f} story points) are blocked. Review and unblock to maintain velocity."
             ))
         
         # Success: Good progress
         if completion_pct >= 80:
             prompts.append(JiraPrompt(
-                sprint_name=sprint,
+                sprint_name=sprint_name,
                 prompt_type="success",
-                title=f"✅ {sprint} - On Track",
+                title=f"✅ {sprint_name} - On Track",
                 message=f"Great progress! Sprint is {completion_pct:.0f}% complete. Keep up the momentum."
             ))
     
-    # Use AI to generate additional insights
+    return prompts
+
+@api_router.get("/")
+async def root():
+    return {"message": "Jira Analytics API"}
+
+@api_router.post("/jira/test-connection", response_model=JiraConnectionTest)
+async def test_jira_connection(connection: JiraConnectionRequest):
+    """Test Jira connection credentials."""
     try:
-        if prompts and os.environ.get('EMERGENT_LLM_KEY'):
-            # Prepare data for AI analysis
-            sprint_summary = []
-            for sprint in sprints[:3]:  # Analyze top 3 sprints
-                if sprint == 'None( Backlog)':
-                    continue
-                sprint_df = df[df['Assigned Sprint'] == sprint]
-                total_points = sprint_df['Story Points'].sum()
-                completed_points = sprint_df[sprint_df['Status'] == 'Done']['Story Points'].sum()
-                completion_pct = (completed_points / total_points * 100) if total_points > 0 else 0
-                sprint_summary.append(f"{sprint}: {completion_pct:.0f}% complete, {total_points:.0f} total points, {completed_points:.0f} completed")
-            
-            chat = LlmChat(
-                api_key=os.environ.get('EMERGENT_LLM_KEY'),
-                session_id=str(uuid.uuid4()),
-                system_message="You are a Jira sprint analytics expert. Provide brief, actionable recommendations in 1-2 sentences."
-            ).with_model("gemini", "gemini-3-flash-preview")
-            
-            user_message = UserMessage(
-                text=f"Analyze these sprint metrics and provide ONE concise recommendation for the team:\n\n{chr(10).join(sprint_summary)}\n\nProvide a single actionable insight in 1 sentence."
+        is_valid = await jira_clients.validate(connection.jira_url, connection.email, connection.api_token)
+        
+        if is_valid:
+            return JiraConnectionTest(
+                success=True,
+                message="Connection successful! Credentials are valid."
+            )
+        else:
+            return JiraConnectionTest(
+                success=False,
+                message="Connection failed. Please check your credentials."
             )
-            
-            response = await chat.send_message(user_message)
-            
-            if response:
-                prompts.append(JiraPrompt(
-                    sprint_name="Overall",
-                    prompt_type="info",
-                    title="💡 AI Insight",
-                    message=response
-                ))
     except Exception as e:
-        logging.error(f"Error generating AI recommendations: {str(e)}")
+        logging.error(f"Connection test error: {str(e)}")
+        return JiraConnectionTest(
+            success=False,
+            message=f"Connection error: {str(e)}"
+        )
+
+@api_router.post("/jira/connect")
+async def connect_jira(connection: JiraConnectionRequest, workspace: str = Depends(get_workspace)):
+    """Save Jira connection for the workspace and fetch data."""
+    try:
+        # Test connection first (a recent successful test of the same credentials is reused)
+        is_valid = await jira_clients.validate(connection.jira_url, connection.email, connection.api_token)
+        
+        if not is_valid:
+            raise HTTPException(status_code=401, detail="Invalid Jira credentials")
+        
+        client = await jira_clients.get(connection.jira_url, connection.email, connection.api_token)
+        
+        # Save connection
+        conn = JiraConnection(
+            jira_url=connection.jira_url,
+            email=connection.email,
+            api_token=connection.api_token,
+            workspace=workspace
+        )
+        jira_connection = {
+            "id": conn.id,
+            "jira_url": connection.jira_url,
+            "email": connection.email,
+            "api_token": connection.api_token
+        }
+        jira_connections[workspace] = jira_connection
+        
+        # Store in database
+        conn_doc = conn.model_dump()
+        await db.jira_connections.insert_one(conn_doc)
+        
+        # Fetch data from Jira
+        sync_started = datetime.now(timezone.utc)
+        jira_service = create_jira_service(client)
+        df = await jira_service.fetch_all_data()
+        
+        if df.empty:
+            raise HTTPException(status_code=404, detail="No data found in Jira instance")
+        
+        dataset = await compute_pool.run_in_thread(datasets.install, workspace, df, "jira", conn.id)
+        await record_jira_sync(jira_connection, sync_started, full=True)
+        await publish_dataset(workspace, dataset)
+        
+        return {
+            "success": True,
+            "message": "Connected to Jira successfully",
+            "total_issues": len(df),
+            "total_sprints": df['Assigned Sprint'].nunique() if 'Assigned Sprint' in df.columns else 0
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error connecting to Jira: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error connecting to Jira: {str(e)}")
+
+@api_router.post("/jira/refresh")
+async def refresh_jira_data(full: bool = False, workspace: str = Depends(get_workspace)):
+    """
+    Refresh data from the workspace's connected Jira instance.
+    
+    By default only issues updated since the last sync are fetched and merged
+    into the workspace's dataset by Jira ID. A full refetch runs instead when
+    `full` is set, when there is no Jira dataset to merge into, or when the
+    last full sync is older than JIRA_FULL_RECONCILE_HOURS (this is what
+    picks up deleted issues).
+    """
+    jira_connection = jira_connections.get(workspace)
+    
+    if not jira_connection:
+        raise HTTPException(status_code=404, detail="No Jira connection found. Please connect first.")
+    
+    try:
+        sync_started = datetime.now(timezone.utc)
+        current = await load_dataset(workspace)
+        incremental = not full and can_sync_incrementally(current, jira_connection, sync_started)
+        updated_issues = None
+        
+        client = await jira_clients.get(
+            jira_connection["jira_url"], jira_connection["email"], jira_connection["api_token"]
+        )
+        jira_service = create_jira_service(client)
+        
+        if incremental:
+            since = datetime.fromisoformat(jira_connection["last_synced_at"])
+            updates, updated_keys = await jira_service.fetch_updated_since(
+                since - timedelta(minutes=JIRA_SYNC_OVERLAP_MINUTES)
+            )
+            df = await compute_pool.run_in_thread(jira_service.merge_updates, current.df, updates, updated_keys)
+            updated_issues = len(updated_keys)
+        else:
+            df = await jira_service.fetch_all_data()
+        
+        if df.empty:
+            raise HTTPException(status_code=404, detail="No data found in Jira")
+        
+        dataset = await compute_pool.run_in_thread(datasets.install, workspace, df, "jira", jira_connection["id"])
+        await record_jira_sync(jira_connection, sync_started, full=not incremental)
+        await publish_dataset(workspace, dataset)
+        
+        return {
+            "success": True,
+            "message": "Data refreshed successfully",
+            "mode": "incremental" if incremental else "full",
+            "updated_issues": updated_issues,
+            "total_issues": len(df),
+            "total_sprints": df['Assigned Sprint'].nunique()
+        }
+    
+    except Exception as e:
+        logging.error(f"Error refreshing Jira data: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error refreshing data: {str(e)}")
+
+@api_router.get("/jira/status")
+async def get_jira_connection_status(workspace: str = Depends(get_workspace)):
+    """Get the workspace's Jira connection status."""
+    jira_connection = jira_connections.get(workspace)
+    
+    if jira_connection:
+        client = jira_clients.peek(
+            jira_connection["jira_url"], jira_connection["email"], jira_connection["api_token"]
+        )
+        return {
+            "connected": True,
+            "jira_url": jira_connection["jira_url"],
+            "email": jira_connection["email"],
+            "rate_limit": client.rate_limiter.stats() if client else None
+        }
+    else:
+        return {"connected": False}
+
+@api_router.post("/upload-csv")
+async def upload_csv(
+    file: UploadFile = File(...),
+    upload_id: Optional[str] = None,
+    workspace: str = Depends(get_workspace)
+):
+    """
+    Upload a Jira Excel/CSV export into a workspace.
+    
+    The file is spooled to disk as it arrives (uploads over UPLOAD_MAX_MB are
+    cut off early) and parsed in place in bounded-size pieces.
+    Pass an upload_id to poll GET /upload-csv/{upload_id}/progress while a
+    large upload is being processed.
+    """
+    upload_id = upload_id or str(uuid.uuid4())
+    progress = upload_ingestor.start(upload_id, file.filename, file.size)
+    
+    try:
+        if not upload_ingestor.is_supported(file.filename):
+            raise HTTPException(status_code=400, detail="Unsupported file format. Please upload CSV or Excel file.")
+        
+        source = upload_ingestor.received(file, progress)
+        with stage_timer("upload.parse"):
+            df, columns = await compute_pool.run_in_thread(upload_ingestor.parse, source, file.filename, progress)
+        
+        progress['stage'] = 'installing'
+        with stage_timer("upload.install"):
+            dataset = await compute_pool.run_in_thread(datasets.install, workspace, df, "upload", upload_id)
+        
+        # Store upload info in database
+        upload_doc = {
+            "upload_id": upload_id,
+            "workspace": workspace,
+            "filename": file.filename,
+            "upload_time": datetime.now(timezone.utc).isoformat(),
+            "total_rows": len(df),
+            "columns": columns,
+            "memory": dataset.memory_report
+        }
+        await db.uploads.insert_one(upload_doc)
+        with stage_timer("upload.publish"):
+            await publish_dataset(workspace, dataset)
+        
+        progress['stage'] = 'done'
+        
+        return {
+            "success": True,
+            "upload_id": upload_id,
+            "filename": file.filename,
+            "total_issues": len(df),
+            "total_sprints": df['Assigned Sprint'].nunique() if 'Assigned Sprint' in df.columns else 0,
+            "memory": dataset.memory_report
+        }
+    except UploadTooLargeError as e:
+        upload_ingestor.fail(progress, str(e))
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException as e:
+        upload_ingestor.fail(progress, str(e.detail))
+        raise
+    except Exception as e:
+        upload_ingestor.fail(progress, str(e))
+        logging.error(f"Error uploading file: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+
+@api_router.get("/upload-csv/{upload_id}/progress")
+async def get_upload_progress(upload_id: str):
+    """Get progress of an upload started with this upload_id."""
+    progress = upload_ingestor.get_progress(upload_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail=f"Upload '{upload_id}' not found")
+    return progress
+
+@api_router.get("/workspaces")
+async def get_workspaces():
+    """Workspaces with a dataset in memory and the memory each one uses."""
+    return datasets.stats()
+
+@api_router.get("/compute-pool")
+async def get_compute_pool_stats():
+    """Queueing and run-time metrics of the compute pool."""
+    return compute_pool.stats()
+
+@api_router.get("/sprints", response_model=List[SprintData])
+async def get_sprints(
+    request: Request,
+    response: Response,
+    workspace: str = Depends(get_workspace),
+    query: Optional[SprintQuery] = Depends(get_sprint_query),
+    now: pd.Timestamp = Depends(get_request_time)
+):
+    """
+    Progress and risk of every sprint. Filter with risk_level, board, state,
+    from_date and to_date, order with sort, and page with limit; the next
+    page's cursor is returned in the X-Next-Cursor header. With
+    ?stream=ndjson (or Accept: application/x-ndjson) sprints are streamed
+    one per line.
+    """
+    dataset = await load_rollups(workspace)
+    
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="No data uploaded. Please upload a Jira CSV file first.")
+    
+    stream = negotiate_stream(request, response)
+    not_modified = etag_policy.check(
+        request, response, dataset, date_dependent=True, variant=NDJSON_MEDIA_TYPE if stream else '', now=now
+    )
+    if not_modified:
+        return not_modified
+    
+    if stream:
+        summary = dataset.sprint_summary
+        if query is not None:
+            try:
+                summary, page = await compute_pool.run_in_thread(select_sprint_page, summary, query, now)
+            except InvalidSprintQueryError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            set_page_headers(response, page)
+        # Each sprint is built as the stream reaches it
+        return stream_ndjson(response, iter_sprint_data(summary, now))
+    
+    try:
+        sprints = await compute_pool.run_in_thread(build_sprint_data, dataset.sprint_summary, query, now)
+    except InvalidSprintQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    set_page_headers(response, sprints)
+    # Already plain SprintData fields: skip response_model validation
+    return FastJSONResponse(sprints, headers=response_headers(response))
+
+@api_router.get("/sprints/{sprint_name}/history")
+async def get_sprint_history(
+    sprint_name: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    workspace: str = Depends(get_workspace),
+    now: pd.Timestamp = Depends(get_request_time)
+):
+    """
+    Daily burndown/burnup series of a sprint between start and end
+    (inclusive; defaults to the last SPRINT_HISTORY_DEFAULT_DAYS days)
+    """
+    end = end or now.date()
+    start = start or end - timedelta(days=SPRINT_HISTORY_DEFAULT_DAYS)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    
+    try:
+        return await sprint_history.series(workspace, sprint_name, start, end)
+    except Exception as e:
+        logging.error(f"Error reading history of {sprint_name}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@api_router.get("/dashboard")
+async def get_dashboard(request: Request, response: Response, workspace: str = Depends(get_workspace)):
+    dataset = await load_rollups(workspace)
+    
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="No data uploaded")
+    
+    not_modified = etag_policy.check(request, response, dataset)
+    if not_modified:
+        return not_modified
+    
+    return DashboardStats(**dataset.overall)
+
+@api_router.get("/recommendations", response_model=List[JiraPrompt])
+async def get_recommendations(
+    request: Request,
+    response: Response,
+    workspace: str = Depends(get_workspace),
+    now: pd.Timestamp = Depends(get_request_time)
+):
+    dataset = await load_rollups(workspace)
+    
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="No data uploaded")
+    
+    # The AI insight can become ready, or be regenerated with other text,
+    # without a new dataset version: its text is part of the ETag
+    ai_enabled = bool(os.environ.get('EMERGENT_LLM_KEY'))
+    insight = insight_generator.get(dataset.sprint_summary) if ai_enabled else None
+    not_modified = etag_policy.check(
+        request, response, dataset, date_dependent=True, variant=insight or "", now=now
+    )
+    if not_modified:
+        return not_modified
+    
+    summary = dataset.sprint_summary
+    prompts = await compute_pool.run_in_thread(build_recommendations, summary, now)
+    
+    # The AI insight is generated in the background when the dataset is
+    # installed; it is only included once it is ready
+    if prompts and ai_enabled:
+        if insight:
+            prompts.append(JiraPrompt(
+                sprint_name="Overall",
+                prompt_type="info",
+                title="💡 AI Insight",
+                message=insight
+            ))
+        else:
+            schedule_insight(dataset)
     
     return prompts
 
 @api_router.get("/team-performance", response_model=List[TeamMember])
-async def get_team_performance():
-    global current_dataset
+async def get_team_performance(request: Request, response: Response, workspace: str = Depends(get_workspace)):
+    dataset = await load_rollups(workspace)
     
-    if current_dataset is None:
+    if dataset is None:
         raise HTTPException(status_code=404, detail="No data uploaded")
     
-    df = current_dataset
-    team_members = []
+    not_modified = etag_policy.check(request, response, dataset)
+    if not_modified:
+        return not_modified
     
-    # Get unique assignees
-    assignees = df['Assignee'].dropna().unique()
+    # Rollup is already sorted by assigned points
+    team_members = [
+        TeamMember(
+            name=member.Index,
+            assigned_points=member.assigned_points,
+            completed_points=member.completed_points,
+            completion_rate=member.completion_rate
+        )
+        for member in dataset.assignee_summary.head(10).itertuples()
+    ]
     
-    for assignee in assignees:
-        assignee_df = df[df['Assignee'] == assignee]
-        assigned_points = assignee_df['Story Points'].sum()
-        completed_points = assignee_df[assignee_df['Status'] == 'Done']['Story Points'].sum()
-        completion_rate = (completed_points / assigned_points * 100) if assigned_points > 0 else 0
-        
-        team_members.append(TeamMember(
-            name=assignee,
-            assigned_points=float(assigned_points),
-            completed_points=float(completed_points),
-            completion_rate=float(completion_rate)
-        ))
+    return team_members  # Top 10
+
+@api_router.get("/velocity")
+async def get_velocity(
+    request: Request,
+    response: Response,
+    workspace: str = Depends(get_workspace),
+    now: pd.Timestamp = Depends(get_request_time)
+):
+    """Recent throughput of every team (board) and assignee, with each team's weekly trend."""
+    dataset = await load_dataset(workspace)
+    
+    if dataset is None:
+        raise HTTPException(status_code=404, detail="No data uploaded")
     
-    # Sort by assigned points
-    team_members.sort(key=lambda x: x.assigned_points, reverse=True)
+    not_modified = etag_policy.check(request, response, dataset, date_dependent=True, now=now)
+    if not_modified:
+        return not_modified
     
-    return team_members[:10]  # Top 10
+    velocity = await compute_pool.run_in_thread(velocity_engine.for_dataset, dataset, now)
+    return velocity_engine.to_dict(velocity)
 
 @api_router.get("/delay-predictions")
-async def get_delay_predictions():
+async def get_delay_predictions(
+    request: Request,
+    response: Response,
+    workspace: str = Depends(get_workspace),
+    query: Optional[SprintQuery] = Depends(get_sprint_query),
+    now: pd.Timestamp = Depends(get_request_time)
+):
     """
     Get comprehensive delay predictions for all sprints
     
@@ -549,31 +1116,69 @@ async def get_delay_predictions():
     - Risk factors (progress, completion rate, blockers)
     - Specific recommendations
     - Early warnings
+    
+    Accepts the same filter, sort and paging parameters as /sprints. With
+    ?stream=ndjson (or Accept: application/x-ndjson) the predictions are
+    streamed one per line as they are generated.
     """
-    global current_dataset, delay_predictor
+    dataset = await load_dataset(workspace)
     
-    if current_dataset is None:
+    if dataset is None:
         raise HTTPException(status_code=404, detail="No data uploaded")
     
+    stream = negotiate_stream(request, response)
+    not_modified = etag_policy.check(
+        request, response, dataset, date_dependent=True, variant=NDJSON_MEDIA_TYPE if stream else '', now=now
+    )
+    if not_modified:
+        return not_modified
+    
     try:
-        predictions = delay_predictor.analyze_all_sprints(current_dataset)
-        return predictions
+        velocity = await compute_pool.run_in_thread(velocity_engine.for_dataset, dataset, now)
+        if stream:
+            # Score every sprint up front, then build each prediction as the stream reaches it
+            scores = await compute_pool.run_in_thread(
+                delay_predictor.score_sprints, dataset.df, dataset.sprint_summary, velocity, query, now
+            )
+            set_page_headers(response, scores.page)
+            return stream_ndjson(response, delay_predictor.iter_predictions(scores))
+        
+        df = await compute_pool.share(dataset.version, dataset.df)
+        predictions = await compute_pool.run(
+            delay_predictor.analyze_all_sprints, df, dataset.sprint_summary, velocity, query, now
+        )
+        set_page_headers(response, predictions)
+        return FastJSONResponse(predictions, headers=response_headers(response))
+    except InvalidSprintQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Error generating delay predictions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating predictions: {str(e)}")
 
 @api_router.get("/delay-predictions/{sprint_name}")
-async def get_sprint_delay_prediction(sprint_name: str):
+async def get_sprint_delay_prediction(
+    request: Request,
+    response: Response,
+    sprint_name: str,
+    workspace: str = Depends(get_workspace),
+    now: pd.Timestamp = Depends(get_request_time)
+):
     """
     Get detailed delay prediction for a specific sprint
     """
-    global current_dataset, delay_predictor
+    dataset = await load_dataset(workspace)
     
-    if current_dataset is None:
+    if dataset is None:
         raise HTTPException(status_code=404, detail="No data uploaded")
     
+    not_modified = etag_policy.check(request, response, dataset, date_dependent=True, now=now)
+    if not_modified:
+        return not_modified
+    
     try:
-        prediction = delay_predictor.predict_delay(current_dataset, sprint_name)
+        velocity = await compute_pool.run_in_thread(velocity_engine.for_dataset, dataset, now)
+        df = await compute_pool.share(dataset.version, dataset.df)
+        prediction = await compute_pool.run(delay_predictor.predict_delay, df, sprint_name, velocity, now)
         if prediction is None:
             raise HTTPException(status_code=404, detail=f"Sprint '{sprint_name}' not found")
         return prediction
@@ -583,17 +1188,36 @@ async def get_sprint_delay_prediction(sprint_name: str):
         logging.error(f"Error generating prediction for {sprint_name}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics")
+async def get_metrics():
+    """Request, stage, Jira and dataset metrics in the Prometheus text format."""
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
 # Include the router in the main app
 app.include_router(api_router)
 
+# Innermost, so 413 responses still get CORS headers
+app.add_middleware(UploadLimitMiddleware, ingestor=upload_ingestor, path="/api/upload-csv")
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=COMPRESSION_MIN_BYTES,
+    gzip_level=GZIP_LEVEL,
+    brotli_quality=BROTLI_QUALITY
+)
+
+# Outermost, so request latency includes CORS handling and compression
+app.add_middleware(MetricsMiddleware, profiler=RequestProfiler(PROFILING_ENABLED, PROFILE_DIR))
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -601,6 +1225,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def restore_latest_snapshot():
+    """
+    Reinstall the most recent dataset snapshot so a restart doesn't lose it.
+    Other workspaces are reloaded from their snapshots (or the issue store)
+    on first access.
+    """
+    if issue_store is not None:
+        try:
+            await issue_store.ensure_indexes()
+        except Exception as e:
+            logging.error(f"Error creating issue store indexes: {str(e)}")
+    try:
+        await sprint_history.ensure_indexes()
+    except Exception as e:
+        logging.error(f"Error creating sprint history indexes: {str(e)}")
+    
+    await restore_snapshot()
+    
+    global sprint_history_task
+    if SPRINT_HISTORY_INTERVAL_HOURS > 0:
+        sprint_history_task = asyncio.create_task(record_sprint_history_periodically())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    if sprint_history_task is not None:
+        sprint_history_task.cancel()
+    client.close()
+    await jira_clients.close_all()
+    compute_pool.shutdown()
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Dataset Snapshot Store
+Persists installed datasets as Arrow IPC files so they can be memory-mapped back in after a restart
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Snapshots are disabled without pyarrow
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIX = '.arrow'
+METADATA_KEY = b'snapshot'
+
+
+class SnapshotStore:
+    """
+    Stores one uncompressed Arrow IPC snapshot per key (upload ID or Jira
+    connection ID) in a directory per workspace, and keeps only the
+    `retention` most recent ones of each workspace.
+    
+    Uncompressed IPC files can be memory-mapped, so a reload reads the
+    record batches straight from the page cache rather than into a second
+    buffer. to_pandas() still copies every column into pandas memory:
+    install() normalizes the frame into its compact layout anyway, so
+    Arrow-backed columns would not survive past the reload.
+    """
+    
+    def __init__(self, directory: Path, retention: int = 5):
+        self.directory = Path(directory)
+        self.retention = retention
+    
+    @property
+    def enabled(self) -> bool:
+        return pa is not None
+    
+    def save(self, workspace: str, key: str, df: pd.DataFrame, source: str) -> Optional[Path]:
+        """Write df as the workspace's snapshot for key, then apply retention"""
+        if not self.enabled:
+            logger.warning("pyarrow is not installed; skipping dataset snapshot")
+            return None
+        
+        path = self._path(workspace, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        metadata = {
+            'workspace': workspace,
+            'key': key,
+            'source': source,
+            'created_at': datetime.now(timezone.utc).isoformat()
+        }
+        
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            METADATA_KEY: json.dumps(metadata).encode()
+        })
+        
+        # Write to a temporary file first so a crash never leaves a torn snapshot
+        tmp_path = path.with_suffix(SNAPSHOT_SUFFIX + '.tmp')
+        with pa.OSFile(str(tmp_path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        
+        self._apply_retention(workspace)
+        return path
+    
+    def load_latest(self, workspace: Optional[str] = None) -> Optional[Tuple[pd.DataFrame, Dict]]:
+        """
+        Read the most recent snapshot of a workspace (of any workspace when
+        None) through a memory map; returns (df, metadata) or None
+        """
+        if not self.enabled:
+            return None
+        
+        for path in self._snapshots(workspace):
+            try:
+                return self._load(path)
+            except Exception as e:
+                logger.error(f"Error loading snapshot {path.name}: {str(e)}")
+        return None
+    
+    def _load(self, path: Path) -> Tuple[pd.DataFrame, Dict]:
+        # Read through the map; to_pandas() below copies the columns out of it
+        source = pa.memory_map(str(path), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        
+        metadata = json.loads((table.schema.metadata or {}).get(METADATA_KEY, b'{}'))
+        return table.to_pandas(), metadata
+    
+    def _snapshots(self, workspace: Optional[str] = None) -> List[Path]:
+        """Snapshot files of a workspace (or all workspaces), most recent first"""
+        if not self.directory.exists():
+            return []
+        if workspace is None:
+            paths = self.directory.glob(f'*/*{SNAPSHOT_SUFFIX}')
+        else:
+            paths = self._workspace_dir(workspace).glob(f'*{SNAPSHOT_SUFFIX}')
+        return sorted(paths, key=lambda path: path.stat().st_mtime, reverse=True)
+    
+    def _apply_retention(self, workspace: str):
+        for path in self._snapshots(workspace)[self.retention:]:
+            try:
+                path.unlink()
+            except OSError as e:
+                logger.error(f"Error removing snapshot {path.name}: {str(e)}")
+    
+    def _workspace_dir(self, workspace: str) -> Path:
+        return self.directory / self._safe_name(workspace)
+    
+    def _path(self, workspace: str, key: str) -> Path:
+        return self._workspace_dir(workspace) / f'{self._safe_name(key)}{SNAPSHOT_SUFFIX}'
+    
+    @staticmethod
+    def _safe_name(name: str) -> str:
+        return re.sub(r'[^A-Za-z0-9_-]', '_', name)
@@ -0,0 +1,143 @@
+"""
+Sprint Aggregation Engine
+Computes every per-sprint count, story point sum and date in one vectorized pass
+"""
+
+import numpy as np
+import pandas as pd
+
+from dataset_normalizer import to_utc_timestamps
+
+BACKLOG_SPRINT = 'None( Backlog)'
+
+# Statuses that get dedicated count/point columns, mapped to their column prefix
+TRACKED_STATUSES = {
+    'Done': 'done',
+    'In Progress': 'in_progress',
+    'To Do': 'todo',
+    'Blocked': 'blocked'
+}
+
+
+class SprintAggregator:
+    """
+    Builds the per-sprint summary table shared by the sprint, dashboard
+    and recommendation endpoints.
+    
+    The table has one row per sprint, indexed by sprint name, in the same order
+    as df['Assigned Sprint'].dropna().unique(), with columns:
+    - start_date / end_date: UTC timestamps from the sprint's first issue (NaT if missing)
+    - total_issues / total_points
+    - <status>_issues / <status>_points for each of TRACKED_STATUSES
+    - status_distribution: dict of status -> issue count (value_counts order)
+    """
+    
+    def summarize_sprints(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Aggregate the dataset into the per-sprint summary table"""
+        sprint_col = df['Assigned Sprint']
+        grouped = df.groupby(sprint_col, sort=False, observed=True)
+        
+        summary = pd.DataFrame({
+            'total_issues': grouped.size(),
+            'total_points': grouped['Story Points'].sum().astype(float)
+        })
+        summary.index.name = 'sprint_name'
+        
+        # Sprint dates come from the first issue of each sprint (DatasetNormalizer
+        # has parsed them already; a raw frame is parsed here, one row per sprint)
+        first_rows = np.flatnonzero(sprint_col.notna().to_numpy() & ~sprint_col.duplicated().to_numpy())
+        dates = df.iloc[first_rows]
+        summary['start_date'] = pd.Series(
+            to_utc_timestamps(dates['Assigned Sprint\nStart date']).array, index=dates['Assigned Sprint']
+        )
+        summary['end_date'] = pd.Series(
+            to_utc_timestamps(dates['Assigned Sprint\nEnd date']).array, index=dates['Assigned Sprint']
+        )
+        # Board of the sprint (Jira syncs); uploads without one leave it empty
+        summary['board'] = pd.Series(
+            dates['Board'].to_numpy(dtype=object) if 'Board' in dates.columns else np.nan,
+            index=dates['Assigned Sprint']
+        )
+        
+        # Per-sprint, per-status counts and point sums in a single groupby
+        status_grouped = df.groupby([sprint_col, df['Status']], sort=False, observed=True)
+        status_counts = status_grouped.size()
+        status_points = status_grouped['Story Points'].sum()
+        
+        status_values = status_counts.index.get_level_values('Status')
+        for status, prefix in TRACKED_STATUSES.items():
+            in_status = status_values == status
+            counts = status_counts[in_status].droplevel('Status')
+            points = status_points[in_status].droplevel('Status')
+            summary[f'{prefix}_issues'] = counts.reindex(summary.index, fill_value=0).astype(int)
+            summary[f'{prefix}_points'] = points.reindex(summary.index, fill_value=0.0).astype(float)
+        
+        summary['status_distribution'] = self._status_distributions(status_counts, summary.index)
+        
+        return summary
+    
+    def _status_distributions(self, status_counts: pd.Series, sprints: pd.Index) -> list:
+        """
+        Build a value_counts-style dict per sprint: counts descending,
+        ties kept in order of first appearance
+        """
+        per_sprint = {}
+        for (sprint, status), count in status_counts.items():
+            per_sprint.setdefault(sprint, []).append((status, int(count)))
+        
+        return [
+            dict(sorted(per_sprint.get(sprint, []), key=lambda item: -item[1]))
+            for sprint in sprints
+        ]
+    
+    def summarize_assignees(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Aggregate story points per assignee, indexed by assignee name and
+        sorted by assigned points (descending, ties in order of first appearance)
+        """
+        grouped = df.groupby('Assignee', sort=False, observed=True)
+        done = df[df['Status'] == 'Done'].groupby('Assignee', sort=False, observed=True)
+        
+        summary = pd.DataFrame({
+            'assigned_points': grouped['Story Points'].sum().astype(float)
+        })
+        summary.index.name = 'name'
+        summary['completed_points'] = (
+            done['Story Points'].sum().reindex(summary.index, fill_value=0.0).astype(float)
+        )
+        assigned = summary['assigned_points']
+        summary['completion_rate'] = (
+            summary['completed_points'] / assigned.where(assigned > 0) * 100
+        ).fillna(0.0)
+        
+        return summary.sort_values('assigned_points', ascending=False, kind='stable')
+    
+    def summarize_overall(self, df: pd.DataFrame, sprint_summary: pd.DataFrame) -> dict:
+        """Dataset-wide dashboard figures, derived from the per-sprint summary"""
+        # Overall completion rate covers every issue, including unassigned sprints
+        total_points = float(df['Story Points'].sum())
+        completed_points = float(df[df['Status'] == 'Done']['Story Points'].sum())
+        
+        return self.overall_from_totals(sprint_summary, len(df), total_points, completed_points)
+    
+    def overall_from_totals(
+        self,
+        sprint_summary: pd.DataFrame,
+        total_issues: int,
+        total_points: float,
+        completed_points: float
+    ) -> dict:
+        """Dashboard figures from the sprint summary and dataset-wide totals"""
+        # Average velocity and at-risk sprints exclude the backlog
+        sprints = sprint_summary[sprint_summary.index != BACKLOG_SPRINT]
+        velocities = sprints['done_points']
+        sprint_points = sprints['total_points']
+        completion_pct = (velocities / sprint_points.where(sprint_points > 0) * 100).fillna(0)
+        
+        return {
+            'total_sprints': len(sprint_summary),
+            'total_issues': int(total_issues),
+            'average_velocity': float(velocities.sum() / len(velocities)) if len(velocities) else 0.0,
+            'at_risk_sprints': int((completion_pct < 50).sum()),
+            'completion_rate': float(completed_points / total_points * 100) if total_points > 0 else 0.0
+        }
@@ -0,0 +1,96 @@
+"""
+Sprint History Store
+Records daily per-sprint metrics in compact Mongo buckets for burndown and burnup series
+"""
+
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from pymongo import ASCENDING, UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# Metrics recorded per sprint per day, in the order they are stored
+HISTORY_FIELDS = [
+    'total_issues',
+    'total_points',
+    'done_issues',
+    'done_points',
+    'in_progress_points',
+    'todo_points',
+    'blocked_points'
+]
+
+
+class SprintHistoryStore:
+    """
+    Stores one document per workspace, sprint and year (the bucket pattern),
+    mapping each recorded day to a fixed-order array of HISTORY_FIELDS:
+    
+        {workspace, sprint, year, fields: [...], days: {'2026-10-18': [12, 40.0, ...]}}
+    
+    Recording the same day again overwrites that day's values, so recording
+    on every refresh and on a daily schedule both leave one point per day.
+    A range query reads at most one small document per year, through the
+    unique (workspace, sprint, year) index, however long the history grows.
+    """
+    
+    def __init__(self, db, collection: str = 'sprint_history'):
+        self.history = db[collection]
+    
+    async def ensure_indexes(self):
+        await self.history.create_index(
+            [('workspace', ASCENDING), ('sprint', ASCENDING), ('year', ASCENDING)], unique=True
+        )
+    
+    async def record(self, workspace: str, sprint_summary: pd.DataFrame, day: Optional[date] = None) -> int:
+        """Record every sprint's current metrics for day (today, UTC); returns the number of sprints"""
+        day = day or datetime.now(timezone.utc).date()
+        operations = [
+            UpdateOne(
+                {'workspace': workspace, 'sprint': sprint_name, 'year': day.year},
+                {
+                    '$set': {
+                        f'days.{day.isoformat()}': [self._number(getattr(sprint, field)) for field in HISTORY_FIELDS],
+                        'fields': HISTORY_FIELDS
+                    }
+                },
+                upsert=True
+            )
+            for sprint_name, sprint in zip(sprint_summary.index, sprint_summary.itertuples())
+        ]
+        if operations:
+            await self.history.bulk_write(operations, ordered=False)
+        return len(operations)
+    
+    async def series(self, workspace: str, sprint_name: str, start: date, end: date) -> Dict[str, Any]:
+        """
+        Daily series of a sprint between start and end (inclusive): one list
+        per metric, plus remaining_points for burndown charts
+        """
+        cursor = self.history.find(
+            {'workspace': workspace, 'sprint': sprint_name, 'year': {'$gte': start.year, '$lte': end.year}},
+            {'_id': 0, 'fields': 1, 'days': 1}
+        )
+        start_key, end_key = start.isoformat(), end.isoformat()
+        
+        points: Dict[str, List] = {}
+        async for bucket in cursor:
+            fields = bucket.get('fields', HISTORY_FIELDS)
+            for day, values in bucket.get('days', {}).items():
+                if start_key <= day <= end_key:
+                    points[day] = dict(zip(fields, values))
+        
+        days = sorted(points)
+        series = {field: [points[day].get(field) for day in days] for field in HISTORY_FIELDS}
+        series['remaining_points'] = [
+            total - done if total is not None and done is not None else None
+            for total, done in zip(series['total_points'], series['done_points'])
+        ]
+        return {'sprint_name': sprint_name, 'days': days, **series}
+    
+    @staticmethod
+    def _number(value: Any) -> Any:
+        return value.item() if hasattr(value, 'item') else value
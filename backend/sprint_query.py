@@ -0,0 +1,190 @@
+"""
+Sprint Query
+Filters, sort order and cursor pagination for the sprint and delay prediction listings
+"""
+
+import base64
+import hashlib
+import json
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dataset_normalizer import to_utc_timestamps
+
+# Risk levels, most at risk first (the default order of delay predictions)
+RISK_LEVELS = ('critical', 'high', 'medium', 'low')
+
+# Sprint states, derived from the sprint dates
+SPRINT_STATES = ('active', 'future', 'closed')
+
+MAX_LIMIT = 1000
+
+
+class InvalidSprintQueryError(ValueError):
+    """A filter, sort key or cursor that can't be applied"""
+
+
+class SprintPage(list):
+    """
+    One page of a listing: the items, how many matched the filters, and the
+    cursor of the next page (None on the last one)
+    """
+    
+    def __init__(self, items: Iterable = (), total: int = 0, next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.total = total
+        self.next_cursor = next_cursor
+
+
+class SprintQuery:
+    """
+    Which sprints a listing returns, in what order, one page at a time.
+    
+    Applied in two steps so the per-sprint work only runs on the page:
+    1. select() drops rows of the sprint summary by board, state and date
+       range, before anything is computed for them
+    2. paginate() filters the cheap per-sprint items (name, risk level and
+       the sort fields) by risk level, sorts them and cuts out the page;
+       the caller then builds the full entries of that page only
+    
+    sort is a field name, prefixed with '-' for descending; sprints missing
+    the field sort last either way, and ties keep the listing's default
+    order. The cursor is opaque: it names the last sprint of the previous
+    page and is only valid for the same filters and sort.
+    """
+    
+    def __init__(
+        self,
+        risk_levels: Optional[Sequence[str]] = None,
+        boards: Optional[Sequence[str]] = None,
+        states: Optional[Sequence[str]] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ):
+        self.risk_levels = self._choices('risk_level', risk_levels, RISK_LEVELS)
+        self.boards = set(self._split(boards)) or None
+        self.states = self._choices('state', states, SPRINT_STATES)
+        self.from_date = from_date
+        self.to_date = to_date
+        self.sort = sort or None
+        self.limit = limit
+        self.cursor = cursor
+        
+        if from_date and to_date and from_date > to_date:
+            raise InvalidSprintQueryError("from_date must not be after to_date")
+        if limit is not None and not 1 <= limit <= MAX_LIMIT:
+            raise InvalidSprintQueryError(f"limit must be between 1 and {MAX_LIMIT}")
+    
+    def select(self, summary: pd.DataFrame, now: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """Sprint summary rows matching the board, state and date filters"""
+        keep = np.ones(len(summary), dtype=bool)
+        
+        if self.boards is not None:
+            if 'board' not in summary.columns:
+                return summary.iloc[:0]
+            keep &= summary['board'].astype(object).isin(list(self.boards)).to_numpy()
+        
+        if self.states is not None or self.from_date is not None or self.to_date is not None:
+            start, end = self.sprint_dates(summary)
+            # Sprints without dates have no state and overlap no range
+            keep &= (start.notna() & end.notna()).to_numpy()
+            
+            if self.states is not None:
+                now = now or pd.Timestamp.now(tz='UTC')
+                states = np.where(start > now, 'future', np.where(end < now, 'closed', 'active'))
+                keep &= np.isin(states, list(self.states))
+            if self.from_date is not None:
+                keep &= (end >= pd.Timestamp(self.from_date, tz='UTC')).to_numpy()
+            if self.to_date is not None:
+                # to_date is inclusive: the sprint starts before the next day
+                keep &= (start < pd.Timestamp(self.to_date + timedelta(days=1), tz='UTC')).to_numpy()
+        
+        return summary[keep]
+    
+    def paginate(self, items: List[Dict[str, Any]], sort_fields: Sequence[str]) -> SprintPage:
+        """
+        Filter items (in the listing's default order) by risk level, sort
+        them and return the page after the cursor. Every item has a
+        'sprint_name', a 'risk_level' and the fields it can be sorted by.
+        """
+        if self.risk_levels is not None:
+            items = [item for item in items if item['risk_level'] in self.risk_levels]
+        items = self._sorted(items, sort_fields)
+        
+        start = 0
+        if self.cursor:
+            after = self._decode_cursor(self.cursor)
+            names = [str(item['sprint_name']) for item in items]
+            if after not in names:
+                raise InvalidSprintQueryError("Cursor no longer matches a sprint of this listing")
+            start = names.index(after) + 1
+        
+        end = len(items) if self.limit is None else start + self.limit
+        page = items[start:end]
+        next_cursor = self._encode_cursor(page[-1]['sprint_name']) if page and end < len(items) else None
+        return SprintPage(page, total=len(items), next_cursor=next_cursor)
+    
+    @staticmethod
+    def sprint_dates(summary: pd.DataFrame):
+        """Start and end of every sprint as UTC timestamps (NaT where missing or unparseable)"""
+        return to_utc_timestamps(summary['start_date']), to_utc_timestamps(summary['end_date'])
+    
+    def _sorted(self, items: List[Dict[str, Any]], sort_fields: Sequence[str]) -> List[Dict[str, Any]]:
+        if self.sort is None:
+            return items
+        
+        field = self.sort.lstrip('-')
+        if field not in sort_fields:
+            raise InvalidSprintQueryError(f"Cannot sort by '{field}'; use one of: {', '.join(sort_fields)}")
+        
+        present = [item for item in items if not self._missing(item.get(field))]
+        missing = [item for item in items if self._missing(item.get(field))]
+        key = (lambda item: RISK_LEVELS.index(item[field])) if field == 'risk_level' else (lambda item: item[field])
+        # sorted() is stable, so ties keep the default order in both directions
+        present = sorted(present, key=key, reverse=self.sort.startswith('-'))
+        return present + missing
+    
+    def _fingerprint(self) -> str:
+        """Digest of everything that decides which sprints follow the cursor"""
+        parts = [
+            sorted(self.risk_levels or []), sorted(self.boards or []), sorted(self.states or []),
+            str(self.from_date), str(self.to_date), self.sort
+        ]
+        return hashlib.sha1(json.dumps(parts).encode()).hexdigest()[:12]
+    
+    def _encode_cursor(self, sprint_name: Any) -> str:
+        payload = json.dumps({'after': str(sprint_name), 'query': self._fingerprint()})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+    
+    def _decode_cursor(self, cursor: str) -> str:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            after, fingerprint = payload['after'], payload['query']
+        except (ValueError, TypeError, KeyError):
+            raise InvalidSprintQueryError("Malformed cursor")
+        if fingerprint != self._fingerprint():
+            raise InvalidSprintQueryError("Cursor belongs to a listing with other filters or sort order")
+        return after
+    
+    @staticmethod
+    def _missing(value: Any) -> bool:
+        return value is None or bool(pd.isna(value))
+    
+    @staticmethod
+    def _split(values: Optional[Sequence[str]]) -> List[str]:
+        """Values of a repeatable, comma-separated query parameter"""
+        return [value.strip() for values_item in values or [] for value in values_item.split(',') if value.strip()]
+    
+    @classmethod
+    def _choices(cls, name: str, values: Optional[Sequence[str]], allowed: Sequence[str]) -> Optional[set]:
+        chosen = {value.lower() for value in cls._split(values)}
+        unknown = chosen - set(allowed)
+        if unknown:
+            raise InvalidSprintQueryError(f"Unknown {name} {', '.join(sorted(unknown))}; use one of: {', '.join(allowed)}")
+        return chosen or None
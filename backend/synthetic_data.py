@@ -0,0 +1,304 @@
+"""
+Synthetic Jira Datasets
+Generates Jira-shaped issue datasets (and a mock Jira API serving them) at any size, for benchmarks
+"""
+
+import asyncio
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from dataset_normalizer import USED_COLUMNS
+from jira_client import SPRINT_FIELD
+from sprint_aggregator import BACKLOG_SPRINT
+
+# Status mix per sprint state, loosely following Raw.xlsx
+STATUS_MIX = {
+    'closed': {'Done': 0.88, 'To Do': 0.05, 'In Progress': 0.03, 'Blocked': 0.01, 'Cancelled': 0.03},
+    'active': {'Done': 0.40, 'In Progress': 0.22, 'In Review': 0.08, 'To Do': 0.20, 'Blocked': 0.10},
+    'future': {'To Do': 0.92, 'In Progress': 0.04, 'Blocked': 0.04},
+    'backlog': {'To Do': 0.85, 'In Progress': 0.08, 'Blocked': 0.05, 'Cancelled': 0.02}
+}
+
+STORY_POINTS = {np.nan: 0.18, 0.0: 0.10, 1.0: 0.05, 2.0: 0.18, 3.0: 0.05, 4.0: 0.20, 5.0: 0.04, 6.0: 0.12, 8.0: 0.06, 13.0: 0.02}
+PRIORITIES = {'Medium': 0.61, 'High': 0.34, 'Highest': 0.04, 'Critical': 0.01}
+ISSUE_TYPES = {'Story': 0.86, 'Sub-task': 0.12, 'Epic': 0.02}
+
+SUMMARY_VERBS = ['Implement', 'Fix', 'Migrate', 'Review', 'Configure', 'Automate', 'Document', 'Refactor']
+SUMMARY_NOUNS = ['login flow', 'billing export', 'server installation', 'cost report', 'alerting', 'search index', 'API gateway', 'audit log']
+
+# Offset of the mock Jira's sprint ids, so they don't look like row numbers
+SPRINT_ID_OFFSET = 1000
+
+
+class SyntheticJiraDataset:
+    """
+    Builds a dataset with the Raw.xlsx columns (plus Board) in one
+    vectorized pass:
+    1. Sprints run back to back per board, sprint_days long, so each board
+       has closed sprints, one active sprint and one future sprint
+    2. Issues are spread over the sprints (and the backlog) with a status
+       mix matching their sprint's state; Done issues get a Resolved time
+       inside their sprint
+    3. A carryover share of rows repeat an issue in its board's previous
+       sprint too, like issues carried over in Jira (same fields, one row
+       per sprint)
+    
+    rows is the number of rows (issues times their sprints); sizes from a thousand to millions of
+    rows and from ten to tens of thousands of sprints stay fast.
+    """
+    
+    def __init__(
+        self,
+        rows: int = 1000,
+        sprints: int = 10,
+        boards: Optional[int] = None,
+        assignees: Optional[int] = None,
+        sprint_days: int = 14,
+        backlog_share: float = 0.1,
+        carryover_share: float = 0.05,
+        seed: int = 0,
+        now: Optional[pd.Timestamp] = None
+    ):
+        self.rows = rows
+        self.sprints = max(1, sprints)
+        self.boards = boards or max(1, math.ceil(self.sprints / 25))
+        self.boards = min(self.boards, self.sprints)
+        self.assignees = assignees or max(5, self.boards * 6)
+        self.sprint_days = sprint_days
+        self.backlog_share = backlog_share
+        self.carryover_share = carryover_share
+        self.seed = seed
+        self.now = (now or pd.Timestamp.now()).floor('min')
+    
+    def sprint_table(self) -> pd.DataFrame:
+        """One row per sprint: id, name, board, state, dates and the board's previous sprint"""
+        index = np.arange(self.sprints)
+        board = index % self.boards
+        position = index // self.boards
+        board_sprints = np.bincount(board, minlength=self.boards)[board]
+        
+        # The second-to-last sprint of every board is active (the last one is future)
+        active_position = np.maximum(board_sprints - 2, 0)
+        active_start = (self.now - pd.Timedelta(days=self.sprint_days // 2)).normalize()
+        start = active_start + pd.to_timedelta((position - active_position) * self.sprint_days, unit='D')
+        end = start + pd.Timedelta(days=self.sprint_days - 3)
+        state = np.where(position < active_position, 'closed', np.where(position == active_position, 'active', 'future'))
+        
+        return pd.DataFrame({
+            'id': index + SPRINT_ID_OFFSET,
+            'name': [f"Sprint {i + 1}" for i in index],
+            'board': board + 1,
+            'state': state,
+            'start': start,
+            'end': end,
+            'previous': np.where(position > 0, index - self.boards, -1)
+        })
+    
+    def generate(self) -> pd.DataFrame:
+        rng = np.random.default_rng(self.seed)
+        sprints = self.sprint_table()
+        carried = int(self.rows * self.carryover_share) if (sprints['previous'] >= 0).any() else 0
+        base_rows = self.rows - carried
+        
+        # -1 is the backlog
+        sprint = np.where(
+            rng.random(base_rows) < self.backlog_share,
+            -1,
+            rng.integers(0, self.sprints, base_rows)
+        )
+        df = self._columns(np.arange(base_rows) + 1, sprint, sprints, rng)
+        
+        if carried:
+            # Carried-over issues also appear in their board's previous sprint
+            previous = sprints['previous'].to_numpy()
+            candidates = np.flatnonzero(sprint >= 0)
+            candidates = candidates[previous[sprint[candidates]] >= 0]
+            if len(candidates):
+                source = np.sort(rng.choice(candidates, min(carried, len(candidates)), replace=False))
+                carry = df.iloc[source].copy()
+                earlier = sprints.iloc[previous[sprint[source]]]
+                carry['Assigned Sprint'] = earlier['name'].to_numpy()
+                carry['Assigned Sprint\nStart date'] = earlier['start'].to_numpy()
+                carry['Assigned Sprint\nEnd date'] = earlier['end'].to_numpy()
+                df = pd.concat([df, carry])
+        
+        # Issues in key order, with the rows of a carried-over issue together
+        return df.sort_index(kind='stable').reset_index(drop=True)
+    
+    def to_excel(self, path, df: Optional[pd.DataFrame] = None):
+        """Write the dataset as an Excel export (at most 1,048,575 rows)"""
+        (self.generate() if df is None else df).to_excel(path, index=False)
+    
+    def to_csv(self, path, df: Optional[pd.DataFrame] = None):
+        (self.generate() if df is None else df).to_csv(path, index=False)
+    
+    def _columns(self, keys: np.ndarray, sprint: np.ndarray, sprints: pd.DataFrame, rng: np.random.Generator) -> pd.DataFrame:
+        n = len(keys)
+        in_sprint = sprint >= 0
+        at = np.where(in_sprint, sprint, 0)
+        
+        state = np.where(in_sprint, sprints['state'].to_numpy()[at], 'backlog')
+        status = np.empty(n, dtype=object)
+        for name, mix in STATUS_MIX.items():
+            mask = state == name
+            status[mask] = self._choice(rng, mix, mask.sum())
+        
+        start = np.where(in_sprint, sprints['start'].to_numpy()[at], np.datetime64('NaT'))
+        end = np.where(in_sprint, sprints['end'].to_numpy()[at], np.datetime64('NaT'))
+        now = np.datetime64(self.now.to_datetime64())
+        
+        created_from = np.where(in_sprint, start, now)
+        created = created_from - (rng.random(n) * 30 * 86400).astype('timedelta64[s]')
+        
+        done = (status == 'Done') & in_sprint
+        resolved_until = np.minimum(end + np.timedelta64(1, 'D'), now)
+        resolved = start + ((resolved_until - start) * rng.random(n)).astype('timedelta64[s]')
+        resolved = np.where(done, resolved, np.datetime64('NaT'))
+        
+        board = np.where(in_sprint, sprints['board'].to_numpy()[at], rng.integers(1, self.boards + 1, n))
+        team_size = max(1, self.assignees // self.boards)
+        member = (board - 1) * team_size + rng.integers(0, team_size, n)
+        names = np.array([f"Developer {i + 1}" for i in range(self.boards * team_size)], dtype=object)
+        assignee = np.where(rng.random(n) < 0.05, None, names[member])
+        
+        verbs = np.array(SUMMARY_VERBS, dtype=object)[keys % len(SUMMARY_VERBS)]
+        nouns = np.array(SUMMARY_NOUNS, dtype=object)[(keys // len(SUMMARY_VERBS)) % len(SUMMARY_NOUNS)]
+        
+        df = pd.DataFrame({
+            'Jira ID': [f"SYN-{key}" for key in keys],
+            'Summary': verbs + ' ' + nouns,
+            'Status': status,
+            'Story Points': self._choice(rng, STORY_POINTS, n).astype(float),
+            'Assigned Sprint': np.where(in_sprint, sprints['name'].to_numpy()[at], BACKLOG_SPRINT),
+            'Assigned Sprint\nStart date': pd.to_datetime(start),
+            'Assigned Sprint\nEnd date': pd.to_datetime(end),
+            'Assignee': assignee,
+            'Priority': self._choice(rng, PRIORITIES, n),
+            'Issue Type': self._choice(rng, ISSUE_TYPES, n),
+            'Created': pd.to_datetime(created).floor('min'),
+            'Resolved': pd.to_datetime(resolved).floor('min'),
+            'Board': np.where(in_sprint, board.astype(str), None)
+        })
+        return df[USED_COLUMNS]
+    
+    @staticmethod
+    def _choice(rng: np.random.Generator, weights: Dict[Any, float], size: int) -> np.ndarray:
+        values = np.array(list(weights), dtype=object)
+        p = np.array(list(weights.values()), dtype=float)
+        return values[rng.choice(len(values), size, p=p / p.sum())]
+
+
+class MockJiraServer:
+    """
+    Serves a synthetic dataset through the Jira endpoints JiraAPIClient
+    calls (boards, board sprints, sprint issues and `sprint in (...)` JQL
+    search), as an httpx transport, so JiraService can be benchmarked
+    without a network. latency_seconds is added to every response.
+    """
+    
+    def __init__(self, dataset: SyntheticJiraDataset, df: Optional[pd.DataFrame] = None, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.df = dataset.generate() if df is None else df
+        self.sprints = dataset.sprint_table()
+        self.requests = 0
+        self._records = self.df.to_dict('records')
+        
+        sprint_ids = dict(zip(self.sprints['name'], self.sprints['id']))
+        row_sprints = self.df['Assigned Sprint'].map(sprint_ids).fillna(-1).astype(int).to_numpy()
+        in_sprint = row_sprints >= 0
+        self._sprint_rows = pd.Series(np.flatnonzero(in_sprint)).groupby(row_sprints[in_sprint]).apply(list).to_dict()
+        self._issue_sprints = (
+            pd.Series(row_sprints[in_sprint]).groupby(self.df['Jira ID'].to_numpy()[in_sprint], sort=False)
+            .apply(list).to_dict()
+        )
+        self._sprint_json = {sprint['id']: self._sprint(sprint) for sprint in self.sprints.to_dict('records')}
+    
+    def transport(self) -> httpx.AsyncBaseTransport:
+        return httpx.MockTransport(self.handle)
+    
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        
+        path = request.url.path
+        params = request.url.params
+        start_at = int(params.get('startAt', 0))
+        max_results = int(params.get('maxResults', 50))
+        
+        if path == '/rest/agile/1.0/board':
+            boards = [{'id': int(board), 'name': f"Board {board}"} for board in sorted(self.sprints['board'].unique())]
+            return self._page('values', boards, start_at, max_results)
+        
+        match = re.fullmatch(r'/rest/agile/1\.0/board/(\d+)/sprint', path)
+        if match:
+            board_sprints = self.sprints[self.sprints['board'] == int(match.group(1))]
+            return self._page('values', [self._sprint_json[sprint_id] for sprint_id in board_sprints['id']], start_at, max_results)
+        
+        match = re.fullmatch(r'/rest/agile/1\.0/sprint/(\d+)/issue', path)
+        if match:
+            rows = self._sprint_rows.get(int(match.group(1)), [])
+            return self._issue_page(rows[start_at:start_at + max_results], start_at, max_results, len(rows))
+        
+        if path == '/rest/api/3/search':
+            sprint_ids = {int(sprint_id) for sprint_id in re.findall(r'\d+', params.get('jql', '').split(')')[0])}
+            rows = sorted(row for sprint_id in sprint_ids for row in self._sprint_rows.get(sprint_id, []))
+            # A search returns each issue once, whichever of the sprints it is in
+            keys = self.df['Jira ID'].to_numpy()
+            rows = list({keys[row]: row for row in reversed(rows)}.values())[::-1]
+            return self._issue_page(rows[start_at:start_at + max_results], start_at, max_results, len(rows))
+        
+        return httpx.Response(404, json={'errorMessages': [f"Unknown path {path}"]})
+    
+    def _page(self, key: str, values: List[Dict[str, Any]], start_at: int, max_results: int) -> httpx.Response:
+        return httpx.Response(200, json={
+            key: values[start_at:start_at + max_results],
+            'startAt': start_at,
+            'maxResults': max_results,
+            'isLast': start_at + max_results >= len(values)
+        })
+    
+    def _issue_page(self, rows: List[int], start_at: int, max_results: int, total: int) -> httpx.Response:
+        return httpx.Response(200, json={
+            'issues': [self._issue(row) for row in rows],
+            'startAt': start_at,
+            'maxResults': max_results,
+            'total': total
+        })
+    
+    def _issue(self, row: int) -> Dict[str, Any]:
+        issue = self._records[row]
+        points = issue['Story Points']
+        return {
+            'key': issue['Jira ID'],
+            'fields': {
+                'summary': issue['Summary'],
+                'status': {'name': issue['Status']},
+                'issuetype': {'name': issue['Issue Type']},
+                'priority': {'name': issue['Priority']},
+                'assignee': {'displayName': issue['Assignee']} if pd.notna(issue['Assignee']) else None,
+                'created': self._iso(issue['Created']),
+                'resolutiondate': self._iso(issue['Resolved']),
+                'customfield_10016': None if pd.isna(points) else float(points),
+                SPRINT_FIELD: [self._sprint_json[sprint_id] for sprint_id in self._issue_sprints.get(issue['Jira ID'], [])]
+            }
+        }
+    
+    def _sprint(self, sprint: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'id': int(sprint['id']),
+            'name': sprint['name'],
+            'state': sprint['state'],
+            'startDate': self._iso(sprint['start']),
+            'endDate': self._iso(sprint['end']),
+            'originBoardId': int(sprint['board'])
+        }
+    
+    @staticmethod
+    def _iso(value) -> Optional[str]:
+        return None if pd.isna(value) else pd.Timestamp(value).strftime('%Y-%m-%dT%H:%M:%S.000+0000')
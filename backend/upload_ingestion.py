@@ -0,0 +1,197 @@
+"""
+Streaming Upload Ingestion
+Enforces the upload size limit while the body arrives and parses uploaded exports in bounded-size pieces
+"""
+
+import logging
+from collections import OrderedDict
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+import pandas as pd
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, QueryParams
+
+from dataset_normalizer import USED_COLUMNS, DatasetNormalizer
+
+logger = logging.getLogger(__name__)
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xls')
+CSV_EXTENSIONS = ('.csv',)
+
+# Allowance for the multipart envelope (boundaries, part headers, form fields)
+# on top of the file size limit when checking the request body
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured size limit"""
+
+
+class UploadIngestor:
+    """
+    Ingests uploaded Excel/CSV exports without holding the raw file in memory:
+    1. Starlette spools the multipart file to a temporary file (kept in
+       memory only while small) as the body arrives; UploadLimitMiddleware
+       enforces max_bytes meanwhile, so oversized uploads are rejected
+       before they are fully received
+    2. The spooled file is parsed in place, in a single pass: CSV files
+       csv_chunk_rows rows at a time, keeping only the columns the app uses
+       and normalizing each chunk (categoricals, float32, parsed dates)
+       before the next is read, so the raw rows of at most one chunk are
+       held at a time
+    
+    Progress for each upload is tracked under its upload_id so clients can
+    poll long uploads.
+    """
+    
+    def __init__(
+        self,
+        max_bytes: int,
+        csv_chunk_rows: int = 50000,
+        max_tracked_uploads: int = 100,
+        normalizer: Optional[DatasetNormalizer] = None
+    ):
+        self.max_bytes = max_bytes
+        self.csv_chunk_rows = csv_chunk_rows
+        self.max_tracked_uploads = max_tracked_uploads
+        self.normalizer = normalizer or DatasetNormalizer()
+        self._progress: "OrderedDict[str, Dict]" = OrderedDict()
+    
+    def is_supported(self, filename: str) -> bool:
+        return filename.endswith(EXCEL_EXTENSIONS) or filename.endswith(CSV_EXTENSIONS)
+    
+    @property
+    def max_body_bytes(self) -> int:
+        """Largest request body an upload of max_bytes can arrive in"""
+        return self.max_bytes + MULTIPART_OVERHEAD_BYTES
+    
+    def start(self, upload_id: str, filename: Optional[str], total_bytes: Optional[int]) -> Dict:
+        """
+        Begin tracking progress for an upload, or continue tracking it
+        (UploadLimitMiddleware starts it when the body starts arriving)
+        """
+        progress = self._progress.get(upload_id)
+        if progress is not None:
+            progress['filename'] = filename or progress['filename']
+            progress['total_bytes'] = total_bytes if total_bytes is not None else progress['total_bytes']
+            return progress
+        
+        progress = {
+            'upload_id': upload_id,
+            'filename': filename,
+            'stage': 'receiving',
+            'bytes_received': 0,
+            'total_bytes': total_bytes,
+            'rows_parsed': 0,
+            'error': None
+        }
+        self._progress[upload_id] = progress
+        while len(self._progress) > self.max_tracked_uploads:
+            self._progress.popitem(last=False)
+        return progress
+    
+    def get_progress(self, upload_id: str) -> Optional[Dict]:
+        return self._progress.get(upload_id)
+    
+    def fail(self, progress: Dict, error: str):
+        progress['stage'] = 'failed'
+        progress['error'] = error
+    
+    def received(self, file: UploadFile, progress: Dict) -> BinaryIO:
+        """The upload's spooled file, rewound for parsing, once its exact size is checked"""
+        if file.size is not None:
+            if file.size > self.max_bytes:
+                raise UploadTooLargeError(self.too_large_message())
+            progress['bytes_received'] = file.size
+        
+        file.file.seek(0)
+        return file.file
+    
+    def parse(self, source: BinaryIO, filename: str, progress: Dict) -> Tuple[pd.DataFrame, List[str]]:
+        """
+        Parse an upload into a DataFrame restricted to USED_COLUMNS, reading
+        the file once. CSV chunks are normalized as they are read, so a CSV
+        upload's frame comes back already compact.
+        
+        Returns the DataFrame and the full list of columns in the file.
+        """
+        progress['stage'] = 'parsing'
+        used = set(USED_COLUMNS)
+        # Every column name pandas checks, in file order: the file's full header
+        seen: Dict[str, bool] = {}
+        
+        def keep(column) -> bool:
+            return seen.setdefault(column, column in used)
+        
+        if filename.endswith(EXCEL_EXTENSIONS):
+            df = pd.read_excel(source, usecols=keep)
+            progress['rows_parsed'] = len(df)
+            return df, list(seen)
+        
+        chunks = []
+        for chunk in pd.read_csv(source, chunksize=self.csv_chunk_rows, usecols=keep):
+            chunks.append(self.normalizer.compact_chunk(chunk))
+            progress['rows_parsed'] += len(chunk)
+        
+        columns = list(seen)
+        if not chunks:
+            return pd.DataFrame(columns=[column for column in columns if column in used]), columns
+        return self.normalizer.concat_chunks(chunks), columns
+    
+    def too_large_message(self) -> str:
+        return f"Upload exceeds the {self.max_bytes / (1024 * 1024):.0f} MB limit"
+
+
+class UploadLimitMiddleware:
+    """
+    Enforces an UploadIngestor's size limit on uploads to path while the
+    request body arrives. Starlette reads and spools the whole multipart
+    body before the endpoint runs, so without this an oversized upload
+    would only be rejected once fully received:
+    1. A declared Content-Length above the limit is answered with 413
+       before any of the body is read
+    2. Bodies without one (chunked) fail with 413 as soon as they pass it
+    
+    Bytes received are reported to the upload's progress when the request
+    names an upload_id.
+    """
+    
+    def __init__(self, app, ingestor: UploadIngestor, path: str):
+        self.app = app
+        self.ingestor = ingestor
+        self.path = path
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'POST' or scope['path'] != self.path:
+            await self.app(scope, receive, send)
+            return
+        
+        limit = self.ingestor.max_body_bytes
+        message = self.ingestor.too_large_message()
+        length = Headers(scope=scope).get('content-length')
+        declared = int(length) if length and length.isdigit() else None
+        if declared is not None and declared > limit:
+            response = JSONResponse({'detail': message}, status_code=413, headers={'Connection': 'close'})
+            await response(scope, receive, send)
+            return
+        
+        upload_id = QueryParams(scope['query_string'].decode('latin-1')).get('upload_id')
+        progress = self.ingestor.start(upload_id, None, declared) if upload_id else None
+        received = 0
+        
+        async def receive_limited():
+            nonlocal received
+            event = await receive()
+            if event['type'] == 'http.request':
+                received += len(event.get('body', b''))
+                if progress is not None:
+                    progress['bytes_received'] = received
+                if received > limit:
+                    if progress is not None:
+                        self.ingestor.fail(progress, message)
+                    # Raised while FastAPI reads the form, which passes HTTPExceptions through
+                    raise HTTPException(status_code=413, detail=message)
+            return event
+        
+        await self.app(scope, receive_limited, send)
@@ -0,0 +1,251 @@
+"""
+Velocity Engine
+Rolling throughput per team (board) and per assignee from issue resolution timestamps
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from dataset_normalizer import to_utc_timestamps
+
+logger = logging.getLogger(__name__)
+
+# Team of issues without a board (uploads, or datasets with a single team)
+ALL_TEAMS = 'All'
+
+
+class Velocity:
+    """
+    Throughput tables of one dataset:
+    - teams / assignees: issues and points resolved per day over the last
+      window_weeks weeks, and all-time resolved totals
+    - team_trend: rolling weekly points per team, one column per week
+    - sprints: team, start and end of each sprint (indexed by sprint name)
+    - open_work: issues not yet done per sprint and assignee
+    """
+    
+    def __init__(
+        self,
+        teams: pd.DataFrame,
+        assignees: pd.DataFrame,
+        team_trend: pd.DataFrame,
+        sprints: pd.DataFrame,
+        open_work: pd.DataFrame,
+        window_weeks: int,
+        as_of: pd.Timestamp
+    ):
+        self.teams = teams
+        self.assignees = assignees
+        self.team_trend = team_trend
+        self.sprints = sprints
+        self.open_work = open_work
+        self.window_weeks = window_weeks
+        self.as_of = as_of
+    
+    def sprint_issue_rates(self, sprint_names: Iterable, now: Optional[pd.Timestamp] = None) -> np.ndarray:
+        """
+        Issues per day each open sprint (started by now and not yet ended)
+        can expect to resolve:
+        1. The recent throughput of the assignees of its open issues, each
+           assignee's rate split across their open sprints by how many of
+           their open issues each holds
+        2. Where none of those assignees has recent throughput, its team's
+           throughput split evenly across the team's open sprints (sprints
+           without a known team get none)
+        
+        Sprints that aren't open, or have no history either way, get 0.
+        """
+        now = now or self.as_of
+        sprints = self.sprints
+        open_sprints = ((sprints['start'] <= now) & ~(sprints['end'] < now)).to_numpy(dtype=bool)
+        with_team = open_sprints & (sprints['team'] != ALL_TEAMS).to_numpy(dtype=bool)
+        
+        concurrent = sprints['team'][with_team].value_counts()
+        team_rates = sprints['team'].map(self.teams['issues_per_day']).astype(float)
+        team_shares = (team_rates / sprints['team'].map(concurrent).astype(float)).where(with_team, 0.0).fillna(0.0)
+        
+        work = self.open_work[self.open_work['sprint'].isin(sprints.index[open_sprints])]
+        assignee_rates = work['assignee'].map(self.assignees['issues_per_day']).astype(float).fillna(0.0)
+        shares = work['issues'] / work.groupby('assignee')['issues'].transform('sum')
+        assigned = (assignee_rates * shares).groupby(work['sprint']).sum().reindex(sprints.index, fill_value=0.0)
+        
+        rates = assigned.where(assigned > 0, team_shares)
+        return rates.reindex(list(sprint_names), fill_value=0.0).to_numpy(dtype=float)
+
+
+class VelocityEngine:
+    """
+    Builds a dataset's Velocity in one vectorized pass over its resolved
+    issues:
+    1. Done issues with a Resolved timestamp are counted once each (in the
+       team of their latest sprint) and binned by the week they resolved in
+    2. Weekly totals per team and per assignee are averaged over a rolling
+       window of window_weeks weeks, empty weeks counting as zero, up to
+       the current week
+    
+    Results are cached per dataset version (and day), so the pass runs once
+    per install rather than once per prediction request.
+    """
+    
+    def __init__(self, window_weeks: int = 6, max_entries: int = 16):
+        self.window_weeks = window_weeks
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[tuple, Velocity]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def for_dataset(self, dataset, now: Optional[pd.Timestamp] = None) -> Velocity:
+        """Velocity of an installed dataset, computed on first use each day (now's day, UTC)"""
+        now = now or pd.Timestamp.now(tz='UTC')
+        # The rolling window ends today, so an unchanged dataset is recomputed daily
+        key = (dataset.version, now.date())
+        with self._lock:
+            velocity = self._cache.get(key)
+            if velocity is not None:
+                self._cache.move_to_end(key)
+                return velocity
+        
+        velocity = self.compute(dataset.df, now)
+        with self._lock:
+            self._cache[key] = velocity
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return velocity
+    
+    def compute(self, df: pd.DataFrame, now: Optional[pd.Timestamp] = None) -> Velocity:
+        as_of = now or pd.Timestamp.now(tz='UTC')
+        teams = self._teams(df)
+        
+        resolved = self._resolved_issues(df, teams, as_of)
+        team_weeks = self._weekly(resolved, 'team', as_of)
+        assignee_weeks = self._weekly(resolved.dropna(subset=['assignee']), 'assignee', as_of)
+        
+        # Team and dates of each sprint, from its first row
+        sprints = (
+            pd.DataFrame({
+                'sprint': df['Assigned Sprint'].astype(object).to_numpy(),
+                'team': teams,
+                'start': to_utc_timestamps(df['Assigned Sprint\nStart date']).array,
+                'end': to_utc_timestamps(df['Assigned Sprint\nEnd date']).array
+            })
+            .dropna(subset=['sprint'])
+            .drop_duplicates('sprint')
+            .set_index('sprint')
+        )
+        velocity = Velocity(
+            teams=self._rates(resolved, 'team', team_weeks),
+            assignees=self._rates(resolved.dropna(subset=['assignee']), 'assignee', assignee_weeks),
+            team_trend=team_weeks['points'],
+            sprints=sprints,
+            open_work=self._open_work(df),
+            window_weeks=self.window_weeks,
+            as_of=as_of
+        )
+        logger.info(f"Computed velocity of {len(velocity.teams)} teams from {len(resolved)} resolved issues")
+        return velocity
+    
+    def to_dict(self, velocity: Velocity, trend_weeks: int = 12) -> Dict[str, Any]:
+        """JSON-ready velocity tables, with each team's last trend_weeks rolling weekly points"""
+        trend = velocity.team_trend.iloc[:, -trend_weeks:] if trend_weeks else velocity.team_trend.iloc[:, :0]
+        return {
+            'window_weeks': velocity.window_weeks,
+            'as_of': velocity.as_of.isoformat(),
+            'weeks': [week.date().isoformat() for week in trend.columns],
+            'teams': [
+                {
+                    'team': team,
+                    **self._row(row),
+                    'weekly_points': [float(points) for points in trend.loc[team]] if team in trend.index else []
+                }
+                for team, row in velocity.teams.iterrows()
+            ],
+            'assignees': [{'name': name, **self._row(row)} for name, row in velocity.assignees.iterrows()]
+        }
+    
+    def _teams(self, df: pd.DataFrame) -> np.ndarray:
+        """Team of every row: its board, or ALL_TEAMS"""
+        if 'Board' not in df.columns:
+            return np.full(len(df), ALL_TEAMS, dtype=object)
+        boards = df['Board'].astype(object)
+        return boards.where(boards.notna(), ALL_TEAMS).astype(str).to_numpy(dtype=object)
+    
+    def _resolved_issues(self, df: pd.DataFrame, teams: np.ndarray, as_of: pd.Timestamp) -> pd.DataFrame:
+        """One row per Done issue resolved by as_of, with its team, assignee, points and week"""
+        done = (df['Status'] == 'Done').to_numpy(dtype=bool) & df['Resolved'].notna().to_numpy()
+        resolved = pd.DataFrame({
+            'jira_id': df['Jira ID'].to_numpy()[done],
+            'team': teams[done],
+            'assignee': df['Assignee'].astype(object).to_numpy()[done],
+            'points': df['Story Points'].to_numpy(dtype=float)[done],
+            'resolved': pd.to_datetime(df['Resolved'][done], utc=True, errors='coerce', format='mixed').array
+        })
+        # An issue carried over several sprints counts once, in its latest sprint
+        resolved = resolved.drop_duplicates('jira_id', keep='last')
+        resolved = resolved[resolved['resolved'].notna()]
+        resolved = resolved[resolved['resolved'] <= as_of]
+        resolved['week'] = self._week(resolved['resolved'])
+        return resolved
+    
+    def _open_work(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows not yet Done per sprint and assignee (rows without either are left out)"""
+        work = pd.DataFrame({
+            'sprint': df['Assigned Sprint'].astype(object).to_numpy(),
+            'assignee': df['Assignee'].astype(object).to_numpy()
+        })[(df['Status'] != 'Done').to_numpy(dtype=bool)]
+        return work.dropna().groupby(['sprint', 'assignee'], sort=False).size().rename('issues').reset_index()
+    
+    def _weekly(self, resolved: pd.DataFrame, key: str, as_of: pd.Timestamp) -> Dict[str, pd.DataFrame]:
+        """
+        Rolling mean of issues and of points resolved per week, for every key
+        (rows) and every week from the first resolution to as_of (columns)
+        """
+        if resolved.empty:
+            empty = pd.DataFrame(index=pd.Index([], name=key), columns=pd.DatetimeIndex([]), dtype=float)
+            return {'issues': empty, 'points': empty}
+        
+        weekly = (
+            resolved.groupby([key, 'week'], sort=False)
+            .agg(issues=('jira_id', 'size'), points=('points', 'sum'))
+            .unstack('week', fill_value=0)
+        )
+        weeks = pd.date_range(resolved['week'].min(), self._week(pd.Series([as_of])).iloc[0], freq='7D')
+        return {
+            metric: weekly[metric].reindex(columns=weeks, fill_value=0).astype(float)
+            .T.rolling(self.window_weeks, min_periods=1).mean().T
+            for metric in ('issues', 'points')
+        }
+    
+    def _rates(self, resolved: pd.DataFrame, key: str, weekly: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Current daily throughput (from the last rolling week) and all-time totals per key"""
+        totals = resolved.groupby(key, sort=False).agg(
+            resolved_issues=('jira_id', 'size'), resolved_points=('points', 'sum')
+        )
+        if resolved.empty:
+            rates = pd.DataFrame({'issues_per_day': [], 'points_per_day': []}, index=totals.index, dtype=float)
+        else:
+            rates = pd.DataFrame({
+                'issues_per_day': weekly['issues'].iloc[:, -1] / 7,
+                'points_per_day': weekly['points'].iloc[:, -1] / 7
+            })
+        table = rates.join(totals, how='outer').fillna(0.0)
+        table.index.name = key
+        return table.sort_values('points_per_day', ascending=False, kind='stable')
+    
+    @staticmethod
+    def _week(timestamps: pd.Series) -> pd.Series:
+        """Monday 00:00 UTC of each timestamp's week"""
+        days = timestamps.dt.tz_convert('UTC').dt.tz_localize(None).dt.normalize()
+        return days - pd.to_timedelta(days.dt.weekday, unit='D')
+    
+    @staticmethod
+    def _row(row: pd.Series) -> Dict[str, Any]:
+        return {
+            'issues_per_day': round(float(row['issues_per_day']), 3),
+            'points_per_day': round(float(row['points_per_day']), 3),
+            'resolved_issues': int(row['resolved_issues']),
+            'resolved_points': float(row['resolved_points'])
+        }
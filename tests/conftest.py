@@ -0,0 +1,96 @@
+"""
+Test Fixtures
+The backend modules on sys.path, a small synthetic dataset, and a TestClient for server.py with Mongo stubbed out and the clock pinned
+"""
+
+import io
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+from synthetic_data import SyntheticJiraDataset  # noqa: E402
+
+# Every date-relative figure (days remaining, sprint state, velocity window) is computed from this instant
+NOW = pd.Timestamp('2026-03-04 12:00', tz='UTC')
+
+
+class FakeCollection:
+    """Accepts every Motor call and finds nothing"""
+    
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            return None
+        return call
+
+
+class FakeDatabase:
+    def __getattr__(self, name):
+        return FakeCollection()
+    
+    def __getitem__(self, name):
+        return FakeCollection()
+
+
+@pytest.fixture(scope='session')
+def now() -> pd.Timestamp:
+    return NOW
+
+
+@pytest.fixture(scope='session')
+def dataset() -> SyntheticJiraDataset:
+    return SyntheticJiraDataset(rows=2000, sprints=30, seed=7, now=NOW.tz_localize(None))
+
+
+@pytest.fixture(scope='session')
+def raw_df(dataset) -> pd.DataFrame:
+    return dataset.generate()
+
+
+@pytest.fixture(scope='session')
+def excel_upload(raw_df) -> bytes:
+    """raw_df as the Excel export a user would upload"""
+    buffer = io.BytesIO()
+    raw_df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope='session')
+def server(tmp_path_factory):
+    """server.py imported without Mongo, the LLM or a real snapshot directory"""
+    os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+    os.environ.setdefault('DB_NAME', 'tests')
+    os.environ.pop('EMERGENT_LLM_KEY', None)
+    os.environ['SNAPSHOT_DIR'] = str(tmp_path_factory.mktemp('snapshots'))
+    
+    import server
+    from sprint_history import SprintHistoryStore
+    server.db = FakeDatabase()
+    server.sprint_history = SprintHistoryStore(server.db)
+    server.app.dependency_overrides[server.get_request_time] = lambda: NOW
+    yield server
+    server.app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def client(server, excel_upload):
+    """A TestClient (without startup hooks, which connect to Mongo) after uploading excel_upload"""
+    from fastapi.testclient import TestClient
+    
+    client = TestClient(server.app)
+    response = client.post('/api/upload-csv', files={'file': ('sprints.xlsx', excel_upload)})
+    assert response.status_code == 200, response.text
+    return client
+
+
+@pytest.fixture
+def clock(server, now):
+    """Moves the request clock; put back after the test"""
+    def move(to: pd.Timestamp):
+        server.app.dependency_overrides[server.get_request_time] = lambda: to
+    yield move
+    move(now)
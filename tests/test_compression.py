@@ -0,0 +1,170 @@
+"""
+CompressionMiddleware negotiation, weak ETags and streamed chunks, and fast_json encoding of pandas and numpy values
+"""
+
+import asyncio
+import gzip
+import json
+import zlib
+
+import brotli
+import numpy as np
+import pandas as pd
+import pytest
+
+import fast_json
+from compression import CompressionMiddleware
+
+
+@pytest.mark.parametrize('accept_encoding, encoding', [
+    ('gzip', 'gzip'),
+    ('gzip, deflate, br', 'br'),
+    ('GZIP', 'gzip'),
+    ('br;q=0.5, gzip', 'gzip'),
+    ('br;q=0, gzip;q=0.1', 'gzip'),
+    ('*', 'br'),
+    ('*;q=0.5, br;q=0', 'gzip'),
+    ('gzip;q=0, br;q=0', None),
+    ('gzip;q=high', None),
+    ('identity', None),
+    ('deflate', None),
+    ('', None)
+])
+def test_negotiation_honours_q_values(accept_encoding, encoding):
+    assert CompressionMiddleware.negotiate(accept_encoding) == encoding
+
+
+def respond(middleware_options: dict, accept_encoding: str, status: int = 200, headers=(), chunks=(b'',)):
+    """Messages CompressionMiddleware sends for an app answering with headers and body chunks"""
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': status, 'headers': [
+            (name.lower().encode(), value.encode()) for name, value in headers
+        ]})
+        for n, chunk in enumerate(chunks):
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': n < len(chunks) - 1})
+    
+    sent = []
+    
+    async def send(message):
+        sent.append(message)
+    
+    scope = {'type': 'http', 'headers': [(b'accept-encoding', accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, **middleware_options)(scope, None, send))
+    start, *bodies = sent
+    return {name.decode().lower(): value.decode() for name, value in start['headers']}, [body['body'] for body in bodies]
+
+
+def test_large_body_is_compressed_with_a_weak_etag():
+    body = json.dumps([{'sprint': n} for n in range(500)]).encode()
+    
+    headers, bodies = respond({'minimum_size': 100}, 'gzip', headers=[('ETag', '"v1"'), ('Content-Length', str(len(body)))], chunks=[body])
+    
+    assert headers['content-encoding'] == 'gzip'
+    assert headers['etag'] == 'W/"v1"'
+    assert headers['vary'] == 'Accept-Encoding'
+    assert int(headers['content-length']) == len(bodies[0]) < len(body)
+    assert gzip.decompress(bodies[0]) == body
+
+
+def test_brotli_is_preferred_when_accepted():
+    body = b'{"sprint": "Sprint 1"}' * 100
+    
+    headers, bodies = respond({'minimum_size': 100}, 'gzip, br', chunks=[body])
+    
+    assert headers['content-encoding'] == 'br'
+    assert brotli.decompress(bodies[0]) == body
+
+
+def test_small_body_is_sent_as_is_but_still_varies():
+    headers, bodies = respond({'minimum_size': 1024}, 'gzip', headers=[('ETag', '"v1"'), ('Vary', 'Accept')], chunks=[b'{}'])
+    
+    assert 'content-encoding' not in headers
+    assert bodies == [b'{}']
+    assert headers['etag'] == 'W/"v1"'
+    assert headers['vary'] == 'Accept, Accept-Encoding'
+
+
+def test_304_keeps_the_etag_and_vary_of_the_200():
+    headers, bodies = respond({}, 'gzip', status=304, headers=[('ETag', '"v1"'), ('Vary', 'Accept')])
+    
+    assert headers['etag'] == 'W/"v1"'
+    assert headers['vary'] == 'Accept, Accept-Encoding'
+    assert 'content-encoding' not in headers
+    assert bodies == [b'']
+
+
+def test_identity_client_gets_the_strong_etag():
+    headers, bodies = respond({'minimum_size': 1}, 'identity', headers=[('ETag', '"v1"')], chunks=[b'x' * 100])
+    
+    assert headers == {'etag': '"v1"'}
+    assert bodies == [b'x' * 100]
+
+
+def test_encoded_responses_are_left_alone():
+    headers, bodies = respond({'minimum_size': 1}, 'gzip', headers=[('Content-Encoding', 'br')], chunks=[b'x' * 100])
+    
+    assert headers['content-encoding'] == 'br'
+    assert bodies == [b'x' * 100]
+
+
+def test_each_streamed_chunk_decodes_on_arrival():
+    chunks = [json.dumps({'sprint': n}).encode() + b'\n' for n in range(5)]
+    
+    headers, bodies = respond({'minimum_size': 1024}, 'gzip', chunks=chunks)
+    
+    assert headers['content-encoding'] == 'gzip'
+    assert 'content-length' not in headers
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert [decoder.decompress(body) for body in bodies] == chunks
+    assert decoder.eof
+
+
+def test_api_responses_vary_and_revalidate_under_compression(client):
+    headers = {'Accept-Encoding': 'gzip'}
+    first = client.get('/api/sprints', headers=headers)
+    
+    response = client.get('/api/sprints', headers={**headers, 'If-None-Match': first.headers['ETag']})
+    
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert first.headers['ETag'].startswith('W/')
+    assert response.status_code == 304
+    assert response.headers['ETag'] == first.headers['ETag']
+    assert response.headers['Vary'] == first.headers['Vary'] == 'Accept, Accept-Encoding'
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def encoder(request, monkeypatch):
+    """fast_json with orjson, then with the standard library fallback"""
+    if request.param == 'json':
+        monkeypatch.setattr(fast_json, 'orjson', None)
+    return fast_json
+
+
+def test_numpy_and_pandas_values_are_encoded(encoder):
+    content = {
+        'count': np.int64(3),
+        'ratio': np.float32(0.5),
+        'flag': np.bool_(True),
+        'points': np.array([1.0, 2.5]),
+        'start': pd.Timestamp('2026-03-04 12:00', tz='UTC'),
+        'end': pd.NaT,
+        'days_remaining': float('nan'),
+        'velocity': float('inf'),
+        'name': 'Sprint ✓'
+    }
+    
+    assert json.loads(encoder.dumps(content)) == {
+        'count': 3,
+        'ratio': 0.5,
+        'flag': True,
+        'points': [1.0, 2.5],
+        'start': '2026-03-04T12:00:00+00:00',
+        'end': None,
+        'days_remaining': None,
+        'velocity': None,
+        'name': 'Sprint ✓'
+    }
+
+
+def test_output_is_compact_utf8(encoder):
+    assert encoder.dumps({'name': 'Sprint ✓', 'points': [1, 2]}) == '{"name":"Sprint ✓","points":[1,2]}'.encode()
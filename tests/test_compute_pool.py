@@ -0,0 +1,147 @@
+"""
+ComputePool: bounded concurrency, queueing stats, and frames shared with process workers
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from compute_pool import SHARED_FRAME_LIMIT, ComputePool
+
+
+class Tracker:
+    """A blocking job that records how many copies of it run at once"""
+    
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+    
+    def __call__(self, seconds: float) -> float:
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(seconds)
+        with self.lock:
+            self.running -= 1
+        return seconds
+
+
+def fail():
+    raise ValueError('no sprints')
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({'Story Points': [1.0, 2.0, 3.0]})
+
+
+def test_at_most_max_concurrency_jobs_run_at_once():
+    async def run():
+        pool = ComputePool(max_workers=4, max_concurrency=2)
+        tracker = Tracker()
+        try:
+            results = await asyncio.gather(*(pool.run(tracker, 0.05) for _ in range(6)))
+            return pool.stats(), tracker.peak, results
+        finally:
+            pool.shutdown()
+    
+    stats, peak, results = asyncio.run(run())
+    
+    assert peak == 2
+    assert results == [0.05] * 6
+    assert stats['submitted'] == stats['completed'] == 6
+    # Two jobs start straight away; the other four wait for a slot, the last two for two jobs' worth
+    assert stats['peak_queued'] == 4
+    assert stats['queued'] == stats['running'] == 0
+    assert stats['wait_seconds_max'] >= 0.09
+    assert stats['wait_seconds_avg'] > 0
+
+
+def test_run_in_thread_shares_the_concurrency_limit():
+    async def run():
+        pool = ComputePool(max_workers=4, max_concurrency=1)
+        tracker = Tracker()
+        try:
+            await asyncio.gather(pool.run(tracker, 0.02), pool.run_in_thread(tracker, 0.02))
+            return tracker.peak
+        finally:
+            pool.shutdown()
+    
+    assert asyncio.run(run()) == 1
+
+
+def test_failures_are_counted_and_raised():
+    async def run():
+        pool = ComputePool(max_workers=1)
+        try:
+            with pytest.raises(ValueError, match='no sprints'):
+                await pool.run(fail)
+            return pool.stats()
+        finally:
+            pool.shutdown()
+    
+    stats = asyncio.run(run())
+    
+    assert stats['failed'] == 1
+    assert stats['completed'] == 0
+    assert stats['running'] == 0
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError, match='Unknown compute pool kind'):
+        ComputePool(kind='gpu')
+
+
+def test_thread_pool_shares_the_frame_itself(frame):
+    async def run():
+        pool = ComputePool(max_workers=1)
+        try:
+            return await pool.share('v1', frame)
+        finally:
+            pool.shutdown()
+    
+    assert asyncio.run(run()) is frame
+
+
+def test_process_pool_writes_each_version_once(frame):
+    async def run():
+        pool = ComputePool(kind='process', max_workers=1)
+        try:
+            first, second = await asyncio.gather(pool.share('v1', frame), pool.share('v1', frame))
+            rows = await pool.run(len, first)
+            return first, second, rows, pool._shared_dir
+        finally:
+            pool.shutdown()
+    
+    first, second, rows, shared_dir = asyncio.run(run())
+    
+    assert first is second
+    assert rows == len(frame)
+    assert not shared_dir.exists()
+
+
+def test_process_pool_removes_evicted_versions(frame):
+    async def run():
+        pool = ComputePool(kind='process', max_workers=1)
+        try:
+            shared = [await pool.share(f'v{n}', frame) for n in range(SHARED_FRAME_LIMIT + 2)]
+            return [os.path.exists(shared_frame.path) for shared_frame in shared]
+        finally:
+            pool.shutdown()
+    
+    assert asyncio.run(run()) == [False, False] + [True] * SHARED_FRAME_LIMIT
+
+
+def test_stats_endpoint(client):
+    client.get('/api/delay-predictions')
+    
+    stats = client.get('/api/compute-pool').json()
+    
+    assert stats['kind'] in ('thread', 'process')
+    assert stats['completed'] > 0
+    assert stats['queued'] == 0
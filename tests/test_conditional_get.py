@@ -0,0 +1,97 @@
+"""
+ETags and 304 responses of the analytics endpoints
+"""
+
+import pandas as pd
+import pytest
+
+ENDPOINTS = [
+    '/api/sprints',
+    '/api/dashboard',
+    '/api/team-performance',
+    '/api/recommendations',
+    '/api/delay-predictions',
+    '/api/delay-predictions/Sprint 1'
+]
+
+
+@pytest.mark.parametrize('endpoint', ENDPOINTS)
+def test_matching_etag_gets_304(client, endpoint):
+    first = client.get(endpoint)
+    etag = first.headers['ETag']
+    opaque = etag.removeprefix('W/')
+    
+    for if_none_match in (etag, opaque, f'W/{opaque}', f'"other", {etag}', '*'):
+        response = client.get(endpoint, headers={'If-None-Match': if_none_match})
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['ETag'] == etag
+    
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+
+def test_other_etag_gets_the_payload(client):
+    first = client.get('/api/sprints')
+    
+    response = client.get('/api/sprints', headers={'If-None-Match': '"stale"'})
+    
+    assert response.status_code == 200
+    assert response.json() == first.json()
+    assert response.headers['ETag'] == first.headers['ETag']
+
+
+def test_query_string_is_part_of_the_etag(client):
+    assert client.get('/api/sprints').headers['ETag'] != client.get('/api/sprints?limit=5').headers['ETag']
+
+
+def test_ndjson_has_its_own_etag(client):
+    json_etag = client.get('/api/sprints').headers['ETag']
+    
+    response = client.get('/api/sprints', headers={'Accept': 'application/x-ndjson', 'If-None-Match': json_etag})
+    
+    assert response.status_code == 200
+    assert response.headers['ETag'] != json_etag
+
+
+def test_new_upload_changes_every_etag(client, excel_upload):
+    etags = {endpoint: client.get(endpoint).headers['ETag'] for endpoint in ENDPOINTS}
+    
+    client.post('/api/upload-csv', files={'file': ('sprints.xlsx', excel_upload)})
+    
+    for endpoint, etag in etags.items():
+        assert client.get(endpoint, headers={'If-None-Match': etag}).status_code == 200
+
+
+def test_date_dependent_etags_roll_over(client, clock, now):
+    sprints_etag = client.get('/api/sprints').headers['ETag']
+    dashboard_etag = client.get('/api/dashboard').headers['ETag']
+    
+    clock(now + pd.Timedelta(hours=1))
+    
+    assert client.get('/api/sprints', headers={'If-None-Match': sprints_etag}).status_code == 200
+    assert client.get('/api/dashboard', headers={'If-None-Match': dashboard_etag}).status_code == 304
+
+
+@pytest.mark.parametrize('accept', ['application/json', 'application/x-ndjson'])
+def test_304_varies_like_the_listing(client, accept):
+    headers = {'Accept': accept, 'Accept-Encoding': 'identity'}
+    first = client.get('/api/sprints', headers=headers)
+    
+    response = client.get('/api/sprints', headers={**headers, 'If-None-Match': first.headers['ETag']})
+    
+    assert response.status_code == 304
+    assert response.headers['Vary'] == first.headers['Vary'] == 'Accept'
+
+
+def test_regenerated_insight_changes_the_recommendations_etag(server, client, monkeypatch):
+    insight = {'text': 'Finish the blocked stories first.'}
+    monkeypatch.setenv('EMERGENT_LLM_KEY', 'test-key')
+    monkeypatch.setattr(server.insight_generator, 'get', lambda summary: insight['text'])
+    first = client.get('/api/recommendations')
+    
+    insight['text'] = 'Split the largest story.'
+    
+    response = client.get('/api/recommendations', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert response.json()[-1]['message'] == 'Split the largest story.'
@@ -0,0 +1,73 @@
+"""
+DatasetNormalizer: pruned columns, categoricals and exact downcasts, with unchanged rollups
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_normalizer import FLOAT32_EXACT_LIMIT, USED_COLUMNS, DatasetNormalizer
+from sprint_aggregator import SprintAggregator
+
+
+@pytest.fixture(scope='module')
+def normalized(raw_df):
+    return DatasetNormalizer().normalize(raw_df.assign(**{'Custom field (Epic Link)': 'EPIC-1', 'Labels': 'backend'}))
+
+
+def test_only_used_columns_are_kept(normalized, raw_df):
+    df, report = normalized
+    
+    assert list(df.columns) == list(raw_df.columns)
+    assert report['columns_before'] == len(raw_df.columns) + 2
+    assert report['columns_after'] == len(USED_COLUMNS)
+
+
+def test_missing_used_columns_are_added_empty():
+    df = DatasetNormalizer().prune_columns(pd.DataFrame({'Jira ID': ['A-1'], 'Status': ['Done'], 'Extra': [1]}))
+    
+    assert set(df.columns) == set(USED_COLUMNS)
+    assert df['Assignee'].isna().all()
+
+
+def test_repeated_strings_become_categoricals(normalized):
+    df, report = normalized
+    
+    for column in ['Status', 'Assigned Sprint', 'Assignee', 'Priority', 'Issue Type', 'Board']:
+        assert isinstance(df[column].dtype, pd.CategoricalDtype), column
+    # Unique per row: kept as strings
+    assert not isinstance(df['Jira ID'].dtype, pd.CategoricalDtype)
+    assert report['memory_after_bytes'] < report['memory_before_bytes']
+
+
+def test_mostly_distinct_strings_stay_strings():
+    series = pd.Series(['Ann', 'Bob', 'Cy', 'Ann'])
+    
+    assert DatasetNormalizer()._to_category(series) is series
+
+
+@pytest.mark.parametrize('values, dtype', [
+    ([1.0, 2.5, np.nan, 13.0], np.float32),
+    # Not a multiple of 0.5, or a total float32 can't hold exactly
+    ([1.0, 0.3], np.float64),
+    ([FLOAT32_EXACT_LIMIT / 2, FLOAT32_EXACT_LIMIT / 2], np.float64)
+])
+def test_story_points_are_downcast_only_when_exact(values, dtype):
+    assert DatasetNormalizer()._downcast_float(pd.Series(values)).dtype == dtype
+
+
+def test_rollups_are_unchanged_by_normalization(normalized, raw_df):
+    df, _ = normalized
+    aggregator = SprintAggregator()
+    
+    raw_sprints = aggregator.summarize_sprints(raw_df)
+    sprints = aggregator.summarize_sprints(df)
+    
+    assert list(sprints.index) == list(raw_sprints.index)
+    for column in ['total_issues', 'total_points', 'done_points', 'blocked_points', 'status_distribution']:
+        assert sprints[column].tolist() == raw_sprints[column].tolist(), column
+    raw_assignees = aggregator.summarize_assignees(raw_df)
+    assignees = aggregator.summarize_assignees(df)
+    assert list(assignees.index) == list(raw_assignees.index)
+    assert assignees.to_numpy().tolist() == raw_assignees.to_numpy().tolist()
+    assert aggregator.summarize_overall(df, sprints) == aggregator.summarize_overall(raw_df, raw_sprints)
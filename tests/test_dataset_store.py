@@ -0,0 +1,105 @@
+"""
+DatasetRegistry: per-workspace datasets, least recently used eviction under the memory budget, and workspace isolation of the API
+"""
+
+import io
+
+import pytest
+
+from dataset_store import DatasetRegistry, DatasetStore
+
+
+@pytest.fixture(scope='module')
+def frames(raw_df) -> dict:
+    """Three datasets of different sizes, one per workspace"""
+    return {'alpha': raw_df.head(400), 'beta': raw_df.head(800), 'gamma': raw_df.head(1200)}
+
+
+@pytest.fixture(scope='module')
+def sizes(frames) -> dict:
+    """Memory each dataset takes once installed"""
+    return {name: DatasetStore().install(df, 'upload').memory_bytes for name, df in frames.items()}
+
+
+def registry(budget: int, evicted: list) -> DatasetRegistry:
+    return DatasetRegistry(budget, on_evict=evicted.append)
+
+
+def test_workspaces_keep_their_own_datasets(frames):
+    datasets = registry(10 ** 12, [])
+    
+    installed = {name: datasets.install(name, df, 'upload', f'{name}-upload') for name, df in frames.items()}
+    
+    for name, dataset in installed.items():
+        assert datasets.get(name) is dataset
+        assert dataset.key == f'{name}-upload'
+        assert dataset.overall == DatasetStore().install(frames[name], 'upload').overall
+    assert datasets.get('delta') is None
+
+
+def test_least_recently_used_workspace_is_evicted(frames, sizes):
+    evicted = []
+    datasets = registry(sizes['alpha'] + sizes['beta'] + sizes['gamma'] - 1, evicted)
+    datasets.install('alpha', frames['alpha'], 'upload')
+    datasets.install('beta', frames['beta'], 'upload')
+    datasets.get('alpha')
+    
+    datasets.install('gamma', frames['gamma'], 'upload')
+    
+    assert evicted == ['beta']
+    assert datasets.workspaces() == ['alpha', 'gamma']
+    assert datasets.memory_bytes() == sizes['alpha'] + sizes['gamma'] <= datasets.memory_budget_bytes
+
+
+def test_installed_workspace_is_kept_even_over_budget(frames, sizes):
+    evicted = []
+    datasets = registry(sizes['gamma'] - 1, evicted)
+    datasets.install('alpha', frames['alpha'], 'upload')
+    
+    datasets.install('gamma', frames['gamma'], 'upload')
+    
+    assert evicted == ['alpha']
+    assert datasets.workspaces() == ['gamma']
+
+
+def test_reinstalling_replaces_the_workspace_dataset(frames, sizes):
+    datasets = registry(10 ** 12, [])
+    datasets.install('alpha', frames['gamma'], 'upload')
+    
+    dataset = datasets.install('alpha', frames['alpha'], 'upload')
+    
+    assert datasets.get('alpha') is dataset
+    assert datasets.memory_bytes() == sizes['alpha']
+
+
+def test_stats_report_every_workspace(frames, sizes):
+    datasets = registry(10 ** 12, [])
+    for name in ('alpha', 'beta'):
+        datasets.install(name, frames[name], 'upload')
+    
+    stats = datasets.stats()
+    
+    assert stats['memory_bytes'] == sizes['alpha'] + sizes['beta']
+    assert {name: workspace['rows'] for name, workspace in stats['workspaces'].items()} == {
+        'alpha': len(frames['alpha']), 'beta': len(frames['beta'])
+    }
+
+
+def test_uploads_to_a_workspace_leave_the_others_alone(client, raw_df):
+    default_sprints = client.get('/api/sprints').json()
+    buffer = io.BytesIO()
+    raw_df.head(300).to_excel(buffer, index=False)
+    
+    response = client.post(
+        '/api/upload-csv', params={'workspace': 'team-b'}, files={'file': ('team-b.xlsx', buffer.getvalue())}
+    )
+    
+    assert response.status_code == 200, response.text
+    assert client.get('/api/sprints').json() == default_sprints
+    team_b = client.get('/api/dashboard', params={'workspace': 'team-b'}).json()
+    assert team_b != client.get('/api/dashboard').json()
+    assert 'team-b' in client.get('/api/workspaces').json()['workspaces']
+
+
+def test_workspace_names_are_validated(client):
+    assert client.get('/api/sprints', params={'workspace': '../etc'}).status_code == 422
@@ -0,0 +1,66 @@
+"""
+Batch scoring in DelayPredictor.analyze_all_sprints, checked against
+predict_delay run sprint by sprint
+"""
+
+import pandas as pd
+import pytest
+
+from dataset_store import DatasetStore
+from delay_predictor import DelayPredictor
+from sprint_aggregator import BACKLOG_SPRINT
+from velocity_engine import VelocityEngine
+
+
+@pytest.fixture(scope='module')
+def installed(raw_df):
+    return DatasetStore().install(raw_df, source='upload')
+
+
+@pytest.fixture(scope='module', params=['without_velocity', 'with_velocity'])
+def velocity(request, installed, now):
+    if request.param == 'without_velocity':
+        return None
+    return VelocityEngine().for_dataset(installed, now)
+
+
+def test_batch_matches_predict_delay(installed, velocity, now):
+    predictor = DelayPredictor()
+    
+    predictions = predictor.analyze_all_sprints(installed.df, installed.sprint_summary, velocity, now=now)
+    
+    sprints = [sprint for sprint in installed.sprint_summary.index if sprint != BACKLOG_SPRINT]
+    assert sorted(prediction['sprint_name'] for prediction in predictions) == sorted(sprints)
+    for prediction in predictions:
+        assert prediction == predictor.predict_delay(installed.df, prediction['sprint_name'], velocity, now)
+
+
+def test_batch_is_sorted_by_delay_probability(installed, now):
+    predictions = DelayPredictor().analyze_all_sprints(installed.df, installed.sprint_summary, now=now)
+    
+    probabilities = [prediction['delay_probability'] for prediction in predictions]
+    assert probabilities == sorted(probabilities, reverse=True)
+
+
+def test_raw_frame_matches_installed_frame(raw_df, installed, now):
+    predictor = DelayPredictor()
+    
+    raw = predictor.analyze_all_sprints(raw_df, now=now)
+    
+    assert raw == predictor.analyze_all_sprints(installed.df, installed.sprint_summary, now=now)
+
+
+def test_unknown_sprint_has_no_prediction(installed, now):
+    assert DelayPredictor().predict_delay(installed.df, 'No such sprint', now=now) is None
+
+
+def test_predictions_follow_now(installed, now):
+    predictor = DelayPredictor()
+    # The latest sprint still has weeks to run (days remaining stop at 0)
+    sprint = installed.sprint_summary['end_date'].idxmax()
+    
+    today = predictor.predict_delay(installed.df, sprint, now=now)
+    next_week = predictor.predict_delay(installed.df, sprint, now=now + pd.Timedelta(days=7))
+    
+    assert today['days_remaining'] > 7
+    assert today['days_remaining'] - next_week['days_remaining'] == 7
@@ -0,0 +1,143 @@
+"""
+InsightGenerator with a fake `complete` in place of the LLM: background
+generation, caching by metrics, failures and expiry
+"""
+
+import asyncio
+
+import pytest
+
+from insight_generator import InsightGenerator
+from sprint_aggregator import SprintAggregator
+
+
+class FakeComplete:
+    """Records prompts and answers them (or fails) like an LLM client"""
+    
+    def __init__(self, answer='Finish the blocked stories first.', error=None):
+        self.answer = answer
+        self.error = error
+        self.prompts = []
+    
+    async def __call__(self, prompt: str):
+        self.prompts.append(prompt)
+        await asyncio.sleep(0)
+        if self.error is not None:
+            raise self.error
+        return self.answer
+
+
+@pytest.fixture(scope='module')
+def summary(raw_df):
+    return SprintAggregator().summarize_sprints(raw_df)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_insight_is_generated_in_the_background(summary):
+    complete = FakeComplete()
+    generator = InsightGenerator(complete)
+    
+    async def scenario():
+        assert generator.get(summary) is None
+        await generator.schedule(summary)
+        return generator.get(summary)
+    
+    assert run(scenario()) == complete.answer
+    assert len(complete.prompts) == 1
+    for line in generator.metrics_lines(summary):
+        assert line in complete.prompts[0]
+
+
+def test_same_metrics_are_generated_once(summary):
+    complete = FakeComplete()
+    generator = InsightGenerator(complete)
+    
+    async def scenario():
+        pending = generator.schedule(summary)
+        assert generator.schedule(summary) is None
+        await pending
+        assert generator.schedule(summary) is None
+    
+    run(scenario())
+    assert len(complete.prompts) == 1
+
+
+def test_changed_metrics_get_their_own_insight(summary):
+    complete = FakeComplete()
+    generator = InsightGenerator(complete)
+    later = summary.iloc[1:]
+    
+    async def scenario():
+        await generator.schedule(summary)
+        complete.answer = 'Split the largest story.'
+        await generator.schedule(later)
+    
+    run(scenario())
+    assert generator.get(summary) == 'Finish the blocked stories first.'
+    assert generator.get(later) == 'Split the largest story.'
+    assert generator.cache_key(summary) != generator.cache_key(later)
+
+
+@pytest.mark.parametrize('complete', [FakeComplete(error=RuntimeError('LLM unavailable')), FakeComplete(answer='')])
+def test_failures_are_not_retried_until_retry_seconds(summary, complete):
+    generator = InsightGenerator(complete, retry_seconds=3600)
+    
+    async def scenario():
+        await generator.schedule(summary)
+        assert generator.schedule(summary) is None
+    
+    run(scenario())
+    assert generator.get(summary) is None
+    assert len(complete.prompts) == 1
+
+
+def test_failures_are_retried_after_retry_seconds(summary):
+    complete = FakeComplete(error=RuntimeError('LLM unavailable'))
+    generator = InsightGenerator(complete, retry_seconds=0)
+    
+    async def scenario():
+        await generator.schedule(summary)
+        complete.error = None
+        await generator.schedule(summary)
+    
+    run(scenario())
+    assert generator.get(summary) == complete.answer
+    assert len(complete.prompts) == 2
+
+
+def test_expired_insight_is_generated_again(summary):
+    complete = FakeComplete()
+    generator = InsightGenerator(complete, ttl_seconds=0)
+    
+    async def scenario():
+        await generator.schedule(summary)
+        assert generator.get(summary) is None
+        await generator.schedule(summary)
+    
+    run(scenario())
+    assert len(complete.prompts) == 2
+
+
+def test_cache_keeps_max_entries(summary):
+    generator = InsightGenerator(FakeComplete(), max_entries=2)
+    summaries = [summary.iloc[start:] for start in range(3)]
+    
+    async def scenario():
+        for sprint_summary in summaries:
+            await generator.schedule(sprint_summary)
+    
+    run(scenario())
+    assert [generator.get(sprint_summary) is not None for sprint_summary in summaries] == [False, True, True]
+
+
+def test_empty_summary_is_not_sent(summary):
+    complete = FakeComplete()
+    
+    async def scenario():
+        return InsightGenerator(complete).schedule(summary.iloc[:0])
+    
+    assert run(scenario()) is None
+    assert complete.prompts == []
@@ -0,0 +1,219 @@
+"""
+MongoIssueStore against an in-memory collection: the aggregation pipelines
+give SprintAggregator's rollups, stale rows are removed, and the stored
+version is only re-read from Mongo once per metadata TTL
+"""
+
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from dataset_store import DatasetStore
+from issue_store import MongoIssueStore
+
+
+def evaluate(expression, document):
+    """Value of an aggregation expression for a document ('$field', $cond, $eq or a literal)"""
+    if isinstance(expression, str) and expression.startswith('$'):
+        return document.get(expression[1:])
+    if isinstance(expression, dict):
+        if '$cond' in expression:
+            condition, then, otherwise = expression['$cond']
+            return evaluate(then if evaluate(condition, document) else otherwise, document)
+        if '$eq' in expression:
+            left, right = expression['$eq']
+            return evaluate(left, document) == evaluate(right, document)
+        return {field: evaluate(value, document) for field, value in expression.items()}
+    return expression
+
+
+def matches(document, query) -> bool:
+    for field, condition in query.items():
+        if isinstance(condition, dict) and '$ne' in condition:
+            if document.get(field) == condition['$ne']:
+                return False
+        elif document.get(field) != condition:
+            return False
+    return True
+
+
+def sort(documents, order):
+    """Stable multi-key sort; null sorts before every value, as in Mongo"""
+    for field, direction in reversed(list(order.items())):
+        documents = sorted(
+            documents, key=lambda document: (document.get(field) is not None, document.get(field) or 0),
+            reverse=direction < 0
+        )
+    return documents
+
+
+def group(documents, stage):
+    """$group with $sum (numbers only, like Mongo) and $first accumulators"""
+    groups = {}
+    for document in documents:
+        key = evaluate(stage['_id'], document)
+        hashable = tuple(key.items()) if isinstance(key, dict) else key
+        if hashable not in groups:
+            groups[hashable] = {'_id': key, **{
+                field: 0 if '$sum' in accumulator else evaluate(accumulator['$first'], document)
+                for field, accumulator in stage.items() if field != '_id'
+            }}
+        for field, accumulator in stage.items():
+            if field == '_id' or '$sum' not in accumulator:
+                continue
+            value = evaluate(accumulator['$sum'], document)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                groups[hashable][field] += value
+    # Mongo returns groups in no particular order
+    return list(reversed(groups.values()))
+
+
+class Cursor:
+    def __init__(self, documents):
+        self.documents = documents
+    
+    def sort(self, field, direction):
+        return Cursor(sort(self.documents, {field: direction}))
+    
+    async def to_list(self, length=None):
+        return [dict(document) for document in self.documents]
+
+
+class MemoryCollection:
+    """The Motor collection calls MongoIssueStore makes, served from a dict"""
+    
+    def __init__(self):
+        self.documents = {}
+        self.calls = Counter()
+    
+    async def create_index(self, *args, **kwargs):
+        pass
+    
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            await self.update_one(request._filter, request._doc, upsert=request._upsert)
+    
+    async def update_one(self, query, update, upsert=False):
+        key = tuple(query.items())
+        if key in self.documents:
+            self.documents[key].update(update['$set'])
+        elif upsert:
+            self.documents[key] = {**query, **update['$set']}
+    
+    async def delete_many(self, query):
+        stale = [key for key, document in self.documents.items() if matches(document, query)]
+        for key in stale:
+            del self.documents[key]
+        return SimpleNamespace(deleted_count=len(stale))
+    
+    async def find_one(self, query, projection=None):
+        self.calls['find_one'] += 1
+        return next((dict(document) for document in self.documents.values() if matches(document, query)), None)
+    
+    def find(self, query, projection=None):
+        return Cursor([document for document in self.documents.values() if matches(document, query)])
+    
+    def aggregate(self, pipeline, **kwargs):
+        documents = list(self.documents.values())
+        for stage in pipeline:
+            (operator, argument), = stage.items()
+            if operator == '$match':
+                documents = [document for document in documents if matches(document, argument)]
+            elif operator == '$sort':
+                documents = sort(documents, argument)
+            elif operator == '$group':
+                documents = group(documents, argument)
+            else:
+                raise NotImplementedError(operator)
+        return Cursor(documents)
+
+
+class MemoryDatabase:
+    def __init__(self):
+        self.collections = {}
+    
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, MemoryCollection())
+
+
+def plain(summary: pd.DataFrame) -> pd.DataFrame:
+    """A summary table with an object index and no categorical columns"""
+    summary = summary.set_axis(summary.index.astype(object))
+    return summary.astype({
+        column: object for column, dtype in summary.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)
+    })
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def store() -> MongoIssueStore:
+    return MongoIssueStore(MemoryDatabase(), batch_size=500)
+
+
+@pytest.fixture(scope='module')
+def installed(raw_df):
+    return DatasetStore().install(raw_df, 'upload', 'sprints.xlsx')
+
+
+def test_pipelines_match_the_aggregator(store, installed):
+    run(store.replace_dataset('team', installed))
+    
+    rollups = run(store.load_rollups('team'))
+    
+    assert rollups.df is None
+    assert rollups.version == installed.version
+    # The installed dataset keeps sprint names (and boards) categorical; Mongo returns strings
+    pd.testing.assert_frame_equal(plain(rollups.sprint_summary), plain(installed.sprint_summary), check_dtype=False)
+    pd.testing.assert_frame_equal(plain(rollups.assignee_summary), plain(installed.assignee_summary))
+    assert rollups.overall == installed.overall
+
+
+def test_replacing_a_dataset_removes_stale_rows(store, raw_df, installed):
+    run(store.replace_dataset('team', installed))
+    smaller = DatasetStore().install(raw_df.head(100), 'upload', 'sprints.xlsx')
+    
+    run(store.replace_dataset('team', smaller))
+    
+    assert len(store.issues.documents) == 100
+    assert run(store.load_rollups('team')).overall == smaller.overall
+    stored = run(store.load_frame('team'))
+    assert list(zip(stored['Jira ID'], stored['Assigned Sprint'])) == list(
+        zip(raw_df['Jira ID'].head(100), raw_df['Assigned Sprint'].head(100))
+    )
+
+
+def test_stored_version_is_reread_once_per_ttl(installed):
+    db = MemoryDatabase()
+    writer = MongoIssueStore(db)
+    reader = MongoIssueStore(db, metadata_ttl_seconds=3600)
+    run(writer.replace_dataset('team', installed))
+    
+    for _ in range(3):
+        assert run(reader.load_rollups('team')).version == installed.version
+    
+    assert store_reads(db) == 1
+    assert run(reader.load_rollups('other')) is None
+    assert run(reader.load_rollups('other')) is None
+    assert store_reads(db) == 2
+
+
+def test_expired_metadata_picks_up_another_workers_version(raw_df, installed):
+    db = MemoryDatabase()
+    reader = MongoIssueStore(db, metadata_ttl_seconds=0)
+    run(MongoIssueStore(db).replace_dataset('team', installed))
+    assert run(reader.load_rollups('team')).version == installed.version
+    
+    newer = DatasetStore().install(raw_df.head(100), 'upload', 'sprints.xlsx')
+    run(MongoIssueStore(db).replace_dataset('team', newer))
+    
+    assert run(reader.load_rollups('team')).version == newer.version
+
+
+def store_reads(db: MemoryDatabase) -> int:
+    return db['issue_datasets'].calls['find_one']
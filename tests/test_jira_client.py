@@ -0,0 +1,87 @@
+"""
+JiraAPIClient page iterators: every page is walked, and the next page is fetched ahead
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from jira_client import JiraAPIClient
+
+
+class PagedServer:
+    """Serves count items (boards, sprints or issues) in pages, recording each startAt"""
+    
+    def __init__(self, count: int, page_keys=('isLast',)):
+        self.count = count
+        self.page_keys = page_keys
+        self.starts = []
+    
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        start_at = int(request.url.params['startAt'])
+        max_results = int(request.url.params.get('maxResults', 50))
+        self.starts.append(start_at)
+        key = 'issues' if request.url.path.endswith('/issue') else 'values'
+        items = [{'id': n, 'key': f'ITEM-{n}', 'name': f'Item {n}'} for n in range(start_at, min(start_at + max_results, self.count))]
+        page = {key: items, 'startAt': start_at, 'maxResults': max_results}
+        if 'isLast' in self.page_keys:
+            page['isLast'] = start_at + max_results >= self.count
+        if 'total' in self.page_keys:
+            page['total'] = self.count
+        return httpx.Response(200, json=page)
+
+
+def client(server: PagedServer) -> JiraAPIClient:
+    return JiraAPIClient(
+        'https://jira.example.com', 'tests@example.com', 'token',
+        transport=httpx.MockTransport(server.handle), requests_per_second=1e6
+    )
+
+
+def collect(server: PagedServer, iterate) -> list:
+    async def run():
+        async with client(server) as jira:
+            return [item['id'] async for item in iterate(jira)]
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('count, starts', [(0, [0]), (50, [0]), (120, [0, 50, 100])])
+def test_every_board_page_is_walked(count, starts):
+    server = PagedServer(count)
+    
+    assert collect(server, lambda jira: jira.iter_boards()) == list(range(count))
+    assert server.starts == starts
+
+
+def test_every_sprint_page_is_walked():
+    server = PagedServer(75)
+    
+    assert collect(server, lambda jira: jira.iter_sprints(7)) == list(range(75))
+    assert server.starts == [0, 50]
+
+
+@pytest.mark.parametrize('page_keys', [('total',), ()])
+def test_issue_pages_end_without_is_last(page_keys):
+    # Issue pages carry total instead of isLast; without either a short page is the last one
+    server = PagedServer(250, page_keys)
+    
+    assert collect(server, lambda jira: jira.iter_sprint_issues(1)) == list(range(250))
+    assert server.starts == [0, 100, 200]
+
+
+def test_next_page_is_requested_while_the_current_one_is_consumed():
+    server = PagedServer(120)
+    
+    async def run():
+        async with client(server) as jira:
+            boards = jira.iter_boards()
+            await boards.__anext__()
+            # Let the prefetch reach the transport before the first page is used up
+            for _ in range(5):
+                await asyncio.sleep(0)
+            requested = list(server.starts)
+            await boards.aclose()
+            return requested
+    
+    assert asyncio.run(run()) == [0, 50]
@@ -0,0 +1,140 @@
+"""
+JiraClientPool: one client per credentials, cached credential checks, and idle clients closed unless a request is in flight
+"""
+
+import asyncio
+import base64
+
+import httpx
+
+from jira_client_pool import JiraClientPool
+
+JIRA_URL = 'https://jira.example.com'
+
+
+class Jira:
+    """Accepts the token 'good'; requests to /hold wait until released"""
+    
+    def __init__(self):
+        self.checks = 0
+        self.release = asyncio.Event()
+    
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/rest/api/3/myself':
+            self.checks += 1
+            credentials = base64.b64decode(request.headers['Authorization'].removeprefix('Basic ')).decode()
+            good = credentials.endswith(':good')
+            return httpx.Response(200 if good else 401, json={})
+        await self.release.wait()
+        return httpx.Response(200, json={})
+
+
+def pool(jira: Jira, **options) -> JiraClientPool:
+    return JiraClientPool(transport=httpx.MockTransport(jira.handle), requests_per_second=1e6, max_retries=0, **options)
+
+
+def test_same_credentials_share_one_client():
+    async def run():
+        clients = pool(Jira())
+        first = await clients.get(JIRA_URL, 'tests@example.com', 'good')
+        again = await clients.get(JIRA_URL + '/', 'tests@example.com', 'good')
+        other = await clients.get(JIRA_URL, 'other@example.com', 'good')
+        stats = clients.stats()
+        await clients.close_all()
+        return first, again, other, stats
+    
+    first, again, other, stats = asyncio.run(run())
+    
+    assert first is again
+    assert other is not first
+    assert stats['open_clients'] == 2
+    assert first.client.is_closed and other.client.is_closed
+
+
+def test_successful_check_is_reused_within_the_ttl():
+    async def run():
+        jira = Jira()
+        clients = pool(jira, validation_ttl_seconds=300)
+        results = [await clients.validate(JIRA_URL, 'tests@example.com', 'good') for _ in range(3)]
+        await clients.close_all()
+        return results, jira.checks
+    
+    assert asyncio.run(run()) == ([True] * 3, 1)
+
+
+def test_expired_check_authenticates_again():
+    async def run():
+        jira = Jira()
+        clients = pool(jira, validation_ttl_seconds=0)
+        results = [await clients.validate(JIRA_URL, 'tests@example.com', 'good') for _ in range(2)]
+        await clients.close_all()
+        return results, jira.checks
+    
+    assert asyncio.run(run()) == ([True] * 2, 2)
+
+
+def test_invalid_credentials_are_not_cached_and_drop_the_client():
+    async def run():
+        jira = Jira()
+        clients = pool(jira)
+        results = [await clients.validate(JIRA_URL, 'tests@example.com', 'bad') for _ in range(2)]
+        return results, jira.checks, clients.peek(JIRA_URL, 'tests@example.com', 'bad')
+    
+    assert asyncio.run(run()) == ([False] * 2, 2, None)
+
+
+def test_idle_clients_are_closed_when_another_is_handed_out():
+    async def run():
+        clients = pool(Jira(), idle_timeout_seconds=0)
+        idle = await clients.get(JIRA_URL, 'tests@example.com', 'good')
+        await clients.validate(JIRA_URL, 'tests@example.com', 'good')
+        await clients.get(JIRA_URL, 'other@example.com', 'good')
+        stats = clients.stats()
+        await clients.close_all()
+        return idle, stats, clients.peek(JIRA_URL, 'tests@example.com', 'good')
+    
+    idle, stats, kept = asyncio.run(run())
+    
+    assert idle.client.is_closed
+    assert kept is None
+    assert stats == {'open_clients': 1, 'validated_credentials': 0}
+
+
+def test_client_with_a_request_in_flight_is_kept():
+    async def run():
+        jira = Jira()
+        clients = pool(jira, idle_timeout_seconds=0)
+        busy = await clients.get(JIRA_URL, 'tests@example.com', 'good')
+        request = asyncio.create_task(busy._make_request('GET', '/hold'))
+        await asyncio.sleep(0.01)
+        
+        await clients.get(JIRA_URL, 'other@example.com', 'good')
+        kept = clients.peek(JIRA_URL, 'tests@example.com', 'good')
+        
+        jira.release.set()
+        await request
+        await clients.get(JIRA_URL, 'other@example.com', 'good')
+        closed = clients.peek(JIRA_URL, 'tests@example.com', 'good')
+        await clients.close_all()
+        return busy, kept, closed
+    
+    busy, kept, closed = asyncio.run(run())
+    
+    assert kept is busy
+    assert closed is None
+
+
+def test_closed_client_is_reopened_when_handed_out_again():
+    async def run():
+        clients = pool(Jira())
+        client = await clients.get(JIRA_URL, 'tests@example.com', 'good')
+        await client.close()
+        again = await clients.get(JIRA_URL, 'tests@example.com', 'good')
+        is_open = not again.client.is_closed
+        await clients.close_all()
+        return client, again, is_open
+    
+    client, again, is_open = asyncio.run(run())
+    
+    assert again is client
+    assert is_open
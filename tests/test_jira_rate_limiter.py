@@ -0,0 +1,191 @@
+"""
+RateLimiter adapting to Jira's throttling, and JiraAPIClient retrying only retryable failures
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from jira_client import JiraAPIClient
+from jira_rate_limiter import RateLimiter
+
+
+def test_429_halves_the_rate_and_pauses_for_retry_after():
+    limiter = RateLimiter(max_rate=40)
+    
+    limiter.observe(429, {'retry-after': '2'})
+    
+    stats = limiter.stats()
+    assert limiter.rate == 20
+    assert stats['throttled_responses'] == 1
+    assert 1.9 < stats['paused_seconds_remaining'] <= 2
+
+
+def test_throttled_burst_halves_the_rate_once():
+    limiter = RateLimiter(max_rate=40)
+    
+    for _ in range(8):
+        limiter.observe(429, {'retry-after': '1'})
+    
+    assert limiter.rate == 20
+
+
+def test_rate_never_drops_below_the_minimum():
+    limiter = RateLimiter(max_rate=1, min_rate=0.5)
+    
+    for _ in range(3):
+        limiter._last_decrease = 0.0
+        limiter.observe(429, {'retry-after': '0'})
+    
+    assert limiter.rate == 0.5
+
+
+@pytest.mark.parametrize('value, seconds', [('3', 3), ('1.5', 1.5), ('-4', 0), ('soon', None), ('', None)])
+def test_retry_after_seconds(value, seconds):
+    assert RateLimiter().retry_after({'retry-after': value}) == seconds
+
+
+def test_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    
+    seconds = RateLimiter().retry_after({'retry-after': format_datetime(retry_at, usegmt=True)})
+    
+    assert 28 < seconds <= 30
+
+
+def test_successes_raise_the_rate_back_additively():
+    limiter = RateLimiter(max_rate=40, increase_step=5)
+    limiter.observe(429, {'retry-after': '0'})
+    
+    rates = []
+    for _ in range(5):
+        limiter.observe(200, {})
+        rates.append(limiter.rate)
+    
+    assert rates == [25, 30, 35, 40, 40]
+
+
+def test_near_limit_warning_slows_down_without_pausing():
+    limiter = RateLimiter(max_rate=40)
+    
+    limiter.observe(200, {'x-ratelimit-nearlimit': 'true'})
+    
+    assert limiter.rate == 20
+    assert limiter.stats()['paused_seconds_remaining'] == 0
+
+
+def test_exhausted_remaining_pauses_until_reset():
+    limiter = RateLimiter(max_rate=40)
+    reset = (datetime.now(timezone.utc) + timedelta(seconds=5)).isoformat().replace('+00:00', 'Z')
+    
+    limiter.observe(200, {'x-ratelimit-remaining': '0', 'x-ratelimit-reset': reset})
+    
+    assert 4 < limiter.stats()['paused_seconds_remaining'] <= 5
+
+
+def test_advertised_fill_rate_caps_the_rate():
+    limiter = RateLimiter(max_rate=40)
+    
+    limiter.observe(200, {'x-ratelimit-fillrate': '10', 'x-ratelimit-interval-seconds': '1'})
+    
+    assert limiter.max_rate == limiter.rate == 10
+
+
+def test_tokens_pace_requests_after_the_burst():
+    async def run():
+        limiter = RateLimiter(max_rate=50, burst=2)
+        started = time.perf_counter()
+        for _ in range(7):
+            await limiter.acquire()
+        return time.perf_counter() - started, limiter.stats()
+    
+    elapsed, stats = asyncio.run(run())
+    
+    # Two tokens up front, then five more at 50 per second
+    assert elapsed >= 0.09
+    assert stats['requests'] == 7
+    assert stats['throttled_seconds'] >= 0.09
+
+
+def test_acquire_waits_out_a_pause():
+    async def run():
+        limiter = RateLimiter(max_rate=50)
+        limiter.observe(429, {'retry-after': '0.1'})
+        started = time.perf_counter()
+        await limiter.acquire()
+        return time.perf_counter() - started
+    
+    assert asyncio.run(run()) >= 0.09
+
+
+class Responses:
+    """Answers each request with the next scripted response (or raises it)"""
+    
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = 0
+    
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def request(responses: Responses, max_retries: int = 4):
+    async def run():
+        async with JiraAPIClient(
+            'https://jira.example.com', 'tests@example.com', 'token',
+            transport=httpx.MockTransport(responses.handle), max_retries=max_retries
+        ) as client:
+            client.rate_limiter.backoff_base = 0.001
+            return await client.get_boards(), client.rate_limiter.stats()
+    return asyncio.run(run())
+
+
+def test_server_errors_and_network_failures_are_retried():
+    responses = Responses(
+        httpx.Response(503), httpx.ConnectError('reset'), httpx.Response(200, json={'values': [{'id': 1}]})
+    )
+    
+    body, stats = request(responses)
+    
+    assert body == {'values': [{'id': 1}]}
+    assert responses.requests == 3
+    assert stats['retries'] == 2
+
+
+def test_429_is_retried_after_retry_after():
+    responses = Responses(httpx.Response(429, headers={'Retry-After': '0.1'}), httpx.Response(200, json={}))
+    
+    started = time.perf_counter()
+    body, stats = request(responses)
+    
+    assert time.perf_counter() - started >= 0.09
+    assert responses.requests == 2
+    assert stats['throttled_responses'] == 1
+    assert stats['backoff_seconds'] == 0
+
+
+@pytest.mark.parametrize('status', [400, 401, 404])
+def test_client_errors_fail_without_retrying(status):
+    responses = Responses(httpx.Response(status), httpx.Response(200, json={}))
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        request(responses)
+    
+    assert responses.requests == 1
+
+
+def test_retries_stop_at_max_retries():
+    responses = Responses(*[httpx.Response(502)] * 3)
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        request(responses, max_retries=2)
+    
+    assert responses.requests == 3
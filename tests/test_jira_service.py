@@ -0,0 +1,273 @@
+"""
+JiraService fetches against MockJiraServer (bounded concurrency, row order,
+failure isolation and bulk JQL searches) and incremental syncs of updated issues
+"""
+
+import asyncio
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import httpx
+import pandas as pd
+import pytest
+
+from jira_client import JiraAPIClient
+from jira_service import JiraService
+from synthetic_data import MockJiraServer, SyntheticJiraDataset
+
+
+class Recorder:
+    """
+    Wraps MockJiraServer.handle: random latency, injected errors, the peak of
+    concurrent requests and the JQL of every search
+    """
+    
+    def __init__(self, mock: MockJiraServer, max_latency: float = 0.0, errors=None, seed: int = 0):
+        self.mock = mock
+        self.max_latency = max_latency
+        self.errors = errors or {}
+        self.random = random.Random(seed)
+        self.paths = []
+        self.searches = []
+        self.in_flight = 0
+        self.peak = 0
+    
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        if request.url.params.get('startAt', '0') == '0' and 'jql' in request.url.params:
+            self.searches.append(request.url.params['jql'])
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.max_latency:
+                await asyncio.sleep(self.random.uniform(0, self.max_latency))
+            if request.url.path in self.errors:
+                return httpx.Response(self.errors[request.url.path], json={'errorMessages': ['injected']})
+            return await self.mock.handle(request)
+        finally:
+            self.in_flight -= 1
+
+
+def fetch(handler, strategy: str = 'sprint', max_concurrency: int = 16, **service_options) -> pd.DataFrame:
+    async def run():
+        async with JiraAPIClient(
+            'https://jira.example.com', 'tests@example.com', 'token',
+            transport=httpx.MockTransport(handler), requests_per_second=1e6,
+            max_concurrency=max_concurrency, max_retries=0
+        ) as client:
+            return await JiraService(client, fetch_strategy=strategy, **service_options).fetch_all_data()
+    return asyncio.run(run())
+
+
+@pytest.fixture(scope='module')
+def small_dataset(now) -> SyntheticJiraDataset:
+    return SyntheticJiraDataset(rows=800, sprints=12, boards=3, seed=1, now=now.tz_localize(None))
+
+
+@pytest.fixture(scope='module')
+def mock(small_dataset) -> MockJiraServer:
+    return MockJiraServer(small_dataset)
+
+
+@pytest.fixture(scope='module')
+def expected(mock) -> pd.DataFrame:
+    return fetch(mock.handle)
+
+
+def sprint_path(sprint_id: int) -> str:
+    return f'/rest/agile/1.0/sprint/{sprint_id}/issue'
+
+
+@pytest.mark.parametrize('max_concurrency', [1, 4])
+def test_requests_in_flight_are_bounded(mock, max_concurrency):
+    recorder = Recorder(mock, max_latency=0.005)
+    
+    fetch(recorder.handle, max_concurrency=max_concurrency)
+    
+    assert recorder.peak == max_concurrency
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_row_order_does_not_depend_on_response_order(mock, expected, seed):
+    recorder = Recorder(mock, max_latency=0.01, seed=seed)
+    
+    pd.testing.assert_frame_equal(fetch(recorder.handle), expected)
+
+
+def test_failing_sprint_only_drops_its_rows(mock, expected, small_dataset):
+    failing = small_dataset.sprint_table().iloc[4]
+    
+    df = fetch(Recorder(mock, errors={sprint_path(failing['id']): 404}).handle)
+    
+    pd.testing.assert_frame_equal(df, expected[expected['Assigned Sprint'] != failing['name']].reset_index(drop=True))
+
+
+def test_failing_board_only_drops_its_sprints(mock, expected):
+    df = fetch(Recorder(mock, errors={'/rest/agile/1.0/board/2/sprint': 404}).handle)
+    
+    pd.testing.assert_frame_equal(df, expected[expected['Board'] != '2'].reset_index(drop=True))
+
+
+def test_failing_board_listing_fails_the_fetch(mock):
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(Recorder(mock, errors={'/rest/agile/1.0/board': 500}).handle)
+
+
+def listed_sprint_ids(small_dataset) -> list:
+    """Sprint IDs in the order JiraService lists them: board by board"""
+    sprints = small_dataset.sprint_table()
+    return [sprint_id for board in sorted(sprints['board'].unique()) for sprint_id in sprints[sprints['board'] == board]['id']]
+
+
+@pytest.mark.parametrize('chunk', [1, 5, 50])
+def test_jql_searches_sprints_in_chunks(mock, expected, small_dataset, chunk):
+    recorder = Recorder(mock)
+    
+    df = fetch(recorder.handle, 'jql', jql_sprint_chunk=chunk)
+    
+    sprint_ids = listed_sprint_ids(small_dataset)
+    chunks = [sprint_ids[i:i + chunk] for i in range(0, len(sprint_ids), chunk)]
+    assert sorted(recorder.searches) == sorted(
+        f"sprint in ({', '.join(map(str, ids))}) ORDER BY Rank ASC" for ids in chunks
+    )
+    assert len(recorder.searches) == math.ceil(len(sprint_ids) / chunk)
+    assert not any(path.endswith('/issue') for path in recorder.paths)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize('threshold, uses_jql', [(12, True), (13, False)])
+def test_auto_switches_to_jql_at_the_sprint_threshold(mock, expected, threshold, uses_jql):
+    recorder = Recorder(mock)
+    
+    df = fetch(recorder.handle, 'auto', jql_sprint_threshold=threshold)
+    
+    assert bool(recorder.searches) is uses_jql
+    assert any(path.endswith('/issue') for path in recorder.paths) is not uses_jql
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_failing_jql_chunk_only_drops_its_sprints(mock, expected, small_dataset):
+    sprints = small_dataset.sprint_table().set_index('id')['name']
+    failing = listed_sprint_ids(small_dataset)[:5]
+    
+    async def handle(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get('jql', '').startswith(f'sprint in ({failing[0]}, '):
+            return httpx.Response(500, json={'errorMessages': ['injected']})
+        return await mock.handle(request)
+    
+    df = fetch(handle, 'jql', jql_sprint_chunk=5)
+    
+    kept = ~expected['Assigned Sprint'].isin(sprints[failing])
+    assert not kept.all()
+    pd.testing.assert_frame_equal(df, expected[kept].reset_index(drop=True))
+
+
+
+def issue(key: str, *sprints: tuple) -> dict:
+    """A search result in the sprints given as (id, name, board)"""
+    return {'key': key, 'fields': {
+        'summary': key, 'status': {'name': 'Done'}, 'customfield_10016': 3,
+        'customfield_10020': [{'id': sprint_id, 'name': name, 'originBoardId': board} for sprint_id, name, board in sprints]
+    }}
+
+
+class UpdatedIssues:
+    """Serves two boards and a fixed JQL search result, recording the JQL"""
+    
+    def __init__(self, boards, issues):
+        self.boards = boards
+        self.issues = issues
+        self.jql = []
+    
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/rest/agile/1.0/board':
+            return httpx.Response(200, json={'values': self.boards, 'isLast': True})
+        self.jql.append(request.url.params['jql'])
+        return httpx.Response(200, json={'issues': self.issues, 'startAt': 0, 'maxResults': 100, 'total': len(self.issues)})
+
+
+def fetch_updated(handler, since):
+    async def run():
+        async with JiraAPIClient(
+            'https://jira.example.com', 'tests@example.com', 'token',
+            transport=httpx.MockTransport(handler), requests_per_second=1e6
+        ) as client:
+            return await JiraService(client).fetch_updated_since(since)
+    return asyncio.run(run())
+
+
+PROJECT_BOARDS = [
+    {'id': 1, 'name': 'Alpha', 'location': {'projectKey': 'ALPHA'}},
+    {'id': 2, 'name': 'Beta', 'location': {'projectKey': 'BETA'}}
+]
+
+
+def test_updates_are_searched_in_the_boards_projects():
+    server = UpdatedIssues(PROJECT_BOARDS, [
+        issue('ALPHA-1', (10, 'Alpha 1', 1), (11, 'Alpha 2', 1)),
+        issue('BETA-1', (20, 'Beta 1', 2), (90, 'Other team 1', 9)),
+        issue('ALPHA-2')
+    ])
+    since = datetime.now(timezone.utc) - timedelta(minutes=90)
+    
+    updates, updated_keys = fetch_updated(server.handle, since)
+    
+    assert server.jql == ['project in ("ALPHA", "BETA") AND updated >= -91m ORDER BY key']
+    assert updated_keys == ['ALPHA-1', 'BETA-1', 'ALPHA-2']
+    # One row per sprint of a listed board; ALPHA-2 left every sprint
+    assert list(zip(updates['Jira ID'], updates['Assigned Sprint'])) == [
+        ('ALPHA-1', 'Alpha 1'), ('ALPHA-1', 'Alpha 2'), ('BETA-1', 'Beta 1')
+    ]
+
+
+def test_boards_without_a_project_search_everywhere():
+    server = UpdatedIssues([PROJECT_BOARDS[0], {'id': 3, 'name': 'Cross-project'}], [])
+    
+    fetch_updated(server.handle, datetime.now(timezone.utc) - timedelta(minutes=5))
+    
+    assert server.jql == ['updated >= -6m ORDER BY key']
+
+
+def test_no_boards_means_no_search():
+    server = UpdatedIssues([], [issue('ALPHA-1', (10, 'Alpha 1', 1))])
+    
+    updates, updated_keys = fetch_updated(server.handle, datetime.now(timezone.utc))
+    
+    assert updates.empty and updated_keys == []
+    assert server.jql == []
+
+
+def test_merge_replaces_every_row_of_updated_issues():
+    service = JiraService(client=None)
+    df = pd.DataFrame({
+        'Jira ID': ['A-1', 'A-1', 'A-2', 'A-3'],
+        'Assigned Sprint': ['S1', 'S2', 'S1', 'S2'],
+        'Status': ['To Do', 'To Do', 'Done', 'To Do']
+    })
+    updates = pd.DataFrame({'Jira ID': ['A-1'], 'Assigned Sprint': ['S2'], 'Status': ['Done']})
+    
+    merged = service.merge_updates(df, updates, ['A-1', 'A-3'])
+    
+    # A-1 now only has its S2 row; A-3 left every sprint
+    assert merged.to_dict('records') == [
+        {'Jira ID': 'A-2', 'Assigned Sprint': 'S1', 'Status': 'Done'},
+        {'Jira ID': 'A-1', 'Assigned Sprint': 'S2', 'Status': 'Done'}
+    ]
+    assert service.merge_updates(df, pd.DataFrame(), []).equals(df)
+
+
+@pytest.mark.parametrize('dataset, connection, incremental', [
+    ({'source': 'jira', 'key': 'c1'}, {'last_synced_at': '2026-03-04T11:00:00+00:00', 'last_full_sync_at': '2026-03-04T06:00:00+00:00'}, True),
+    # A full sync is due
+    ({'source': 'jira', 'key': 'c1'}, {'last_synced_at': '2026-03-04T11:00:00+00:00', 'last_full_sync_at': '2026-03-03T06:00:00+00:00'}, False),
+    # Never synced, another connection's dataset, or an upload
+    ({'source': 'jira', 'key': 'c1'}, {'last_synced_at': None, 'last_full_sync_at': None}, False),
+    ({'source': 'jira', 'key': 'c2'}, {'last_synced_at': '2026-03-04T11:00:00+00:00', 'last_full_sync_at': '2026-03-04T06:00:00+00:00'}, False),
+    ({'source': 'upload', 'key': 'c1'}, {'last_synced_at': '2026-03-04T11:00:00+00:00', 'last_full_sync_at': '2026-03-04T06:00:00+00:00'}, False)
+])
+def test_refresh_is_incremental_between_full_syncs(server, now, dataset, connection, incremental):
+    connection = {'id': 'c1', **connection}
+    
+    assert server.can_sync_incrementally(SimpleNamespace(**dataset), connection, now.to_pydatetime()) is incremental
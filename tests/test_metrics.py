@@ -0,0 +1,118 @@
+"""
+/metrics exposition, stage timers, per-route request latency and opt-in request profiling
+"""
+
+import pstats
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
+
+from metrics import REGISTRY, MetricsMiddleware, RequestProfiler, stage_timer
+
+
+def samples(response) -> dict:
+    """(metric sample name, sorted labels) -> value of a /metrics response"""
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+    }
+
+
+def request_count(route: str, status: str = '200') -> float:
+    labels = {'method': 'GET', 'route': route, 'status': status}
+    return REGISTRY.get_sample_value('sprint_analytics_http_request_seconds_count', labels) or 0
+
+
+def profiled_app(profiler: RequestProfiler) -> TestClient:
+    app = FastAPI()
+    
+    @app.get('/items/{item_id}')
+    def get_item(item_id: str):
+        return {'id': item_id, 'total': sum(range(1000))}
+    
+    app.add_middleware(MetricsMiddleware, profiler=profiler)
+    return TestClient(app)
+
+
+def test_metrics_endpoint_exposes_the_app_metrics(client, raw_df):
+    response = client.get('/metrics')
+    
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain')
+    values = samples(response)
+    assert values[('sprint_analytics_dataset_rows', (('workspace', 'default'),))] == len(raw_df)
+    assert values[('sprint_analytics_datasets_memory_bytes', ())] > 0
+    assert ('sprint_analytics_compute_pool_tasks', (('state', 'queued'),)) in values
+    for stage in ('upload.parse', 'upload.install', 'upload.publish'):
+        assert values[('sprint_analytics_stage_seconds_count', (('stage', stage),))] >= 1
+    # A registry of its own: no process or GC collectors
+    assert not any(name.startswith(('process_', 'python_gc_')) for name, _ in values)
+
+
+def test_requests_are_timed_under_their_route_template(client):
+    route = '/api/delay-predictions/{sprint_name}'
+    before = request_count(route)
+    
+    client.get('/api/delay-predictions/Sprint 1')
+    client.get('/api/delay-predictions/Sprint 2')
+    
+    assert request_count(route) == before + 2
+
+
+def test_unknown_paths_share_one_series(client):
+    before = request_count('unmatched', '404')
+    
+    client.get('/api/no-such-endpoint')
+    client.get('/api/another-missing-one')
+    
+    assert request_count('unmatched', '404') == before + 2
+
+
+def test_stage_timer_records_a_duration():
+    labels = {'stage': 'tests.stage'}
+    before = REGISTRY.get_sample_value('sprint_analytics_stage_seconds_count', labels) or 0
+    
+    with stage_timer('tests.stage'):
+        pass
+    
+    assert REGISTRY.get_sample_value('sprint_analytics_stage_seconds_count', labels) == before + 1
+
+
+@pytest.mark.parametrize('opt_in', [{'params': {'profile': '1'}}, {'params': {'profile': 'true'}}, {'headers': {'X-Profile': '1'}}])
+def test_opted_in_request_is_profiled_to_a_file(tmp_path, opt_in):
+    client = profiled_app(RequestProfiler(enabled=True, output_dir=tmp_path))
+    
+    response = client.get('/items/SPR-1', **opt_in)
+    
+    assert response.status_code == 200
+    profile = response.headers['X-Profile-File']
+    assert profile.startswith(str(tmp_path)) and profile.endswith('items_SPR-1.prof')
+    assert pstats.Stats(profile).total_calls > 0
+
+
+@pytest.mark.parametrize('enabled, opt_in', [(True, {}), (True, {'params': {'noprofile': '1'}}), (False, {'params': {'profile': '1'}})])
+def test_other_requests_are_not_profiled(tmp_path, enabled, opt_in):
+    client = profiled_app(RequestProfiler(enabled=enabled, output_dir=tmp_path))
+    
+    response = client.get('/items/SPR-1', **opt_in)
+    
+    assert response.status_code == 200
+    assert 'X-Profile-File' not in response.headers
+    assert not list(tmp_path.iterdir())
+
+
+def test_one_request_is_profiled_at_a_time(tmp_path):
+    profiler = RequestProfiler(enabled=True, output_dir=tmp_path)
+    running = profiler.start()
+    
+    try:
+        assert profiler.start() is None
+    finally:
+        profiler.finish(running, 'tests')
+    
+    again = profiler.start()
+    assert again is not None
+    profiler.finish(again, 'tests')
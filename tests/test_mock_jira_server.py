@@ -0,0 +1,88 @@
+"""
+JiraService fetches served by MockJiraServer: row order, pagination and latency
+"""
+
+import asyncio
+import math
+import time
+
+import pandas as pd
+import pytest
+
+from jira_client import JiraAPIClient
+from jira_service import JiraService
+from sprint_aggregator import BACKLOG_SPRINT
+from synthetic_data import MockJiraServer, SyntheticJiraDataset
+
+
+def fetch(mock: MockJiraServer, strategy: str = 'sprint', max_concurrency: int = 16) -> pd.DataFrame:
+    async def run():
+        async with JiraAPIClient(
+            'https://jira.example.com', 'tests@example.com', 'token',
+            transport=mock.transport(), requests_per_second=1e6, max_concurrency=max_concurrency
+        ) as client:
+            return await JiraService(client, fetch_strategy=strategy, jql_sprint_chunk=7).fetch_all_data()
+    return asyncio.run(run())
+
+
+def sprint_rows(df: pd.DataFrame) -> list:
+    """(issue, sprint) pairs of every row in a sprint"""
+    in_sprint = df[df['Assigned Sprint'] != BACKLOG_SPRINT]
+    return sorted(zip(in_sprint['Jira ID'], in_sprint['Assigned Sprint']))
+
+
+@pytest.fixture(scope='module')
+def mock(dataset) -> MockJiraServer:
+    return MockJiraServer(dataset)
+
+
+def test_fetch_returns_every_sprint_row(mock):
+    df = fetch(mock)
+    
+    assert sprint_rows(df) == sprint_rows(mock.df)
+
+
+@pytest.mark.parametrize('strategy', ['jql', 'auto'])
+def test_strategies_fetch_the_same_frame(mock, strategy):
+    pd.testing.assert_frame_equal(fetch(mock, strategy), fetch(mock, 'sprint'))
+
+
+def test_rows_follow_board_then_sprint_order(mock, dataset):
+    df = fetch(mock)
+    
+    sprints = dataset.sprint_table().sort_values(['board', 'id'])
+    listed = list(dict.fromkeys(df['Assigned Sprint']))
+    assert listed == [name for name in sprints['name'] if name in set(listed)]
+
+
+@pytest.mark.parametrize('boards, sprints, rows', [
+    (60, 60, 12000),  # two pages of boards
+    (1, 120, 30000)  # three pages of sprints
+])
+def test_every_page_is_requested(boards, sprints, rows):
+    dataset = SyntheticJiraDataset(rows=rows, sprints=sprints, boards=boards, seed=3)
+    mock = MockJiraServer(dataset)
+    
+    df = fetch(mock)
+    
+    sprint_table = dataset.sprint_table()
+    issues_per_sprint = mock.df['Assigned Sprint'].value_counts()
+    board_pages = math.ceil(boards / 50)
+    sprint_pages = sum(math.ceil(count / 50) for count in sprint_table.groupby('board').size())
+    issue_pages = sum(max(1, math.ceil(issues_per_sprint.get(name, 0) / 100)) for name in sprint_table['name'])
+    assert issues_per_sprint.drop(BACKLOG_SPRINT).max() > 100
+    assert mock.requests == board_pages + sprint_pages + issue_pages
+    assert sprint_rows(df) == sprint_rows(mock.df)
+
+
+def test_latency_is_overlapped(dataset):
+    latency = 0.1
+    mock = MockJiraServer(dataset, latency_seconds=latency)
+    
+    started = time.perf_counter()
+    fetch(mock, max_concurrency=16)
+    elapsed = time.perf_counter() - started
+    
+    # Boards, then sprints, then issues: at least three round trips, far fewer than one per request
+    assert elapsed >= 3 * latency
+    assert elapsed < mock.requests * latency / 2
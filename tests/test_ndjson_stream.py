@@ -0,0 +1,93 @@
+"""
+NDJSON streaming of /sprints and /delay-predictions, and NDJSONStreamer batching
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from ndjson_stream import NDJSON_MEDIA_TYPE, NDJSONStreamer
+
+LISTINGS = ['/api/sprints', '/api/delay-predictions']
+
+
+def lines(response) -> list:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.mark.parametrize('path', LISTINGS)
+@pytest.mark.parametrize('opt_in', [{'headers': {'Accept': NDJSON_MEDIA_TYPE}}, {'params': {'stream': 'ndjson'}}])
+def test_stream_matches_json_listing(client, path, opt_in):
+    response = client.get(path, **opt_in)
+    
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == NDJSON_MEDIA_TYPE
+    assert response.headers['Vary'].startswith('Accept')
+    assert response.text.endswith('\n')
+    assert lines(response) == client.get(path).json()
+
+
+@pytest.mark.parametrize('path', LISTINGS)
+def test_stream_of_a_page_keeps_paging_headers(client, path):
+    page = client.get(path, params={'limit': 4, 'sort': 'sprint_name'})
+    
+    response = client.get(path, params={'limit': 4, 'sort': 'sprint_name'}, headers={'Accept': NDJSON_MEDIA_TYPE})
+    
+    assert lines(response) == page.json()
+    assert response.headers['X-Total-Count'] == page.headers['X-Total-Count']
+    assert response.headers['X-Next-Cursor'] == page.headers['X-Next-Cursor']
+
+
+def test_compressed_stream_decodes_to_the_same_lines(client):
+    plain = client.get('/api/sprints', headers={'Accept': NDJSON_MEDIA_TYPE, 'Accept-Encoding': 'identity'})
+    
+    compressed = client.get('/api/sprints', headers={'Accept': NDJSON_MEDIA_TYPE, 'Accept-Encoding': 'gzip'})
+    
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert lines(compressed) == lines(plain)
+
+
+async def to_thread(func, *args):
+    return await asyncio.to_thread(func, *args)
+
+
+def collect(streamer: NDJSONStreamer, items) -> list:
+    """The body chunks of a streamed response"""
+    async def run():
+        return [chunk async for chunk in streamer.response(items).body_iterator]
+    return asyncio.run(run())
+
+
+def test_items_are_encoded_in_batches():
+    chunks = collect(NDJSONStreamer(to_thread, batch_size=2), iter([{'n': n} for n in range(5)]))
+    
+    assert chunks == [b'{"n":0}\n{"n":1}\n', b'{"n":2}\n{"n":3}\n', b'{"n":4}\n']
+
+
+def test_items_are_pulled_as_the_stream_reaches_them():
+    pulled = []
+    
+    def items():
+        for n in range(6):
+            pulled.append(n)
+            yield {'n': n}
+    
+    async def first_chunk():
+        body = NDJSONStreamer(to_thread, batch_size=2).response(items()).body_iterator
+        chunk = await body.__anext__()
+        await body.aclose()
+        return chunk
+    
+    assert asyncio.run(first_chunk()) == b'{"n":0}\n{"n":1}\n'
+    assert pulled == [0, 1]
+
+
+def test_failing_item_ends_the_stream_with_an_error_line():
+    def items():
+        yield {'n': 0}
+        raise ValueError('sprint has no dates')
+    
+    chunks = collect(NDJSONStreamer(to_thread, batch_size=10), items())
+    
+    assert b''.join(chunks).splitlines() == [b'{"n":0}', b'{"error":"sprint has no dates"}']
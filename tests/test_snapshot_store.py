@@ -0,0 +1,96 @@
+"""
+SnapshotStore round trips, per-workspace lookup and retention, and the server reloading an evicted dataset
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from dataset_store import DatasetStore
+from snapshot_store import SnapshotStore
+
+
+@pytest.fixture(scope='module')
+def installed(raw_df):
+    return DatasetStore().install(raw_df, 'upload', 'upload-1')
+
+
+@pytest.fixture
+def store(tmp_path) -> SnapshotStore:
+    return SnapshotStore(tmp_path / 'snapshots', retention=2)
+
+
+def save(store: SnapshotStore, workspace: str, key: str, df: pd.DataFrame, mtime: float):
+    """Save a snapshot and date it mtime, so snapshots written in the same instant still have an order"""
+    path = store.save(workspace, key, df, 'upload')
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_round_trip_keeps_the_compact_frame(store, installed):
+    store.save('team', 'upload-1', installed.df, 'upload')
+    
+    df, metadata = store.load_latest('team')
+    
+    pd.testing.assert_frame_equal(df, installed.df)
+    assert {key: metadata[key] for key in ('workspace', 'key', 'source')} == {
+        'workspace': 'team', 'key': 'upload-1', 'source': 'upload'
+    }
+    assert metadata['created_at']
+
+
+def test_latest_snapshot_of_each_workspace(store, raw_df):
+    save(store, 'alpha', 'a1', raw_df.head(10), 1_000)
+    save(store, 'beta', 'b1', raw_df.head(20), 2_000)
+    save(store, 'alpha', 'a2', raw_df.head(30), 3_000)
+    
+    assert store.load_latest('alpha')[1]['key'] == 'a2'
+    assert len(store.load_latest('beta')[0]) == 20
+    assert store.load_latest()[1]['key'] == 'a2'
+    assert store.load_latest('gamma') is None
+
+
+def test_retention_keeps_the_most_recent_snapshots_per_workspace(store, raw_df):
+    for n in range(4):
+        save(store, 'alpha', f'a{n}', raw_df.head(5), 1_000 + n)
+    save(store, 'beta', 'b0', raw_df.head(5), 500)
+    
+    assert [path.stem for path in store._snapshots('alpha')] == ['a3', 'a2']
+    assert [path.stem for path in store._snapshots('beta')] == ['b0']
+
+
+def test_saving_a_key_again_replaces_its_snapshot(store, raw_df):
+    save(store, 'alpha', 'a1', raw_df.head(5), 1_000)
+    save(store, 'alpha', 'a1', raw_df.head(8), 2_000)
+    
+    assert len(store._snapshots('alpha')) == 1
+    assert len(store.load_latest('alpha')[0]) == 8
+    assert not list(store.directory.glob('*/*.tmp'))
+
+
+def test_unreadable_snapshot_falls_back_to_the_previous_one(store, raw_df):
+    save(store, 'alpha', 'a1', raw_df.head(5), 1_000)
+    torn = save(store, 'alpha', 'a2', raw_df.head(5), 2_000)
+    torn.write_bytes(b'not arrow')
+    os.utime(torn, (2_000, 2_000))
+    
+    assert store.load_latest('alpha')[1]['key'] == 'a1'
+
+
+def test_names_are_made_safe_for_the_filesystem(store, raw_df):
+    path = store.save('../team', 'jira/conn 1', raw_df.head(5), 'jira')
+    
+    assert path.parent.parent == store.directory
+    assert path.name == 'jira_conn_1.arrow'
+    assert store.load_latest('../team')[1]['source'] == 'jira'
+
+
+def test_evicted_workspace_is_reloaded_from_its_snapshot(server, client):
+    before = client.get('/api/sprints').json()
+    version = server.datasets.get(server.DEFAULT_WORKSPACE).version
+    
+    server.datasets.remove(server.DEFAULT_WORKSPACE)
+    
+    assert client.get('/api/sprints').json() == before
+    assert server.datasets.get(server.DEFAULT_WORKSPACE).version != version
@@ -0,0 +1,138 @@
+"""
+Sprint rollups served from SprintAggregator, checked against the per-sprint
+loops /sprints, /dashboard and /team-performance used to run on every request
+"""
+
+import io
+
+import pandas as pd
+import pytest
+
+from sprint_aggregator import BACKLOG_SPRINT, SprintAggregator
+
+
+def baseline_sprints(df: pd.DataFrame, now: pd.Timestamp):
+    sprints_data = []
+    for sprint in df['Assigned Sprint'].dropna().unique():
+        if sprint == BACKLOG_SPRINT:
+            continue
+        sprint_df = df[df['Assigned Sprint'] == sprint]
+        total_story_points = sprint_df['Story Points'].sum()
+        completed_points = sprint_df[sprint_df['Status'] == 'Done']['Story Points'].sum()
+        completion_pct = (completed_points / total_story_points * 100) if total_story_points > 0 else 0
+        
+        start_date = sprint_df['Assigned Sprint\nStart date'].iloc[0]
+        end_date = sprint_df['Assigned Sprint\nEnd date'].iloc[0]
+        days_remaining = days_elapsed = None
+        if pd.notna(end_date) and pd.notna(start_date):
+            days_remaining = (pd.to_datetime(end_date) - now).days
+            days_elapsed = (now - pd.to_datetime(start_date)).days
+        
+        risk_level = "low"
+        if completion_pct < 30:
+            risk_level = "critical"
+        elif completion_pct < 50:
+            risk_level = "high"
+        elif completion_pct < 70:
+            risk_level = "medium"
+        if days_remaining is not None and days_remaining < 3 and completion_pct < 80:
+            risk_level = "critical"
+        
+        sprints_data.append({
+            'sprint_name': sprint,
+            'start_date': str(start_date) if pd.notna(start_date) else None,
+            'end_date': str(end_date) if pd.notna(end_date) else None,
+            'total_issues': len(sprint_df),
+            'total_story_points': float(total_story_points),
+            'completed_story_points': float(completed_points),
+            'in_progress_story_points': float(sprint_df[sprint_df['Status'] == 'In Progress']['Story Points'].sum()),
+            'todo_story_points': float(sprint_df[sprint_df['Status'] == 'To Do']['Story Points'].sum()),
+            'blocked_story_points': float(sprint_df[sprint_df['Status'] == 'Blocked']['Story Points'].sum()),
+            'completion_percentage': float(completion_pct),
+            'days_remaining': days_remaining,
+            'days_elapsed': days_elapsed,
+            'risk_level': risk_level,
+            'velocity': float(completed_points),
+            'status_distribution': sprint_df['Status'].value_counts().to_dict()
+        })
+    return sprints_data
+
+
+def baseline_dashboard(df: pd.DataFrame):
+    velocities = []
+    at_risk_count = 0
+    for sprint in df['Assigned Sprint'].dropna().unique():
+        if sprint == BACKLOG_SPRINT:
+            continue
+        sprint_df = df[df['Assigned Sprint'] == sprint]
+        velocity = sprint_df[sprint_df['Status'] == 'Done']['Story Points'].sum()
+        velocities.append(velocity)
+        total_points = sprint_df['Story Points'].sum()
+        if ((velocity / total_points * 100) if total_points > 0 else 0) < 50:
+            at_risk_count += 1
+    
+    total_points = df['Story Points'].sum()
+    completed_points = df[df['Status'] == 'Done']['Story Points'].sum()
+    return {
+        'total_sprints': int(df['Assigned Sprint'].nunique()),
+        'total_issues': len(df),
+        'average_velocity': float(sum(velocities) / len(velocities) if velocities else 0),
+        'at_risk_sprints': at_risk_count,
+        'completion_rate': float((completed_points / total_points * 100) if total_points > 0 else 0)
+    }
+
+
+def baseline_team_performance(df: pd.DataFrame):
+    team_members = []
+    for assignee in df['Assignee'].dropna().unique():
+        assignee_df = df[df['Assignee'] == assignee]
+        assigned_points = assignee_df['Story Points'].sum()
+        completed_points = assignee_df[assignee_df['Status'] == 'Done']['Story Points'].sum()
+        team_members.append({
+            'name': assignee,
+            'assigned_points': float(assigned_points),
+            'completed_points': float(completed_points),
+            'completion_rate': float((completed_points / assigned_points * 100) if assigned_points > 0 else 0)
+        })
+    team_members.sort(key=lambda member: member['assigned_points'], reverse=True)
+    return team_members[:10]
+
+
+@pytest.fixture(scope='module')
+def uploaded_df(excel_upload) -> pd.DataFrame:
+    """The upload as the old endpoints saw it"""
+    return pd.read_excel(io.BytesIO(excel_upload))
+
+
+def test_sprints_match_baseline(client, uploaded_df, now):
+    response = client.get('/api/sprints')
+    
+    assert response.status_code == 200
+    assert response.json() == baseline_sprints(uploaded_df, now.tz_localize(None))
+
+
+def test_dashboard_matches_baseline(client, uploaded_df):
+    response = client.get('/api/dashboard')
+    
+    assert response.status_code == 200
+    assert response.json() == baseline_dashboard(uploaded_df)
+
+
+def test_team_performance_matches_baseline(client, uploaded_df):
+    response = client.get('/api/team-performance')
+    
+    assert response.status_code == 200
+    assert response.json() == baseline_team_performance(uploaded_df)
+
+
+def test_summary_keeps_first_seen_sprint_order(raw_df):
+    summary = SprintAggregator().summarize_sprints(raw_df)
+    
+    assert list(summary.index) == list(raw_df['Assigned Sprint'].dropna().unique())
+    assert summary.loc[BACKLOG_SPRINT, 'total_issues'] == (raw_df['Assigned Sprint'] == BACKLOG_SPRINT).sum()
+
+
+def test_summary_of_empty_frame_has_no_sprints(raw_df):
+    summary = SprintAggregator().summarize_sprints(raw_df.iloc[:0])
+    
+    assert summary.empty
@@ -0,0 +1,106 @@
+"""
+Sprint dates parsed to UTC once at install, and the request clock shared by every date-relative figure
+"""
+
+import re
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from dataset_normalizer import SPRINT_DATE_COLUMNS, to_utc_timestamps
+from dataset_store import DatasetStore
+from delay_predictor import DelayPredictor
+
+DATE_ENDPOINTS = ['/api/sprints', '/api/recommendations', '/api/delay-predictions', '/api/delay-predictions/Sprint 1']
+
+
+def test_dates_are_read_as_utc():
+    values = pd.Series([
+        '2026-03-04 09:30', '2026-03-04T09:30:00.000Z', '2026-03-04T11:30:00+02:00',
+        datetime(2026, 3, 4, 9, 30, tzinfo=timezone.utc), 'not a date', None
+    ])
+    
+    parsed = to_utc_timestamps(values)
+    
+    assert str(parsed.dt.tz) == 'UTC'
+    assert parsed[:4].tolist() == [pd.Timestamp('2026-03-04 09:30', tz='UTC')] * 4
+    assert parsed[4:].isna().all()
+
+
+def test_parsed_column_is_returned_as_is():
+    parsed = to_utc_timestamps(pd.Series(['2026-03-04']))
+    
+    assert to_utc_timestamps(parsed) is parsed
+
+
+def test_install_parses_the_sprint_dates_once(raw_df):
+    as_text = raw_df.assign(**{column: raw_df[column].dt.strftime('%Y-%m-%dT%H:%M:%S.000Z') for column in SPRINT_DATE_COLUMNS})
+    
+    installed = DatasetStore().install(as_text, 'upload')
+    
+    for column in SPRINT_DATE_COLUMNS:
+        assert str(installed.df[column].dt.tz) == 'UTC'
+        assert installed.df[column].tolist() == raw_df[column].dt.tz_localize('UTC').tolist()
+    for column in ('start_date', 'end_date'):
+        assert str(installed.sprint_summary[column].dt.tz) == 'UTC'
+
+
+def test_requests_do_not_parse_dates(client, monkeypatch):
+    # Velocity (which reads resolution dates) is computed once per dataset and day
+    for endpoint in DATE_ENDPOINTS:
+        client.get(endpoint)
+    calls = []
+    to_datetime = pd.to_datetime
+    
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return to_datetime(*args, **kwargs)
+    
+    monkeypatch.setattr(pd, 'to_datetime', counting)
+    
+    for endpoint in DATE_ENDPOINTS:
+        assert client.get(endpoint).status_code == 200
+    
+    assert calls == []
+
+
+def test_sprint_dates_are_sent_without_an_offset(server, client):
+    summary = server.datasets.get(server.DEFAULT_WORKSPACE).sprint_summary
+    
+    for sprint in client.get('/api/sprints').json():
+        assert re.fullmatch(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', sprint['start_date'])
+        assert sprint['end_date'] == summary.loc[sprint['sprint_name'], 'end_date'].strftime('%Y-%m-%d %H:%M:%S')
+
+
+def test_every_endpoint_counts_days_from_the_request_clock(client, clock, now):
+    before = {item['sprint_name']: item['days_remaining'] for item in client.get('/api/delay-predictions').json()}
+    listed = {item['sprint_name']: item['days_remaining'] for item in client.get('/api/sprints').json()}
+    
+    clock(now + pd.Timedelta(days=3))
+    
+    after = {item['sprint_name']: item['days_remaining'] for item in client.get('/api/delay-predictions').json()}
+    moved = {item['sprint_name']: item['days_remaining'] for item in client.get('/api/sprints').json()}
+    running = [name for name, days in before.items() if days > 3]
+    assert running
+    for name in running:
+        assert after[name] == before[name] - 3
+        assert moved[name] == listed[name] - 3
+        assert client.get(f'/api/delay-predictions/{name}').json()['days_remaining'] == after[name]
+
+
+def test_pinned_clock_gives_identical_responses(client):
+    for endpoint in DATE_ENDPOINTS:
+        first, second = client.get(endpoint), client.get(endpoint)
+        assert first.headers['ETag'] == second.headers['ETag']
+        # Recommendations are new prompts (with their own IDs) on every request
+        if endpoint != '/api/recommendations':
+            assert first.content == second.content
+
+
+def test_predict_delay_parses_raw_dates(raw_df, now):
+    predictor = DelayPredictor()
+    installed = DatasetStore().install(raw_df, 'upload')
+    as_text = raw_df.assign(**{column: raw_df[column].dt.strftime('%Y-%m-%d %H:%M:%S') for column in SPRINT_DATE_COLUMNS})
+    
+    for sprint in installed.sprint_summary.index[:5]:
+        assert predictor.predict_delay(as_text, sprint, now=now) == predictor.predict_delay(installed.df, sprint, now=now)
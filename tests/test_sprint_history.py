@@ -0,0 +1,139 @@
+"""
+SprintHistoryStore: one point per sprint and day in yearly buckets, read back as burndown series
+"""
+
+import asyncio
+from datetime import date
+
+import pytest
+
+from dataset_store import DatasetStore
+from sprint_history import HISTORY_FIELDS, SprintHistoryStore
+
+
+def matches(document, query) -> bool:
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, dict):
+            if '$gte' in condition and not value >= condition['$gte']:
+                return False
+            if '$lte' in condition and not value <= condition['$lte']:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class Cursor:
+    def __init__(self, documents):
+        self.documents = documents
+    
+    def __aiter__(self):
+        return self._iterate()
+    
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class BucketCollection:
+    """The Motor calls SprintHistoryStore makes, with dotted $set paths"""
+    
+    def __init__(self):
+        self.documents = {}
+    
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            query, update = request._filter, request._doc
+            document = self.documents.setdefault(tuple(query.items()), dict(query))
+            for path, value in update['$set'].items():
+                *parents, field = path.split('.')
+                target = document
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[field] = value
+    
+    def find(self, query, projection=None):
+        return Cursor([document for document in self.documents.values() if matches(document, query)])
+
+
+class BucketDatabase:
+    def __init__(self):
+        self.collections = {}
+    
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, BucketCollection())
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture(scope='module')
+def sprint_summary(raw_df):
+    return DatasetStore().install(raw_df, 'upload').sprint_summary
+
+
+@pytest.fixture
+def history() -> SprintHistoryStore:
+    return SprintHistoryStore(BucketDatabase())
+
+
+def test_each_sprint_gets_a_point_per_day(history, sprint_summary):
+    recorded = run(history.record('team', sprint_summary, date(2026, 3, 3)))
+    run(history.record('team', sprint_summary, date(2026, 3, 4)))
+    
+    assert recorded == len(sprint_summary)
+    sprint_name = sprint_summary.index[0]
+    series = run(history.series('team', sprint_name, date(2026, 3, 1), date(2026, 3, 31)))
+    sprint = sprint_summary.loc[sprint_name]
+    assert series['sprint_name'] == sprint_name
+    assert series['days'] == ['2026-03-03', '2026-03-04']
+    for field in HISTORY_FIELDS:
+        assert series[field] == [sprint[field]] * 2
+    assert series['remaining_points'] == [sprint['total_points'] - sprint['done_points']] * 2
+
+
+def test_recording_a_day_again_overwrites_it(history, sprint_summary):
+    run(history.record('team', sprint_summary, date(2026, 3, 4)))
+    finished = sprint_summary.assign(done_points=sprint_summary['total_points'])
+    
+    run(history.record('team', finished, date(2026, 3, 4)))
+    
+    series = run(history.series('team', sprint_summary.index[0], date(2026, 3, 4), date(2026, 3, 4)))
+    assert series['days'] == ['2026-03-04']
+    assert series['remaining_points'] == [0]
+
+
+def test_one_bucket_per_sprint_and_year(history, sprint_summary):
+    for day in (date(2025, 12, 30), date(2025, 12, 31), date(2026, 1, 1)):
+        run(history.record('team', sprint_summary.head(2), day))
+    
+    buckets = history.history.documents.values()
+    assert len(buckets) == 4
+    assert {len(bucket['days']) for bucket in buckets if bucket['year'] == 2025} == {2}
+    series = run(history.series('team', sprint_summary.index[0], date(2025, 12, 31), date(2026, 1, 1)))
+    assert series['days'] == ['2025-12-31', '2026-01-01']
+
+
+def test_workspaces_and_unknown_sprints_are_separate(history, sprint_summary):
+    run(history.record('team', sprint_summary, date(2026, 3, 4)))
+    
+    assert run(history.series('other', sprint_summary.index[0], date(2026, 3, 1), date(2026, 3, 31)))['days'] == []
+    assert run(history.series('team', 'No such sprint', date(2026, 3, 1), date(2026, 3, 31)))['total_points'] == []
+
+
+def test_history_endpoint(server, client, sprint_summary, monkeypatch):
+    history = SprintHistoryStore(BucketDatabase())
+    monkeypatch.setattr(server, 'sprint_history', history)
+    run(history.record(server.DEFAULT_WORKSPACE, sprint_summary, date(2026, 3, 2)))
+    sprint_name = sprint_summary.index[0]
+    
+    response = client.get(f'/api/sprints/{sprint_name}/history')
+    
+    assert response.status_code == 200
+    assert response.json()['days'] == ['2026-03-02']
+    assert client.get(f'/api/sprints/{sprint_name}/history', params={'start': '2026-03-03'}).json()['days'] == []
+    assert client.get(
+        f'/api/sprints/{sprint_name}/history', params={'start': '2026-03-05', 'end': '2026-03-01'}
+    ).status_code == 400
@@ -0,0 +1,145 @@
+"""
+Filtering, sorting and cursor pagination of /sprints and /delay-predictions
+"""
+
+import pandas as pd
+import pytest
+
+from ndjson_stream import NDJSON_MEDIA_TYPE
+from sprint_query import RISK_LEVELS, SprintQuery
+
+LISTINGS = ['/api/sprints', '/api/delay-predictions']
+
+
+def walk(client, path: str, **params) -> list:
+    """Every item of a paginated listing, following X-Next-Cursor page by page"""
+    items = []
+    cursor = None
+    while True:
+        response = client.get(path, params={**params, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page) <= params.get('limit', len(page))
+        items.extend(page)
+        assert int(response.headers['X-Total-Count']) >= len(items)
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            assert int(response.headers['X-Total-Count']) == len(items)
+            return items
+
+
+@pytest.mark.parametrize('path', LISTINGS)
+def test_pages_add_up_to_the_full_listing(client, path):
+    assert walk(client, path, limit=7) == client.get(path).json()
+
+
+@pytest.mark.parametrize('path, sort', [
+    ('/api/sprints', 'completion_percentage'),
+    ('/api/sprints', '-total_story_points'),
+    ('/api/sprints', 'sprint_name'),
+    ('/api/delay-predictions', '-delay_probability'),
+    ('/api/delay-predictions', 'days_remaining'),
+    ('/api/delay-predictions', 'sprint_name')
+])
+def test_sorted_pages(client, path, sort):
+    items = walk(client, path, sort=sort, limit=5)
+    
+    field = sort.lstrip('-')
+    values = [item[field] for item in items]
+    assert values == sorted(values, reverse=sort.startswith('-'))
+
+
+def test_risk_level_sort_puts_critical_first(client):
+    levels = [item['risk_level'] for item in walk(client, '/api/sprints', sort='risk_level', limit=4)]
+    
+    assert levels == sorted(levels, key=RISK_LEVELS.index)
+
+
+@pytest.mark.parametrize('path', LISTINGS)
+def test_risk_level_filter(client, path):
+    everything = client.get(path).json()
+    
+    items = walk(client, path, risk_level='critical,high', limit=3)
+    
+    assert items == [item for item in everything if item['risk_level'] in ('critical', 'high')]
+
+
+def test_board_and_state_filters(client, dataset):
+    sprints = dataset.sprint_table()
+    
+    items = walk(client, '/api/sprints', board='1', state='closed,active', limit=2)
+    
+    expected = sprints[(sprints['board'] == 1) & sprints['state'].isin(['closed', 'active'])]['name']
+    assert sorted(item['sprint_name'] for item in items) == sorted(expected)
+
+
+def test_date_range_filter(client, dataset, now):
+    sprints = dataset.sprint_table()
+    from_date = (now - pd.Timedelta(days=20)).date()
+    to_date = now.date()
+    
+    items = walk(client, '/api/sprints', from_date=str(from_date), to_date=str(to_date))
+    
+    ends_after = sprints['end'].dt.date >= from_date
+    starts_before = sprints['start'].dt.date <= to_date
+    assert sorted(item['sprint_name'] for item in items) == sorted(sprints[ends_after & starts_before]['name'])
+
+
+@pytest.mark.parametrize('params', [
+    {'sort': 'assignee'},
+    {'risk_level': 'severe'},
+    {'state': 'planned'},
+    {'from_date': '2026-03-10', 'to_date': '2026-03-01'},
+    {'cursor': 'not-a-cursor'}
+])
+def test_invalid_queries_are_rejected(client, params):
+    response = client.get('/api/sprints', params=params)
+    
+    assert response.status_code == 400
+
+
+def test_cursor_only_works_for_its_own_query(client):
+    cursor = client.get('/api/sprints', params={'sort': 'sprint_name', 'limit': 3}).headers['X-Next-Cursor']
+    
+    assert client.get('/api/sprints', params={'sort': 'sprint_name', 'limit': 3, 'cursor': cursor}).status_code == 200
+    assert client.get('/api/sprints', params={'sort': '-sprint_name', 'limit': 3, 'cursor': cursor}).status_code == 400
+
+
+def test_limit_is_bounded(client):
+    assert client.get('/api/sprints', params={'limit': 0}).status_code == 422
+    assert client.get('/api/sprints', params={'limit': 1001}).status_code == 422
+
+
+@pytest.mark.parametrize('days', [-30, 0, 10, 40])
+@pytest.mark.parametrize('sort', ['risk_level', '-completion_percentage', 'days_remaining', 'total_story_points'])
+def test_page_order_matches_the_built_sprints(server, client, now, days, sort):
+    summary = server.datasets.get(server.DEFAULT_WORKSPACE).sprint_summary
+    when = now + pd.Timedelta(days=days)
+    
+    page_summary, page = server.select_sprint_page(summary, SprintQuery(sort=sort), when)
+    
+    everything = list(server.iter_sprint_data(summary, when))
+    field = sort.lstrip('-')
+    key = (lambda item: RISK_LEVELS.index(item[field])) if field == 'risk_level' else (lambda item: item[field])
+    present = [item for item in everything if item[field] is not None]
+    expected = sorted(present, key=key, reverse=sort.startswith('-'))
+    expected += [item for item in everything if item[field] is None]
+    assert list(server.iter_sprint_data(page_summary, when)) == expected
+    assert page.total == len(everything)
+
+
+def test_only_the_page_is_built(server, client, monkeypatch):
+    built = []
+    iter_sprint_data = server.iter_sprint_data
+    
+    def counting(summary, now=None):
+        built.append(len(summary))
+        return iter_sprint_data(summary, now)
+    
+    monkeypatch.setattr(server, 'iter_sprint_data', counting)
+    
+    for opt_in in ({}, {'headers': {'Accept': NDJSON_MEDIA_TYPE}}):
+        built.clear()
+        response = client.get('/api/sprints', params={'limit': 3, 'sort': '-completion_percentage'}, **opt_in)
+        assert response.status_code == 200
+        assert built == [3]
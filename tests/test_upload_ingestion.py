@@ -0,0 +1,116 @@
+"""
+Upload ingestion: CSV chunks normalized as they are read, and the upload size limit
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_normalizer import FLOAT32_EXACT_LIMIT, DatasetNormalizer
+from upload_ingestion import UploadIngestor
+
+
+@pytest.fixture(scope='module')
+def csv_upload(raw_df) -> bytes:
+    return raw_df.to_csv(index=False).encode()
+
+
+def parse(ingestor: UploadIngestor, data: bytes, filename: str):
+    progress = ingestor.start('upload', filename, len(data))
+    df, columns = ingestor.parse(io.BytesIO(data), filename, progress)
+    return df, columns, progress
+
+
+@pytest.mark.parametrize('chunk_rows', [150, 1999, 5000])
+def test_chunked_csv_normalizes_like_the_whole_file(csv_upload, raw_df, chunk_rows):
+    normalizer = DatasetNormalizer()
+    
+    df, columns, progress = parse(UploadIngestor(10 ** 9, csv_chunk_rows=chunk_rows), csv_upload, 'sprints.csv')
+    
+    whole, _ = normalizer.normalize(pd.read_csv(io.BytesIO(csv_upload)))
+    chunked, _ = normalizer.normalize(df)
+    pd.testing.assert_frame_equal(chunked, whole)
+    assert columns == list(raw_df.columns)
+    assert progress['rows_parsed'] == len(raw_df)
+
+
+def test_chunks_are_kept_compact(csv_upload):
+    chunks = []
+    
+    class RecordingNormalizer(DatasetNormalizer):
+        def compact_chunk(self, df):
+            chunk = super().compact_chunk(df)
+            chunks.append(chunk)
+            return chunk
+    
+    parse(UploadIngestor(10 ** 9, csv_chunk_rows=500, normalizer=RecordingNormalizer()), csv_upload, 'sprints.csv')
+    
+    assert len(chunks) == 4
+    for chunk in chunks:
+        assert isinstance(chunk['Status'].dtype, pd.CategoricalDtype)
+        assert chunk['Story Points'].dtype == np.float32
+        assert isinstance(chunk['Assigned Sprint\nStart date'].dtype, pd.DatetimeTZDtype)
+
+
+def test_float32_chunks_are_widened_when_their_total_is_inexact():
+    normalizer = DatasetNormalizer()
+    chunks = [normalizer.compact_chunk(pd.DataFrame({'Story Points': [FLOAT32_EXACT_LIMIT // 3 + 1, 0.5]})) for _ in range(3)]
+    
+    assert all(chunk['Story Points'].dtype == np.float32 for chunk in chunks)
+    assert normalizer.concat_chunks(chunks)['Story Points'].dtype == np.float64
+
+
+def test_categories_of_all_chunks_are_unified():
+    normalizer = DatasetNormalizer()
+    chunks = [
+        normalizer.compact_chunk(pd.DataFrame({'Status': ['Done', 'To Do', 'Done', 'Done']})),
+        normalizer.compact_chunk(pd.DataFrame({'Status': [np.nan, np.nan, np.nan, np.nan]})),
+        normalizer.compact_chunk(pd.DataFrame({'Status': ['Blocked', 'Done', 'Blocked', 'Done']}))
+    ]
+    
+    status = normalizer.concat_chunks(chunks)['Status']
+    
+    assert list(status.cat.categories) == ['Blocked', 'Done', 'To Do']
+    assert status.tolist()[:4] == ['Done', 'To Do', 'Done', 'Done']
+    assert status.iloc[4:8].isna().all()
+
+
+def test_excel_is_read_once_with_its_full_header(excel_upload, raw_df):
+    df, columns, progress = parse(UploadIngestor(10 ** 9), excel_upload, 'sprints.xlsx')
+    
+    assert columns == list(raw_df.columns)
+    assert len(df) == progress['rows_parsed'] == len(raw_df)
+
+
+@pytest.fixture
+def small_limit(server, monkeypatch):
+    """Uploads over 1 KB are refused"""
+    monkeypatch.setattr(server.upload_ingestor, 'max_bytes', 1024)
+    return server.upload_ingestor
+
+
+def test_declared_oversized_upload_gets_413(client, small_limit, csv_upload):
+    response = client.post('/api/upload-csv', files={'file': ('sprints.csv', csv_upload)})
+    
+    assert response.status_code == 413
+    assert response.json()['detail'] == small_limit.too_large_message()
+
+
+def test_chunked_oversized_upload_gets_413(client, small_limit, csv_upload):
+    body = b'--limit\r\nContent-Disposition: form-data; name="file"; filename="sprints.csv"\r\n\r\n' + csv_upload
+    
+    def chunks():
+        for start in range(0, len(body), 512):
+            yield body[start:start + 512]
+    
+    response = client.post(
+        '/api/upload-csv', params={'upload_id': 'chunked'}, content=chunks(),
+        headers={'Content-Type': 'multipart/form-data; boundary=limit'}
+    )
+    
+    assert response.status_code == 413
+    progress = client.get('/api/upload-csv/chunked/progress').json()
+    assert progress['stage'] == 'failed'
+    assert progress['bytes_received'] > small_limit.max_body_bytes
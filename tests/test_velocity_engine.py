@@ -0,0 +1,92 @@
+"""
+VelocityEngine throughput and the issue rates it gives open sprints
+"""
+
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from delay_predictor import DelayPredictor
+from velocity_engine import VelocityEngine
+
+SPRINT_DATES = {
+    'S0': ('2026-02-16', '2026-03-03'),  # closed: holds last week's resolved issues
+    'S1': ('2026-03-01', '2026-03-09 12:00'),
+    'S2': ('2026-03-01', '2026-03-09 12:00'),
+    'S3': ('2026-03-01', '2026-03-09 12:00'),
+    'S4': ('2026-03-20', '2026-04-03')  # not started
+}
+
+
+def issues(sprint: str, status: str, assignee, count: int, resolved=None) -> list:
+    start, end = SPRINT_DATES[sprint]
+    return [
+        {
+            'Jira ID': f'{sprint}-{status}-{assignee}-{n}',
+            'Status': status,
+            'Story Points': 2.0,
+            'Assigned Sprint': sprint,
+            'Assigned Sprint\nStart date': start,
+            'Assigned Sprint\nEnd date': end,
+            'Assignee': assignee,
+            'Resolved': resolved,
+            'Board': '1'
+        }
+        for n in range(count)
+    ]
+
+
+@pytest.fixture(scope='module')
+def df() -> pd.DataFrame:
+    return pd.DataFrame(
+        # This week alice resolved 7 issues and bob 14: 1 and 2 a day, 3 for the team
+        issues('S0', 'Done', 'alice', 7, '2026-03-02 10:00')
+        + issues('S0', 'Done', 'bob', 14, '2026-03-03 10:00')
+        + issues('S1', 'To Do', 'alice', 3) + issues('S1', 'In Progress', 'bob', 1)
+        + issues('S2', 'To Do', 'alice', 1) + issues('S2', 'To Do', None, 2)
+        + issues('S3', 'To Do', None, 2) + issues('S3', 'To Do', 'carol', 1)
+        + issues('S4', 'To Do', 'alice', 5)
+    )
+
+
+@pytest.fixture(scope='module')
+def velocity(df, now):
+    return VelocityEngine(window_weeks=1).compute(df, now)
+
+
+def test_throughput_per_team_and_assignee(velocity):
+    assert velocity.teams.loc['1', 'issues_per_day'] == 3.0
+    assert velocity.assignees['issues_per_day'].to_dict() == {'bob': 2.0, 'alice': 1.0}
+    assert velocity.assignees['resolved_points'].to_dict() == {'bob': 28.0, 'alice': 14.0}
+
+
+def test_open_sprints_get_their_assignees_throughput(velocity, now):
+    rates = velocity.sprint_issue_rates(['S0', 'S1', 'S2', 'S3', 'S4', 'Unknown'], now)
+    
+    # alice's rate is split 3:1 between S1 and S2 by her open issues there, bob's all goes to S1;
+    # nobody on S3 has history, so it gets the team's rate split across its three open sprints
+    assert rates.tolist() == [0.0, 0.75 + 2.0, 0.25, 1.0, 0.0, 0.0]
+
+
+def test_assignee_throughput_feeds_the_completion_rate(df, velocity, now):
+    predictor = DelayPredictor()
+    
+    # 4 open issues, 2.75 a day for 5 days: all expected done
+    with_velocity = predictor.predict_delay(df, 'S1', velocity, now)
+    without_velocity = predictor.predict_delay(df, 'S1', now=now)
+    
+    assert with_velocity['factors']['completion_rate_risk'] == 0.0
+    assert without_velocity['factors']['completion_rate_risk'] == 1.0
+    batch = predictor.analyze_all_sprints(df, velocity=velocity, now=now)
+    assert next(prediction for prediction in batch if prediction['sprint_name'] == 'S1') == with_velocity
+
+
+def test_velocity_is_cached_per_dataset_version_and_day(df, now):
+    engine = VelocityEngine()
+    dataset = SimpleNamespace(version='v1', df=df)
+    
+    first = engine.for_dataset(dataset, now)
+    
+    assert engine.for_dataset(dataset, now + pd.Timedelta(hours=1)) is first
+    assert engine.for_dataset(dataset, now + pd.Timedelta(days=1)) is not first